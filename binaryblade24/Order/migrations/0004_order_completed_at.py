@@ -0,0 +1,25 @@
+# Generated by Django 5.0.4 on 2026-10-17 04:50
+
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    # Best available date for orders completed before the field existed
+    Order = apps.get_model('Order', 'Order')
+    Order.objects.filter(status='COMPLETED', completed_at__isnull=True).update(completed_at=models.F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Order', '0003_alter_escrow_status_alter_order_created_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, help_text='When the order was completed (dates its earnings buckets)', null=True),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -56,6 +56,11 @@ class Order(models.Model):
         blank=True,
         help_text="When payment was completed"
     )
+    completed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the order was completed (dates its earnings buckets)"
+    )
     
     class Meta:
         ordering = ['-created_at']
@@ -74,6 +79,11 @@ class Order(models.Model):
             date_str = datetime.now().strftime('%Y%m%d')
             unique_id = str(uuid.uuid4())[:8].upper()
             self.order_number = f"ORD-{date_str}-{unique_id}"
+        if self.status == self.OrderStatus.COMPLETED and self.completed_at is None:
+            from django.utils import timezone
+            self.completed_at = timezone.now()
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'completed_at'}
         super().save(*args, **kwargs)
     
     def calculate_total(self):
@@ -2,6 +2,7 @@ from rest_framework import serializers
 from .models import Order, OrderItem, Escrow
 from Project.Serializers import ProjectSerializer
 from User.Serializers import UserSerializer, FreelancerDetailSerializer
+from utils.serializers import SparseFieldsetMixin
 
 class EscrowSerializer(serializers.ModelSerializer):
     class Meta:
@@ -24,7 +25,8 @@ class OrderItemSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['base_price', 'tier_multiplier', 'final_price', 'created_at']
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """Supports ?fields= and ?expand= (see utils/serializers.py)."""
     items = OrderItemSerializer(many=True, read_only=True)
     client_details = UserSerializer(source='client', read_only=True)
     escrow = EscrowSerializer(read_only=True)
@@ -45,6 +47,7 @@ class OrderSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at', 'paid_at',
             'items', 'items_data', 'escrow'
         ]
+        expandable_fields = ['items', 'client_details', 'escrow']
         read_only_fields = [
             'id', 'order_number', 'client', 'status', 
             'total_amount', 'created_at', 'updated_at', 'paid_at'
@@ -1,3 +1,39 @@
-from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from Project.models import Project, Category
+from Order.models import Order, OrderItem
 
-# Create your tests here.
+User = get_user_model()
+
+
+class OrderSparseFieldsetTests(APITestCase):
+    def setUp(self):
+        self.buyer = User.objects.create_user(
+            username='buyer', email='buyer@example.com', password='password123',
+            country_origin='US', identity_number='buyer-id'
+        )
+        self.seller = User.objects.create_user(
+            username='seller', email='seller@example.com', password='password123',
+            country_origin='US', identity_number='seller-id'
+        )
+        category = Category.objects.create(name='Design', slug='design')
+        project = Project.objects.create(
+            title='Logo', description='Description', budget=100, price=100,
+            category=category, client=self.seller,
+        )
+        order = Order.objects.create(client=self.buyer, total_amount=0)
+        OrderItem.objects.create(order=order, project=project, tier='SIMPLE', base_price=100, freelancer=self.seller)
+        self.client.force_authenticate(user=self.buyer)
+        self.url = '/api/orders/orders/'
+
+    def test_fields_and_expand(self):
+        response = self.client.get(self.url, {'fields': 'id,status'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data['results'][0]), {'id', 'status'})
+
+        response = self.client.get(self.url, {'expand': 'items'})
+        order = response.data['results'][0]
+        self.assertIn('order_number', order)
+        self.assertNotIn('client_details', order)
+        self.assertEqual(order['items'][0]['project_details']['title'], 'Logo')
@@ -3,10 +3,12 @@ from rest_framework.response import Response
 from rest_framework.decorators import action
 from .models import Order
 from .serializers import OrderSerializer
+from utils.pagination import KeysetPagination
 
 class OrderViewSet(viewsets.ModelViewSet):
     serializer_class = OrderSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
     
     def get_queryset(self):
         # Clients see their own orders
@@ -17,10 +19,20 @@ class OrderViewSet(viewsets.ModelViewSet):
         from django.db.models import Q
         
         # Return orders where user is either the client OR a freelancer for any item
-        return Order.objects.filter(
+        queryset = Order.objects.filter(
             Q(client=user) | Q(items__freelancer=user)
         ).distinct()
 
+        # Only join/prefetch the nested payloads the response will render
+        fields = OrderSerializer.requested_fields(self.request)
+        if fields is None or 'client_details' in fields:
+            queryset = queryset.select_related('client__profile')
+        if fields is None or 'escrow' in fields:
+            queryset = queryset.select_related('escrow')
+        if fields is None or 'items' in fields:
+            queryset = queryset.prefetch_related('items__project', 'items__freelancer')
+        return queryset
+
     def perform_create(self, serializer):
         serializer.save(client=self.request.user)
 
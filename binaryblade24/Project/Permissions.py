@@ -11,9 +11,9 @@ class IsClient(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
         
-        # Check if the authenticated user has a 'CLIENT' role
+        # Check if the authenticated user has a 'CLIENT' role (token claims, see User/authentication.py)
         if request.user and request.user.is_authenticated:
-            return request.user.roles.filter(name='CLIENT').exists()
+            return request.user.has_role('CLIENT')
         return False
 
 class IsFreelancer(permissions.BasePermission):
@@ -24,7 +24,7 @@ class IsFreelancer(permissions.BasePermission):
 
     def has_permission(self, request, view):
         if request.user and request.user.is_authenticated:
-            return request.user.roles.filter(name='FREELANCER').exists()
+            return request.user.has_role('FREELANCER')
         return False
 
 class IsProjectOwner(permissions.BasePermission):
@@ -51,4 +51,4 @@ class IsClientOrFreelancer(permissions.BasePermission):
             return False
             
         # Check if user has either role
-        return request.user.roles.filter(name__in=['CLIENT', 'FREELANCER']).exists()
+        return request.user.has_role('CLIENT', 'FREELANCER')
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from .models import Project, Category, Milestone 
 from django.contrib.auth import get_user_model
+from utils.serializers import SparseFieldsetMixin
 
 User = get_user_model()
 
@@ -15,8 +16,13 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ['id', 'slug']
 
-class ProjectSerializer(serializers.ModelSerializer):
-    """Main serializer for Project CRUD operations."""
+class ProjectSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """
+    Main serializer for Project CRUD operations.
+
+    Supports ?fields= and ?expand= (see utils/serializers.py); the nested
+    details and computed fields are expandable.
+    """
     # Nested field to display the client's public username
     client_details = serializers.SerializerMethodField(read_only=True)
     
@@ -62,6 +68,15 @@ class ProjectSerializer(serializers.ModelSerializer):
             # 'help_text',
             
         ]
+        expandable_fields = [
+            'client_details',
+            'owner_details',
+            'category_details',
+            'average_rating',
+            'review_count',
+            'view_count',
+            'user_has_submitted',
+        ]
         
         # Security: Fields set by the server/view, not allowed in client input
         read_only_fields = [
@@ -77,6 +92,9 @@ class ProjectSerializer(serializers.ModelSerializer):
 
     def get_average_rating(self, obj):
         """Calculate average rating from related reviews."""
+        if hasattr(obj, 'review_avg'):
+            # Annotated by Project.objects.with_listing_stats()
+            return round(obj.review_avg, 1) if obj.review_avg is not None else 0
         reviews = obj.reviews.all()
         if not reviews.exists():
             return 0
@@ -85,16 +103,23 @@ class ProjectSerializer(serializers.ModelSerializer):
 
     def get_review_count(self, obj):
         """Return total number of reviews."""
+        if hasattr(obj, 'review_total'):
+            return obj.review_total
         return obj.reviews.count()
 
     def get_view_count(self, obj):
         """Return total number of view impressions."""
-        return obj.views.count()
+        if hasattr(obj, 'view_total'):
+            return obj.view_total
+        from .analytics import project_view_total
+        return project_view_total(obj)
 
     def get_user_has_submitted(self, obj):
         """Check if the current user has already submitted a proposal for this project."""
         request = self.context.get('request')
         if request and request.user.is_authenticated:
+            if hasattr(obj, 'user_has_proposal'):
+                return obj.user_has_proposal
             return obj.proposals.filter(freelancer=request.user).exists()
         return False
 
@@ -117,12 +142,17 @@ class ProjectSerializer(serializers.ModelSerializer):
             - Protects platform revenue and user safety
         """
         from User.Serializers import FreelancerDetailSerializer
-        
+
+        if hasattr(obj, '_client_details'):
+            # Already built for this project (owner_details is the same payload)
+            return obj._client_details
+
         # Always return minimal client details (no email/phone)
-        return FreelancerDetailSerializer(obj.client).data
+        obj._client_details = FreelancerDetailSerializer(obj.client).data
+        return obj._client_details
 
     def get_owner_details(self, obj):
-        """Alias for get_client_details to support 'owner' semantic."""
+        """Alias for get_client_details to support 'owner' semantic (computed once per project)."""
         return self.get_client_details(obj)
 
 # Proposal System Serializers
@@ -0,0 +1,249 @@
+"""
+Project View Analytics
+
+Impression counts are served from ProjectViewRollup buckets plus the tail of
+raw ProjectView rows that the last rollup run has not folded in yet (rows
+with an id above the 'project_views' watermark). The tail is small as long
+as `rollup_project_views` runs regularly (e.g. every few minutes from cron),
+so reads no longer scale with the size of the raw table.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.dispatch import Signal
+from django.db.models import BigIntegerField, Count, IntegerField, Max, Min, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Trunc
+from django.utils import timezone
+
+from .impressions import get_buffer_settings, impression_buffer
+from .models import ProjectView, ProjectViewRollup, RollupWatermark
+
+WATERMARK_NAME = 'project_views'
+
+# Sent by rollup_project_views() after new views were folded into the
+# rollups, with `project_ids`: the projects that received views
+rollups_landed = Signal()
+
+TRUNC_KINDS = {
+    ProjectViewRollup.Granularity.HOUR: 'hour',
+    ProjectViewRollup.Granularity.DAY: 'day',
+}
+BUCKET_STEPS = {
+    ProjectViewRollup.Granularity.HOUR: timedelta(hours=1),
+    ProjectViewRollup.Granularity.DAY: timedelta(days=1),
+}
+
+
+def _watermark_expression():
+    """SQL expression for the current watermark, so reads need no extra query."""
+    return Coalesce(
+        Subquery(RollupWatermark.objects.filter(name=WATERMARK_NAME).values('last_id')[:1]),
+        Value(0),
+        output_field=BigIntegerField(),
+    )
+
+
+def pending_views():
+    """Raw ProjectView rows not yet folded into the rollups."""
+    return ProjectView.objects.filter(id__gt=_watermark_expression()).order_by()
+
+
+def view_total_expression(project_ref='pk'):
+    """
+    Annotation expression: total views for the project referenced by `project_ref`.
+
+    Sums the project's DAY buckets and adds its pending raw rows.
+    """
+    rolled_up = ProjectViewRollup.objects.filter(
+        project=OuterRef(project_ref), granularity=ProjectViewRollup.Granularity.DAY
+    ).order_by().values('project').annotate(total=Sum('view_count')).values('total')
+    pending = pending_views().filter(
+        project=OuterRef(project_ref)
+    ).values('project').annotate(total=Count('pk')).values('total')
+    return (
+        Coalesce(Subquery(rolled_up, output_field=IntegerField()), Value(0))
+        + Coalesce(Subquery(pending, output_field=IntegerField()), Value(0))
+    )
+
+
+def project_view_total(project):
+    """Total views for a single project."""
+    rolled_up = ProjectViewRollup.objects.filter(
+        project=project, granularity=ProjectViewRollup.Granularity.DAY
+    ).aggregate(total=Sum('view_count'))['total'] or 0
+    return rolled_up + pending_views().filter(project=project).count()
+
+
+def owner_view_totals(user_ids):
+    """
+    Total views across every project owned by each of `user_ids`, in one query.
+
+    Returns:
+        dict: {user_id: views}
+    """
+    from django.contrib.auth import get_user_model
+
+    rolled_up = ProjectViewRollup.objects.filter(
+        project__client=OuterRef('pk'), granularity=ProjectViewRollup.Granularity.DAY
+    ).order_by().values('project__client').annotate(total=Sum('view_count')).values('total')
+    pending = pending_views().filter(
+        project__client=OuterRef('pk')
+    ).values('project__client').annotate(total=Count('pk')).values('total')
+    return dict(get_user_model().objects.filter(pk__in=user_ids).annotate(
+        views=Coalesce(Subquery(rolled_up, output_field=IntegerField()), Value(0))
+        + Coalesce(Subquery(pending, output_field=IntegerField()), Value(0))
+    ).values_list('pk', 'views'))
+
+
+def owner_view_total(user):
+    """Total views across every project owned by `user`, in one query."""
+    return owner_view_totals([user.pk]).get(user.pk, 0)
+
+
+def bucket_floor(moment, granularity):
+    """Round `moment` down to the start of its hour/day bucket."""
+    moment = moment.replace(minute=0, second=0, microsecond=0)
+    if granularity == ProjectViewRollup.Granularity.DAY:
+        moment = moment.replace(hour=0)
+    return moment
+
+
+def impression_series(projects, granularity, start, end):
+    """
+    Views per bucket for `projects` in [start, end), zero-filled for charts.
+
+    Args:
+        projects (QuerySet[Project]): Projects to include
+        granularity (str): ProjectViewRollup.Granularity value
+        start (datetime): Inclusive lower bound (floored to a bucket)
+        end (datetime): Exclusive upper bound
+
+    Returns:
+        list[dict]: [{"bucket": datetime, "views": int}, ...] in ascending order
+    """
+    start = bucket_floor(start, granularity)
+    counts = defaultdict(int)
+
+    rolled_up = ProjectViewRollup.objects.filter(
+        project__in=projects, granularity=granularity,
+        bucket_start__gte=start, bucket_start__lt=end,
+    ).order_by().values('bucket_start').annotate(views=Sum('view_count'))
+    for row in rolled_up:
+        counts[row['bucket_start']] += row['views']
+
+    pending = pending_views().filter(
+        project__in=projects, timestamp__gte=start, timestamp__lt=end,
+    ).annotate(bucket=Trunc('timestamp', TRUNC_KINDS[granularity])).values('bucket').annotate(views=Count('pk'))
+    for row in pending:
+        counts[row['bucket']] += row['views']
+
+    series = []
+    step = BUCKET_STEPS[granularity]
+    bucket = start
+    while bucket < end:
+        series.append({'bucket': bucket, 'views': counts.get(bucket, 0)})
+        bucket += step
+    return series
+
+
+def rollup_project_views(batch_size=50000, retention_days=None):
+    """
+    Fold raw ProjectView rows above the watermark into hour and day buckets.
+
+    Each batch runs in its own transaction that also advances the watermark,
+    so an interrupted run resumes where it stopped and rows are never counted
+    twice. The watermark row is locked (select_for_update) to keep concurrent
+    runs from overlapping.
+
+    Ids are handed out at insert time but become visible at commit, so a
+    transaction still in flight (e.g. a large buffered bulk insert) can
+    commit ids below rows that are already visible. Only rows inserted more
+    than PROJECT_VIEW_ROLLUP_GRACE seconds ago are folded, and the watermark
+    never passes a row that is still inside the grace period; rows below it
+    have committed by then.
+
+    With buffered impressions, spool files that idle or killed workers left
+    behind are written first (ImpressionBuffer.flush_stale).
+
+    Args:
+        batch_size (int): Max raw-row id span processed per transaction
+        retention_days (int|None): If set, delete rolled-up raw rows older than this
+
+    Returns:
+        dict: {"rows": int, "buckets": int, "pruned": int, "watermark": int}
+    """
+    if get_buffer_settings()['ENABLED']:
+        impression_buffer.flush_stale()
+
+    stats = {'rows': 0, 'buckets': 0, 'pruned': 0, 'watermark': 0}
+    project_ids = set()
+    cutoff = timezone.now() - timedelta(seconds=getattr(settings, 'PROJECT_VIEW_ROLLUP_GRACE', 300))
+    RollupWatermark.objects.get_or_create(name=WATERMARK_NAME)
+
+    while True:
+        with transaction.atomic():
+            mark = RollupWatermark.objects.select_for_update().get(name=WATERMARK_NAME)
+            above = ProjectView.objects.filter(id__gt=mark.last_id).order_by()
+            ready = above.filter(inserted_at__lt=cutoff)
+            recent = above.filter(inserted_at__gte=cutoff).aggregate(first=Min('id'))['first']
+            if recent is not None:
+                ready = ready.filter(id__lt=recent)
+
+            # Start at the first ready row, skipping gaps in the id sequence
+            first_id = ready.aggregate(first=Min('id'))['first']
+            if first_id is None:
+                stats['watermark'] = mark.last_id
+                break
+            batch = ready.filter(id__lt=first_id + batch_size)
+            summary = batch.aggregate(rows=Count('pk'), top=Max('id'))
+
+            for granularity, kind in TRUNC_KINDS.items():
+                stats['buckets'] += _merge_buckets(batch, granularity, kind)
+            project_ids.update(batch.values_list('project_id', flat=True).distinct())
+
+            stats['rows'] += summary['rows']
+            mark.last_id = summary['top']
+            mark.save(update_fields=['last_id', 'updated_at'])
+
+    if project_ids:
+        rollups_landed.send(sender=ProjectViewRollup, project_ids=project_ids)
+
+    if retention_days is not None:
+        cutoff = timezone.now() - timedelta(days=retention_days)
+        stats['pruned'], _ = ProjectView.objects.filter(
+            id__lte=stats['watermark'], timestamp__lt=cutoff
+        ).delete()
+    return stats
+
+
+def _merge_buckets(batch, granularity, kind):
+    """Add the batch's per-(project, bucket) counts onto existing rollup rows."""
+    counts = {
+        (row['project_id'], row['bucket']): row['views']
+        for row in batch.annotate(bucket=Trunc('timestamp', kind))
+        .values('project_id', 'bucket').annotate(views=Count('pk'))
+    }
+    if not counts:
+        return 0
+
+    existing = ProjectViewRollup.objects.filter(
+        granularity=granularity,
+        project_id__in={project_id for project_id, _ in counts},
+        bucket_start__in={bucket for _, bucket in counts},
+    )
+    to_update = []
+    for rollup in existing:
+        key = (rollup.project_id, rollup.bucket_start)
+        if key in counts:
+            rollup.view_count += counts.pop(key)
+            to_update.append(rollup)
+
+    ProjectViewRollup.objects.bulk_update(to_update, ['view_count'])
+    ProjectViewRollup.objects.bulk_create([
+        ProjectViewRollup(project_id=project_id, granularity=granularity, bucket_start=bucket, view_count=views)
+        for (project_id, bucket), views in counts.items()
+    ])
+    return len(to_update) + len(counts)
@@ -0,0 +1,128 @@
+"""
+Category Tree Cache
+
+The category hierarchy changes rarely but is read on almost every browse and
+search request, so each process keeps one immutable snapshot of it:
+
+    - the serialized CategorySerializer payload served by the categories endpoint
+    - a descendant index (category id -> ids of itself and everything below it),
+      so "this category or its subcategories" becomes one `category_id__in` filter
+    - the flat list of categories used for name matching in search
+
+The snapshot is tagged with a version stamp stored in Django's cache. Category
+save/delete signals bump the stamp (Project/signals.py), and every process
+rebuilds its snapshot the next time it sees a stamp it did not build from.
+Checking the stamp is a cache read, never a database query.
+
+A per-process cache (locmem, the default without REDIS_URL) cannot carry a
+bump to other processes, so there the stamp expires after
+CATEGORY_TREE_LOCAL_TIMEOUT seconds and each process rebuilds at least that
+often.
+
+Note: QuerySet.update()/bulk_create() bypass signals; call
+`invalidate_category_tree()` after bulk category changes.
+"""
+
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+from utils.cache import is_shared_cache
+
+VERSION_CACHE_KEY = 'project:category_tree:version'
+
+
+class CategoryTree:
+    """Immutable snapshot of the category hierarchy."""
+
+    def __init__(self, version, categories, payload):
+        self.version = version
+        self.payload = payload
+        self.categories = sorted(categories, key=lambda c: c['name'])
+        self.by_id = {c['id']: c for c in categories}
+        self.roots_by_id = {c['id']: c for c in payload}
+
+        children = {}
+        for category in categories:
+            children.setdefault(category['parent_id'], []).append(category['id'])
+
+        self.descendants = {}
+        for category in categories:
+            ids, stack = set(), [category['id']]
+            while stack:
+                current = stack.pop()
+                if current in ids:
+                    continue
+                ids.add(current)
+                stack.extend(children.get(current, ()))
+            self.descendants[category['id']] = frozenset(ids)
+
+    def descendant_ids(self, category_id):
+        """
+        Ids of `category_id` and every category below it.
+
+        Unknown ids map to themselves, so filtering on them matches nothing,
+        exactly like the old `Q(category_id) | Q(category__parent_id)` filter.
+        """
+        return self.descendants.get(category_id, frozenset([category_id]))
+
+    def search(self, query, limit=None):
+        """Categories whose name contains `query` (case-insensitive), ordered by name."""
+        query = query.casefold()
+        matches = [
+            {'id': c['id'], 'name': c['name'], 'slug': c['slug']}
+            for c in self.categories if query in c['name'].casefold()
+        ]
+        return matches[:limit] if limit is not None else matches
+
+
+_lock = threading.Lock()
+_tree = None
+
+
+def _version_timeout():
+    return None if is_shared_cache() else getattr(settings, 'CATEGORY_TREE_LOCAL_TIMEOUT', 30)
+
+
+def _current_version():
+    version = cache.get(VERSION_CACHE_KEY)
+    if version is None:
+        # First use (or the stamp expired): publish a stamp everyone can share
+        cache.add(VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=_version_timeout())
+        version = cache.get(VERSION_CACHE_KEY)
+    return version
+
+
+def _build(version):
+    from .models import Category
+    from .category_serializers import CategorySerializer
+
+    categories = list(Category.objects.values('id', 'name', 'slug', 'parent_id'))
+    roots = Category.objects.filter(parent=None).prefetch_related('subcategories')
+    payload = CategorySerializer(roots, many=True).data
+    return CategoryTree(version, categories, payload)
+
+
+def category_tree_version():
+    """Current version stamp (changes whenever a category is saved or deleted)."""
+    return _current_version()
+
+
+def get_category_tree():
+    """Return the current snapshot, rebuilding it if the version stamp moved."""
+    global _tree
+    version = _current_version()
+    tree = _tree
+    if tree is not None and tree.version == version:
+        return tree
+    with _lock:
+        if _tree is None or _tree.version != version:
+            _tree = _build(version)
+        return _tree
+
+
+def invalidate_category_tree():
+    """Bump the version stamp so every process rebuilds on its next read."""
+    cache.set(VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=_version_timeout())
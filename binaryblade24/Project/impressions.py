@@ -0,0 +1,320 @@
+"""
+Project Impression Ingestion
+
+Write-behind buffering for ProjectView rows, the highest-volume write path
+on the platform (every project page view posts an impression).
+
+Flow (buffered mode, PROJECT_VIEW_BUFFER['ENABLED'] = True):
+    1. RecordProjectView hands the impression to `record_impression()`
+    2. Repeat hits from the same user/IP on the same project within
+       DEDUP_WINDOW seconds are dropped in memory
+    3. Accepted impressions are appended to this process's spool file
+       (<SPOOL_DIR>/<pid>.jsonl), one JSON line each - no database work
+    4. Once MAX_BATCH impressions are pending or FLUSH_INTERVAL seconds have
+       passed, the spool file is rotated and written with one bulk_create
+    5. A worker only checks those thresholds when it records the next view,
+       so `rollup_project_views` first writes the spool files that have gone
+       stale: left by an idle worker, or by one killed before its atexit hook
+       (run it on the host that holds SPOOL_DIR)
+    6. `python manage.py flush_project_views` drains every spool file, e.g.
+       from a shutdown hook after the web workers have stopped
+
+With buffering disabled the impression is written immediately (after the
+same de-duplication), which is the behaviour tests and small installs expect.
+"""
+
+import atexit
+import fcntl
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUFFER_SETTINGS = {
+    'ENABLED': False,
+    'SPOOL_DIR': os.path.join(settings.BASE_DIR, 'impression_spool'),
+    'MAX_BATCH': 500,
+    'FLUSH_INTERVAL': 5,
+    'DEDUP_WINDOW': 30 * 60,
+}
+
+
+# A rotated batch still on disk this long after its rotation is a failed or
+# interrupted flush, not one in progress
+READY_RETRY_AFTER = 60
+
+
+def get_buffer_settings():
+    """Return PROJECT_VIEW_BUFFER merged over the defaults."""
+    return {**DEFAULT_BUFFER_SETTINGS, **getattr(settings, 'PROJECT_VIEW_BUFFER', {})}
+
+
+class ImpressionBuffer:
+    """
+    Process-local impression buffer backed by a shared local spool directory.
+
+    Appends and rotations hold an exclusive flock() on the spool file, and an
+    append re-checks that its handle is still the file at the spool path, so
+    a line written while another process rotates the file lands in either the
+    rotated batch or the fresh spool, never in a batch already loaded.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._recent = {}
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    # ------------------------------------------------------------------
+    # De-duplication
+    # ------------------------------------------------------------------
+
+    def is_duplicate(self, project_id, ip_address, user_id, now=None):
+        """
+        Return True if this user/IP already viewed the project inside the window.
+
+        Records the hit as a side effect, so the first call for a key returns
+        False and repeats within DEDUP_WINDOW return True.
+        """
+        window = get_buffer_settings()['DEDUP_WINDOW']
+        if not window:
+            return False
+        now = now if now is not None else time.monotonic()
+        key = (project_id, ('u', user_id) if user_id else ('ip', ip_address))
+        with self._lock:
+            last_seen = self._recent.get(key)
+            if last_seen is not None and now - last_seen < window:
+                return True
+            self._recent[key] = now
+            # Keep the map bounded: drop expired keys once it grows large
+            if len(self._recent) > 50000:
+                self._recent = {k: t for k, t in self._recent.items() if now - t < window}
+        return False
+
+    def reset(self):
+        """Forget de-duplication state and pending counters (used by tests)."""
+        with self._lock:
+            self._recent.clear()
+            self._pending = 0
+            self._last_flush = time.monotonic()
+
+    # ------------------------------------------------------------------
+    # Spooling
+    # ------------------------------------------------------------------
+
+    def _spool_path(self, spool_dir):
+        return os.path.join(spool_dir, f'{os.getpid()}.jsonl')
+
+    def add(self, project_id, ip_address, user_id, viewed_at=None):
+        """Append an impression to the spool and flush if a threshold is reached."""
+        config = get_buffer_settings()
+        viewed_at = viewed_at or timezone.now()
+        line = json.dumps([project_id, ip_address, user_id, viewed_at.isoformat()])
+
+        with self._lock:
+            os.makedirs(config['SPOOL_DIR'], exist_ok=True)
+            self._append(self._spool_path(config['SPOOL_DIR']), line)
+            self._pending += 1
+            should_flush = (
+                self._pending >= config['MAX_BATCH']
+                or time.monotonic() - self._last_flush >= config['FLUSH_INTERVAL']
+            )
+
+        if should_flush:
+            self.flush()
+
+    def flush(self):
+        """
+        Write this process's spooled impressions to the database.
+
+        Returns:
+            int: Number of ProjectView rows created
+        """
+        spool_dir = get_buffer_settings()['SPOOL_DIR']
+        with self._lock:
+            self._pending = 0
+            self._last_flush = time.monotonic()
+            ready = self._rotate(self._spool_path(spool_dir))
+        return self._load([ready]) if ready else 0
+
+    def drain(self):
+        """
+        Write every spool file in SPOOL_DIR (all processes) to the database.
+
+        Intended for shutdown, once the web workers have stopped writing.
+
+        Returns:
+            int: Number of ProjectView rows created
+        """
+        spool_dir = get_buffer_settings()['SPOOL_DIR']
+        with self._lock:
+            self._pending = 0
+            self._last_flush = time.monotonic()
+            ready = [self._rotate(path) for path in glob.glob(os.path.join(spool_dir, '*.jsonl'))]
+        ready = [path for path in ready if path]
+        # Include batches left behind by a flush that failed earlier
+        ready += [path for path in glob.glob(os.path.join(spool_dir, '*.ready')) if path not in ready]
+        return self._load(ready)
+
+    def flush_stale(self):
+        """
+        Write the spool files of every process that their owners would not write soon.
+
+        Takes live spool files nothing was appended to for FLUSH_INTERVAL
+        seconds (an idle or killed worker; a worker appending meanwhile waits
+        for the rotation and then starts a fresh file) and rotated batches
+        older than READY_RETRY_AFTER.
+
+        Returns:
+            int: Number of ProjectView rows created
+        """
+        config = get_buffer_settings()
+        spool_dir = config['SPOOL_DIR']
+        now = time.time()
+        ready = []
+        for path in glob.glob(os.path.join(spool_dir, '*.jsonl')):
+            try:
+                idle = now - os.path.getmtime(path) >= config['FLUSH_INTERVAL']
+            except FileNotFoundError:
+                continue
+            if idle:
+                ready.append(self._rotate(path))
+        for path in glob.glob(os.path.join(spool_dir, '*.ready')):
+            # <pid>.jsonl.<rotation time_ns>.ready
+            try:
+                rotated_at = int(path.rsplit('.', 2)[-2]) / 1e9
+            except ValueError:
+                continue
+            if now - rotated_at >= READY_RETRY_AFTER:
+                ready.append(path)
+        return self._load([path for path in ready if path])
+
+    @staticmethod
+    def _is_current(spool, path):
+        """True if the open `spool` is still the file at `path` (not rotated away meanwhile)."""
+        try:
+            return os.fstat(spool.fileno()).st_ino == os.stat(path).st_ino
+        except FileNotFoundError:
+            return False
+
+    def _append(self, path, line):
+        """Append one line under the spool's flock, reopening if it was rotated before the lock was taken."""
+        while True:
+            with open(path, 'a', encoding='utf-8') as spool:
+                fcntl.flock(spool, fcntl.LOCK_EX)
+                if self._is_current(spool, path):
+                    spool.write(line + '\n')
+                    return
+
+    def _rotate(self, path):
+        """Atomically move a live spool file aside so new writes start a fresh file."""
+        ready = f'{path}.{time.time_ns()}.ready'
+        try:
+            spool = open(path, 'rb')
+        except FileNotFoundError:
+            return None
+        with spool:
+            # Waits for an append in progress; appends that were waiting on
+            # this lock see the file moved and reopen the spool path
+            fcntl.flock(spool, fcntl.LOCK_EX)
+            if not self._is_current(spool, path):
+                return None  # rotated by another process meanwhile
+            os.replace(path, ready)
+        return ready
+
+    def _load(self, paths):
+        """bulk_create the impressions in `paths`, deleting each file once it is written."""
+        from .models import Project, ProjectView
+        from User.models import User
+
+        created = 0
+        for path in paths:
+            try:
+                with open(path, encoding='utf-8') as spool:
+                    records = [json.loads(line) for line in spool if line.strip()]
+            except FileNotFoundError:
+                continue
+
+            if records:
+                # Projects/users may have been deleted since the view was spooled
+                project_ids = set(Project.objects.filter(
+                    pk__in={r[0] for r in records}
+                ).values_list('pk', flat=True))
+                user_ids = set(User.objects.filter(
+                    pk__in={r[2] for r in records if r[2]}
+                ).values_list('pk', flat=True))
+
+                rows = [
+                    ProjectView(
+                        project_id=project_id,
+                        ip_address=ip_address,
+                        user_id=user_id if user_id in user_ids else None,
+                        timestamp=datetime.fromisoformat(viewed_at),
+                    )
+                    for project_id, ip_address, user_id, viewed_at in records
+                    if project_id in project_ids
+                ]
+                try:
+                    ProjectView.objects.bulk_create(rows, batch_size=get_buffer_settings()['MAX_BATCH'])
+                except Exception:
+                    # Leave the .ready file in place; the next drain retries it
+                    logger.exception("Failed to flush project impressions from %s", path)
+                    continue
+                created += len(rows)
+
+            os.remove(path)
+        return created
+
+    def flush_quietly(self):
+        """atexit hook: flush what this process spooled, never raising during shutdown."""
+        if not get_buffer_settings()['ENABLED']:
+            return
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Failed to flush project impressions at exit")
+
+
+impression_buffer = ImpressionBuffer()
+atexit.register(impression_buffer.flush_quietly)
+
+
+def record_impression(project_id, ip_address, user=None):
+    """
+    Record a project view, buffered or direct depending on settings.
+
+    Args:
+        project_id (int): Viewed project
+        ip_address (str|None): Client IP address
+        user (User|None): Authenticated viewer, if any
+
+    Returns:
+        str: 'queued', 'recorded' or 'duplicate'
+
+    Raises:
+        Project.DoesNotExist: In direct mode, when the project does not exist
+    """
+    from .models import Project, ProjectView
+
+    user_id = user.pk if user is not None else None
+
+    if get_buffer_settings()['ENABLED']:
+        # Existence is checked in bulk at flush time instead of per request
+        if impression_buffer.is_duplicate(project_id, ip_address, user_id):
+            return 'duplicate'
+        impression_buffer.add(project_id, ip_address, user_id)
+        return 'queued'
+
+    project = Project.objects.get(pk=project_id)
+    if impression_buffer.is_duplicate(project.pk, ip_address, user_id):
+        return 'duplicate'
+    ProjectView.objects.create(project=project, ip_address=ip_address, user=user)
+    return 'recorded'
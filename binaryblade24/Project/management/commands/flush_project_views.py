@@ -0,0 +1,22 @@
+"""
+Management command to drain buffered project impressions into the database.
+
+Run it after the web workers have stopped (e.g. in a shutdown/deploy hook) so
+no spooled ProjectView rows are left behind.
+
+Usage: python manage.py flush_project_views
+"""
+
+from django.core.management.base import BaseCommand
+from Project.impressions import impression_buffer, get_buffer_settings
+
+
+class Command(BaseCommand):
+    help = 'Writes all spooled project impressions (write-behind buffer) to the database'
+
+    def handle(self, *args, **options):
+        spool_dir = get_buffer_settings()['SPOOL_DIR']
+        created = impression_buffer.drain()
+        self.stdout.write(self.style.SUCCESS(
+            f'Flushed {created} project view(s) from {spool_dir}.'
+        ))
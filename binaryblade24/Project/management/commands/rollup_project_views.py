@@ -0,0 +1,42 @@
+"""
+Management command to roll raw project views up into hourly/daily buckets.
+
+Incremental: only ProjectView rows newer than the stored watermark are read,
+so it is cheap to run every few minutes from cron.
+
+Usage: python manage.py rollup_project_views [--retention-days 90]
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from Project.analytics import rollup_project_views
+
+
+class Command(BaseCommand):
+    help = 'Aggregates new ProjectView rows into ProjectViewRollup (hour/day) and optionally prunes old raw rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50000,
+            help='Maximum span of raw row ids processed per transaction',
+        )
+        parser.add_argument(
+            '--retention-days',
+            type=int,
+            default=getattr(settings, 'PROJECT_VIEW_RETENTION_DAYS', None),
+            help='Delete raw ProjectView rows older than this once they are rolled up',
+        )
+
+    def handle(self, *args, **options):
+        stats = rollup_project_views(
+            batch_size=options['batch_size'],
+            retention_days=options['retention_days'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Rolled up {stats['rows']} view(s) into {stats['buckets']} bucket update(s); "
+            f"watermark is now {stats['watermark']}."
+        ))
+        if stats['pruned']:
+            self.stdout.write(f"Pruned {stats['pruned']} raw view(s) past retention.")
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.4 on 2026-10-17 03:37
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Project', '0013_projectview'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='projectview',
+            name='timestamp',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 # Create your models here.
 class Category(models.Model):
@@ -58,6 +59,75 @@ class Category(models.Model):
         return self.parent is not None
 
 
+class ProjectQuerySet(models.QuerySet):
+    """
+    Query helpers for project listings.
+    """
+
+    def with_listing_stats(self, user=None, fields=None):
+        """
+        Annotate the per-project numbers that ProjectSerializer displays.
+
+        Every computed field on a project card is resolved inside the listing
+        query (correlated subqueries), so serializing N projects costs the same
+        number of queries as serializing one.
+
+        Args:
+            user (User|None): Viewer, for `user_has_proposal`
+            fields (set[str]|None): Serializer fields being rendered
+                (ProjectSerializer.requested_fields); annotations and joins
+                for fields outside this set are skipped. None means all.
+
+        The owner's rating comes from the joined ReputationStats
+        (`client__reputation`).
+
+        Annotations:
+            review_avg (float|None): Average review rating for the project
+            review_total (int): Number of reviews for the project
+            view_total (int): Number of recorded view impressions (rollups + pending raw rows)
+            user_has_proposal (bool): Whether `user` already submitted a proposal
+                (only annotated for authenticated users)
+        """
+        # Imported here to avoid circular dependency (Review/Proposal import Project)
+        from django.db.models import Avg, Count, Exists, IntegerField, OuterRef, Subquery, Value
+        from django.db.models.functions import Coalesce
+        from Review.models import Review
+        from Proposal.models import Proposal
+        from .analytics import view_total_expression
+
+        def wanted(*names):
+            return fields is None or any(name in fields for name in names)
+
+        project_reviews = Review.objects.filter(project=OuterRef('pk')).order_by().values('project')
+
+        queryset = self
+        if wanted('client_details', 'owner_details'):
+            queryset = queryset.select_related('client__profile', 'client__reputation')
+        if wanted('category_details'):
+            queryset = queryset.select_related('category')
+        if wanted('average_rating'):
+            queryset = queryset.annotate(
+                review_avg=Subquery(project_reviews.annotate(avg=Avg('rating')).values('avg')),
+            )
+        if wanted('review_count'):
+            queryset = queryset.annotate(
+                review_total=Coalesce(
+                    Subquery(project_reviews.annotate(total=Count('pk')).values('total'), output_field=IntegerField()),
+                    Value(0),
+                ),
+            )
+        if wanted('view_count'):
+            queryset = queryset.annotate(view_total=view_total_expression())
+
+        if user is not None and user.is_authenticated and wanted('user_has_submitted'):
+            queryset = queryset.annotate(
+                user_has_proposal=Exists(
+                    Proposal.objects.filter(project=OuterRef('pk'), freelancer=user)
+                )
+            )
+        return queryset
+
+
 class Project(models.Model):
     # Core Fields
     title = models.CharField(unique=True, blank=False, max_length=200)
@@ -122,6 +192,8 @@ class Project(models.Model):
     # Milestone Support
     has_milestones = models.BooleanField(default=False, help_text="Does this project use milestone-based payments?")
     milestone_count = models.IntegerField(default=0, help_text="Total number of milestones")
+
+    objects = ProjectQuerySet.as_manager()
     
     class Meta:
         indexes = [
@@ -264,7 +336,10 @@ class ProjectView(models.Model):
         blank=True,
         related_name='project_views'
     )
-    timestamp = models.DateTimeField(auto_now_add=True, db_index=True)
+    # default (not auto_now_add) so buffered impressions keep the time they were viewed
+    timestamp = models.DateTimeField(default=timezone.now, db_index=True)
+    # When the row was written; rollups wait until its transaction has surely committed
+    inserted_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ['-timestamp']
@@ -273,4 +348,51 @@ class ProjectView(models.Model):
         ]
 
     def __str__(self):
-        return f"View on {self.project.title} at {self.timestamp}"
\ No newline at end of file
+        return f"View on {self.project.title} at {self.timestamp}"
+
+class ProjectViewRollup(models.Model):
+    """
+    Pre-aggregated view counts per project and hour/day bucket.
+
+    Maintained incrementally by `python manage.py rollup_project_views` from
+    ProjectView rows newer than the 'project_views' RollupWatermark. Reads
+    combine these buckets with the (small) tail of raw rows that have not
+    been rolled up yet - see Project/analytics.py.
+    """
+    class Granularity(models.TextChoices):
+        HOUR = 'HOUR', 'Hour'
+        DAY = 'DAY', 'Day'
+
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='view_rollups')
+    granularity = models.CharField(max_length=4, choices=Granularity.choices)
+    bucket_start = models.DateTimeField(help_text="Start of the hour/day (UTC) this bucket covers")
+    view_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['project', 'granularity', 'bucket_start'],
+                name='unique_project_view_rollup_bucket',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['granularity', 'bucket_start']),  # Owner-wide charts over a date range
+        ]
+
+    def __str__(self):
+        return f"{self.project_id} {self.granularity} {self.bucket_start:%Y-%m-%d %H:00}: {self.view_count}"
+
+
+class RollupWatermark(models.Model):
+    """
+    Records how far an incremental rollup has processed its source table.
+
+    `last_id` is the highest source primary key already folded into the
+    rollup; the next run only reads rows with a greater id.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    last_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.last_id}"
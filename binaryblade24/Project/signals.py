@@ -0,0 +1,51 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from Proposal.models import Proposal
+from Review.models import Review
+from utils.cache import bump_namespace
+from .analytics import rollups_landed
+from .category_tree import invalidate_category_tree
+from .models import Category, Project
+
+# Response-cache namespace bumped when each model changes (utils/cache.py)
+CACHE_NAMESPACES = {
+    Project: 'projects',
+    Review: 'reviews',
+    Proposal: 'proposals',
+    Category: 'categories',
+}
+
+
+def _on_change_and_commit(func, *args):
+    """
+    Run `func` now and again on commit.
+
+    A process that rebuilds between the change and the commit would
+    otherwise keep data without the committed rows.
+    """
+    func(*args)
+    transaction.on_commit(lambda: func(*args))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_tree_on_change(sender, **kwargs):
+    """Bump the category tree version when a category changes."""
+    _on_change_and_commit(invalidate_category_tree)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_response_cache(sender, **kwargs):
+    """Invalidate cached public responses that depend on the changed model."""
+    namespace = CACHE_NAMESPACES.get(sender)
+    if namespace:
+        _on_change_and_commit(bump_namespace, namespace)
+
+
+@receiver(rollups_landed)
+def bump_views_namespace(sender, **kwargs):
+    """Rolled-up views change the view counts in public project payloads."""
+    _on_change_and_commit(bump_namespace, 'views')
@@ -1,6 +1,30 @@
+import shutil
+import tempfile
+import time
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from Project.models import Project, Category, ProjectView
+from Project.impressions import impression_buffer
+from Project.models import ProjectViewRollup
+from Project.analytics import rollup_project_views, owner_view_total
+from Project.category_tree import get_category_tree
+from utils.cache import cache_stats
+from datetime import datetime, timedelta, timezone as dt_timezone
+from Proposal.models import Proposal
+from Review.models import Review
+from User.models import Role
+
+User = get_user_model()
+
 
 class ProjectAPITests(APITestCase):
     def test_list_projects(self):
@@ -25,4 +49,926 @@ class ProjectAPITests(APITestCase):
         """
         url = reverse('project_api:project-list')
         response = self.client.get(f"{url}?category=undefined", format='json')
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class ProjectListQueryCountTests(APITestCase):
+    """
+    The project list must cost a fixed number of queries regardless of size.
+    """
+
+    def setUp(self):
+        self.freelancer_role, _ = Role.objects.get_or_create(name='FREELANCER')
+        self.owner = User.objects.create_user(
+            username='owner', email='owner@example.com', password='password123',
+            country_origin='US', identity_number='owner-id'
+        )
+        self.reviewer = User.objects.create_user(
+            username='reviewer', email='reviewer@example.com', password='password123',
+            country_origin='US', identity_number='reviewer-id'
+        )
+        self.freelancer = User.objects.create_user(
+            username='freelancer', email='freelancer@example.com', password='password123',
+            country_origin='US', identity_number='freelancer-id'
+        )
+        self.freelancer.roles.add(self.freelancer_role)
+        self.category = Category.objects.create(name='Design', slug='design')
+        self.url = reverse('project_api:project-list')
+
+    def _create_projects(self, count):
+        start = Project.objects.count()
+        for i in range(start, start + count):
+            owner = User.objects.create_user(
+                username=f'seller{i}', email=f'seller{i}@example.com', password='password123',
+                country_origin='US', identity_number=f'seller-{i}'
+            )
+            project = Project.objects.create(
+                title=f'Project {i}', description='Description', budget=100, price=100,
+                category=self.category, client=owner,
+            )
+            Review.objects.create(project=project, reviewer=self.reviewer, reviewee=owner, rating=4, comment='Good')
+            Review.objects.create(project=project, reviewer=self.owner, reviewee=owner, rating=5, comment='Great')
+            ProjectView.objects.create(project=project, ip_address='127.0.0.1')
+            Proposal.objects.create(project=project, freelancer=self.freelancer, bid_amount=100, cover_letter='Hi')
+
+    def _count_list_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(ctx.captured_queries), response
+
+    def test_list_query_count_is_constant(self):
+        self._create_projects(2)
+        small_count, _ = self._count_list_queries()
+        self._create_projects(5)
+        large_count, response = self._count_list_queries()
+        self.assertEqual(small_count, large_count)
+        self.assertEqual(len(response.data['results']), 7)
+
+    def test_list_query_count_is_constant_when_authenticated(self):
+        self.client.force_authenticate(user=self.freelancer)
+        self._create_projects(2)
+        small_count, _ = self._count_list_queries()
+        self._create_projects(5)
+        large_count, response = self._count_list_queries()
+        self.assertEqual(small_count, large_count)
+        self.assertTrue(all(item['user_has_submitted'] for item in response.data['results']))
+
+    def test_list_reports_annotated_values(self):
+        self._create_projects(1)
+        _, response = self._count_list_queries()
+        item = response.data['results'][0]
+        self.assertEqual(item['average_rating'], 4.5)
+        self.assertEqual(item['review_count'], 2)
+        self.assertEqual(item['view_count'], 1)
+        self.assertFalse(item['user_has_submitted'])
+        self.assertEqual(item['client_details']['avg_rating'], 4.5)
+
+
+@override_settings(API_PAGE_SIZE=3, API_MAX_PAGE_SIZE=5)
+class ProjectListPaginationTests(APITestCase):
+    """
+    Keyset pagination on (created_at, id) for the project list.
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username='owner', email='owner@example.com', password='password123',
+            country_origin='US', identity_number='owner-id'
+        )
+        self.category = Category.objects.create(name='Design', slug='design')
+        self.url = reverse('project_api:project-list')
+        for i in range(8):
+            Project.objects.create(
+                title=f'Project {i}', description='Description', budget=100, price=100,
+                category=self.category, client=self.owner,
+            )
+        # Several rows share a timestamp so the id tie-breaker is exercised
+        Project.objects.filter(title__in=['Project 2', 'Project 3', 'Project 4']).update(
+            created_at=timezone.now()
+        )
+
+    def _walk(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url, format='json')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data['results']), 3)
+            ids.extend(item['id'] for item in response.data['results'])
+            url = response.data['next']
+        return ids
+
+    def test_pages_cover_every_project_once_in_order(self):
+        ids = self._walk(self.url)
+        expected = list(
+            Project.objects.order_by('-created_at', '-id').values_list('id', flat=True)
+        )
+        self.assertEqual(ids, expected)
+
+    def test_previous_link_returns_prior_page(self):
+        first = self.client.get(self.url, format='json').data
+        self.assertIsNone(first['previous'])
+        second = self.client.get(first['next'], format='json').data
+        back = self.client.get(second['previous'], format='json').data
+        self.assertEqual(
+            [item['id'] for item in back['results']],
+            [item['id'] for item in first['results']],
+        )
+
+    def test_page_size_is_capped(self):
+        response = self.client.get(f"{self.url}?page_size=50", format='json')
+        self.assertEqual(len(response.data['results']), 5)
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(f"{self.url}?cursor=not-a-cursor", format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_deep_page_costs_same_queries_as_first(self):
+        with CaptureQueriesContext(connection) as first_ctx:
+            first = self.client.get(self.url, format='json')
+        url = first.data['next']
+        url = self.client.get(url, format='json').data['next']
+        with CaptureQueriesContext(connection) as deep_ctx:
+            self.client.get(url, format='json')
+        self.assertEqual(len(first_ctx.captured_queries), len(deep_ctx.captured_queries))
+
+
+class RecordProjectViewTests(APITestCase):
+    """
+    Impression ingestion: de-duplication, direct writes and the write-behind buffer.
+    """
+
+    def setUp(self):
+        self.spool_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.spool_dir, ignore_errors=True)
+        impression_buffer.reset()
+        self.addCleanup(impression_buffer.reset)
+
+        owner = User.objects.create_user(
+            username='owner', email='owner@example.com', password='password123',
+            country_origin='US', identity_number='owner-id'
+        )
+        category = Category.objects.create(name='Design', slug='design')
+        self.project = Project.objects.create(
+            title='Logo', description='Description', budget=100, price=100,
+            category=category, client=owner,
+        )
+        self.url = reverse('project_api:record-project-view', kwargs={'pk': self.project.pk})
+
+    def _buffer_settings(self, **overrides):
+        return {
+            'ENABLED': True, 'SPOOL_DIR': self.spool_dir, 'MAX_BATCH': 100,
+            'FLUSH_INTERVAL': 3600, 'DEDUP_WINDOW': 1800, **overrides,
+        }
+
+    def test_direct_mode_drops_repeat_views(self):
+        first = self.client.post(self.url, REMOTE_ADDR='10.0.0.1')
+        repeat = self.client.post(self.url, REMOTE_ADDR='10.0.0.1')
+        other = self.client.post(self.url, REMOTE_ADDR='10.0.0.2')
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(repeat.status_code, status.HTTP_200_OK)
+        self.assertEqual(other.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(ProjectView.objects.count(), 2)
+
+    def test_direct_mode_unknown_project_returns_404(self):
+        url = reverse('project_api:record-project-view', kwargs={'pk': self.project.pk + 100})
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_buffered_views_are_written_by_flush_command(self):
+        with override_settings(PROJECT_VIEW_BUFFER=self._buffer_settings()):
+            for i in range(5):
+                response = self.client.post(self.url, REMOTE_ADDR=f'10.0.0.{i}')
+                self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.client.post(self.url, REMOTE_ADDR='10.0.0.0')  # repeat, dropped
+            self.assertEqual(ProjectView.objects.count(), 0)
+
+            call_command('flush_project_views', stdout=StringIO())
+        self.assertEqual(ProjectView.objects.filter(project=self.project).count(), 5)
+
+    def test_buffer_flushes_when_batch_is_full(self):
+        with override_settings(PROJECT_VIEW_BUFFER=self._buffer_settings(MAX_BATCH=3)):
+            for i in range(3):
+                self.client.post(self.url, REMOTE_ADDR=f'10.0.1.{i}')
+        self.assertEqual(ProjectView.objects.count(), 3)
+
+    @override_settings(PROJECT_VIEW_ROLLUP_GRACE=0)
+    def test_rollup_writes_spools_left_by_idle_workers(self):
+        import glob
+        import os
+
+        with override_settings(PROJECT_VIEW_BUFFER=self._buffer_settings(FLUSH_INTERVAL=60)):
+            for i in range(2):
+                self.client.post(self.url, REMOTE_ADDR=f'10.0.3.{i}')
+            spool, = glob.glob(os.path.join(self.spool_dir, '*.jsonl'))
+
+            # Still inside the interval: left to its worker
+            rollup_project_views()
+            self.assertEqual(ProjectView.objects.count(), 0)
+
+            # The worker went idle (or was killed)
+            idle_since = time.time() - 120
+            os.utime(spool, (idle_since, idle_since))
+            self.assertEqual(rollup_project_views()['rows'], 2)
+            self.assertEqual(ProjectView.objects.count(), 2)
+            self.assertEqual(os.listdir(self.spool_dir), [])
+
+            # A batch whose flush failed long ago is retried as well
+            stale = os.path.join(self.spool_dir, f'1.jsonl.{time.time_ns() - 120 * 10 ** 9}.ready')
+            with open(stale, 'w', encoding='utf-8') as batch:
+                batch.write(f'[{self.project.pk}, "10.0.3.9", null, "2025-03-10T00:00:00+00:00"]\n')
+            self.assertEqual(rollup_project_views()['rows'], 1)
+
+    def test_rotation_waits_for_an_append_in_progress(self):
+        import fcntl
+        import glob
+        import os
+        import threading
+
+        with override_settings(PROJECT_VIEW_BUFFER=self._buffer_settings()):
+            self.client.post(self.url, REMOTE_ADDR='10.0.4.1')
+            spool, = glob.glob(os.path.join(self.spool_dir, '*.jsonl'))
+            rotated = []
+            with open(spool, 'a', encoding='utf-8') as writer:
+                fcntl.flock(writer, fcntl.LOCK_EX)
+                rotation = threading.Thread(target=lambda: rotated.append(impression_buffer._rotate(spool)))
+                rotation.start()
+                rotation.join(0.2)
+                self.assertTrue(rotation.is_alive())
+                writer.write(f'[{self.project.pk}, "10.0.4.2", null, "2025-03-10T00:00:00+00:00"]\n')
+            rotation.join()
+
+            # The next append starts a fresh spool instead of the rotated file
+            self.client.post(self.url, REMOTE_ADDR='10.0.4.3')
+            self.assertEqual(impression_buffer._load(rotated), 2)
+            self.assertEqual(impression_buffer.drain(), 1)
+
+    def test_buffered_views_for_missing_projects_are_discarded(self):
+        url = reverse('project_api:record-project-view', kwargs={'pk': self.project.pk + 100})
+        with override_settings(PROJECT_VIEW_BUFFER=self._buffer_settings()):
+            self.client.post(url, REMOTE_ADDR='10.0.2.1')
+            self.client.post(self.url, REMOTE_ADDR='10.0.2.1')
+            impression_buffer.drain()
+        self.assertEqual(ProjectView.objects.count(), 1)
+
+
+@override_settings(PROJECT_VIEW_ROLLUP_GRACE=0)
+class ProjectViewRollupTests(APITestCase):
+    """
+    Incremental hour/day rollups and the reads built on them.
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username='owner', email='owner@example.com', password='password123',
+            country_origin='US', identity_number='owner-id'
+        )
+        category = Category.objects.create(name='Design', slug='design')
+        self.project = Project.objects.create(
+            title='Logo', description='Description', budget=100, price=100,
+            category=category, client=self.owner,
+        )
+        self.day = datetime(2025, 3, 10, tzinfo=dt_timezone.utc)
+
+    def _views(self, *hours):
+        for hour in hours:
+            ProjectView.objects.create(project=self.project, timestamp=self.day + timedelta(hours=hour, minutes=5))
+
+    def test_rollup_buckets_by_hour_and_day(self):
+        self._views(1, 1, 3, 25)
+        stats = rollup_project_views()
+        self.assertEqual(stats['rows'], 4)
+
+        hours = dict(ProjectViewRollup.objects.filter(
+            granularity=ProjectViewRollup.Granularity.HOUR
+        ).values_list('bucket_start', 'view_count'))
+        self.assertEqual(hours[self.day + timedelta(hours=1)], 2)
+        self.assertEqual(hours[self.day + timedelta(hours=3)], 1)
+        days = dict(ProjectViewRollup.objects.filter(
+            granularity=ProjectViewRollup.Granularity.DAY
+        ).values_list('bucket_start', 'view_count'))
+        self.assertEqual(days, {self.day: 3, self.day + timedelta(days=1): 1})
+
+    def test_rollup_is_incremental(self):
+        self._views(1, 2)
+        rollup_project_views()
+        self._views(2)
+        stats = rollup_project_views()
+        self.assertEqual(stats['rows'], 1)
+        self.assertEqual(
+            ProjectViewRollup.objects.get(granularity=ProjectViewRollup.Granularity.DAY).view_count, 3
+        )
+        self.assertEqual(rollup_project_views()['rows'], 0)
+
+    def test_late_commits_below_the_watermark_are_rolled_up(self):
+        self._views(1)
+        rollup_project_views()
+        first = ProjectView.objects.get()
+
+        # A fresh row may have lower-id neighbours in transactions that have not committed yet
+        ProjectView.objects.create(id=first.id + 10, project=self.project, timestamp=self.day)
+        with override_settings(PROJECT_VIEW_ROLLUP_GRACE=60):
+            stats = rollup_project_views()
+        self.assertEqual((stats['rows'], stats['watermark']), (0, first.id))
+
+        # One of them commits a lower id after the run
+        ProjectView.objects.create(id=first.id + 5, project=self.project, timestamp=self.day)
+        self.assertEqual(owner_view_total(self.owner), 3)
+        stats = rollup_project_views()
+        self.assertEqual((stats['rows'], stats['watermark']), (2, first.id + 10))
+        self.assertEqual(owner_view_total(self.owner), 3)
+
+    def test_totals_combine_rollups_and_pending_rows(self):
+        self._views(1, 2)
+        rollup_project_views()
+        self._views(3)
+        self.assertEqual(owner_view_total(self.owner), 3)
+        response = self.client.get(reverse('project_api:project-list'), format='json')
+        self.assertEqual(response.data['results'][0]['view_count'], 3)
+
+    def test_retention_prunes_only_rolled_up_rows(self):
+        self._views(1, 2)
+        rollup_project_views(retention_days=1)
+        self.assertEqual(ProjectView.objects.count(), 0)
+        self.assertEqual(owner_view_total(self.owner), 2)
+
+    def test_impressions_endpoint_returns_zero_filled_series(self):
+        self._views(1, 25)
+        rollup_project_views()
+        self._views(26)
+        self.client.force_authenticate(user=self.owner)
+        response = self.client.get(
+            reverse('project_api:project-impressions'),
+            {'granularity': 'day', 'start': '2025-03-09', 'end': '2025-03-11'},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([point['views'] for point in response.data['series']], [0, 1, 2])
+        self.assertEqual(response.data['total'], 3)
+
+    def test_impressions_endpoint_hides_other_users_projects(self):
+        other = User.objects.create_user(
+            username='other', email='other@example.com', password='password123',
+            country_origin='US', identity_number='other-id'
+        )
+        self.client.force_authenticate(user=other)
+        response = self.client.get(reverse('project_api:project-impressions'), {'project': self.project.pk})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class CategoryTreeCacheTests(APITestCase):
+    """
+    Categories are served from the in-process tree and invalidated on change.
+    """
+
+    def setUp(self):
+        self.root = Category.objects.create(name='Development', slug='development')
+        self.child = Category.objects.create(name='Frontend', slug='frontend', parent=self.root)
+        self.other = Category.objects.create(name='Design', slug='design')
+        self.owner = User.objects.create_user(
+            username='owner', email='owner@example.com', password='password123',
+            country_origin='US', identity_number='owner-id'
+        )
+        for title, category in [('Root', self.root), ('Child', self.child), ('Other', self.other)]:
+            Project.objects.create(
+                title=title, description='Description', budget=100, price=100,
+                category=category, client=self.owner,
+            )
+        self.url = reverse('project_api:category-list')
+
+    def test_descendant_ids(self):
+        tree = get_category_tree()
+        self.assertEqual(tree.descendant_ids(self.root.id), {self.root.id, self.child.id})
+        self.assertEqual(tree.descendant_ids(self.child.id), {self.child.id})
+        self.assertEqual(tree.descendant_ids(999999), {999999})
+
+    def test_list_served_without_queries(self):
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url)
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertEqual([c['name'] for c in response.data], ['Design', 'Development'])
+        self.assertEqual(response.data[1]['subcategories'][0]['slug'], 'frontend')
+
+    def test_save_and_delete_invalidate_tree(self):
+        self.client.get(self.url)
+        Category.objects.create(name='Backend', slug='backend', parent=self.root)
+        response = self.client.get(self.url)
+        names = [sub['name'] for sub in response.data[1]['subcategories']]
+        self.assertEqual(names, ['Backend', 'Frontend'])
+
+        self.other.delete()
+        response = self.client.get(self.url)
+        self.assertEqual([c['name'] for c in response.data], ['Development'])
+
+    @override_settings(CATEGORY_TREE_LOCAL_TIMEOUT=0.2)
+    def test_per_process_cache_stamp_expires(self):
+        # Another process's rename: its version bump never reaches this process's locmem cache
+        cache.delete('project:category_tree:version')
+        self.client.get(self.url)
+        Category.objects.filter(pk=self.other.pk).update(name='Branding')
+        self.assertEqual(self.client.get(self.url).data[0]['name'], 'Design')
+        time.sleep(0.3)
+        self.assertEqual(self.client.get(self.url).data[0]['name'], 'Branding')
+
+    def test_retrieve_root_category(self):
+        response = self.client.get(reverse('project_api:category-detail', args=[self.root.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['slug'], 'development')
+        response = self.client.get(reverse('project_api:category-detail', args=[self.child.id]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_project_filter_includes_subcategories(self):
+        response = self.client.get(reverse('project_api:project-list'), {'category': self.root.id})
+        titles = sorted(item['title'] for item in response.data['results'])
+        self.assertEqual(titles, ['Child', 'Root'])
+
+
+class PublicResponseCacheTests(APITestCase):
+    """
+    Anonymous project reads are cached and invalidated by model signals.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name='Design', slug='design')
+        self.owner = User.objects.create_user(
+            username='owner', email='owner@example.com', password='password123',
+            country_origin='US', identity_number='owner-id'
+        )
+        self.project = Project.objects.create(
+            title='Logo', description='Description', budget=100, price=100,
+            category=self.category, client=self.owner,
+        )
+        self.url = reverse('project_api:project-list')
+
+    def test_second_request_is_served_from_cache(self):
+        first = self.client.get(self.url, {'client': self.owner.id, 'page_size': 5})
+        with CaptureQueriesContext(connection) as ctx:
+            second = self.client.get(self.url, {'page_size': 5, 'client': self.owner.id})
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        # The ETag and the payload both come from the cache
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(cache_stats()['project_list'], {'hits': 1, 'misses': 1, 'hit_rate': 0.5})
+
+    def test_model_changes_invalidate(self):
+        detail_url = reverse('project_api:project-detail', args=[self.project.id])
+        self.client.get(detail_url)
+
+        Review.objects.create(project=self.project, reviewer=self.owner, reviewee=self.owner, rating=4, comment='Ok')
+        response = self.client.get(detail_url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['review_count'], 1)
+
+        self.project.title = 'New logo'
+        self.project.save()
+        response = self.client.get(detail_url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['title'], 'New logo')
+
+    def test_authenticated_requests_bypass_cache(self):
+        self.client.force_authenticate(user=self.owner)
+        self.client.get(self.url)
+        response = self.client.get(self.url)
+        self.assertFalse(response.has_header('X-Cache'))
+
+    def test_cache_stats_endpoint_requires_staff(self):
+        url = reverse('dashboard_api:cache-stats')
+        self.client.force_authenticate(user=self.owner)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.owner.is_staff = True
+        self.owner.save()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('project_list', response.data['views'])
+
+
+# A cache every process shares, as with REDIS_URL: namespace-version ETags are only issued then
+SHARED_CACHES = {'default': {
+    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+    'LOCATION': f'{tempfile.gettempdir()}/binaryblade-test-cache',
+}}
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class ConditionalGetTests(APITestCase):
+    """
+    ETag / Last-Modified validators answer unchanged polls with 304.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name='Design', slug='design')
+        self.owner = User.objects.create_user(
+            username='owner', email='owner@example.com', password='password123',
+            country_origin='US', identity_number='owner-id'
+        )
+        self.project = Project.objects.create(
+            title='Logo', description='Description', budget=100, price=100,
+            category=self.category, client=self.owner,
+        )
+
+    def _revalidate(self, url, response):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_project_detail(self):
+        url = reverse('project_api:project-detail', args=[self.project.id])
+        response = self.client.get(url)
+        self.assertTrue(response.has_header('Last-Modified'))
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self._revalidate(url, response).status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+        self.project.title = 'New logo'
+        self.project.save()
+        self.assertEqual(self._revalidate(url, response).status_code, status.HTTP_200_OK)
+
+    def test_project_list(self):
+        url = reverse('project_api:project-list')
+        response = self.client.get(url)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self._revalidate(url, response).status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+        Project.objects.create(
+            title='Banner', description='Description', budget=50, price=50,
+            category=self.category, client=self.owner,
+        )
+        self.assertEqual(self._revalidate(url, response).status_code, status.HTTP_200_OK)
+
+    @override_settings(PROJECT_VIEW_ROLLUP_GRACE=0)
+    def test_project_list_follows_rolled_up_views(self):
+        url = reverse('project_api:project-list')
+        response = self.client.get(url)
+        ProjectView.objects.create(project=self.project)
+        rollup_project_views()
+        response = self._revalidate(url, response)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['view_count'], 1)
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_no_project_etags_with_a_per_process_cache(self):
+        for url in (reverse('project_api:project-list'), reverse('project_api:project-detail', args=[self.project.id])):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertFalse(response.has_header('ETag'))
+
+    def test_categories(self):
+        url = reverse('project_api:category-list')
+        response = self.client.get(url)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self._revalidate(url, response).status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+        Category.objects.create(name='Branding', slug='branding', parent=self.category)
+        self.assertEqual(self._revalidate(url, response).status_code, status.HTTP_200_OK)
+
+    def test_profile(self):
+        url = reverse('user_api:user-profile', args=[self.owner.id])
+        self.client.force_authenticate(user=self.owner)
+        response = self.client.get(url)
+        self.assertEqual(self._revalidate(url, response).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.owner.profile.bio = 'Designer'
+        self.owner.profile.save()
+        self.assertEqual(self._revalidate(url, response).status_code, status.HTTP_200_OK)
+
+    def test_profile_follows_user_and_skill_rows(self):
+        from User.models import ProfileSkill, Skill
+
+        url = reverse('user_api:user-profile', args=[self.owner.id])
+        self.client.force_authenticate(user=self.owner)
+        response = self.client.get(url)
+        User.objects.filter(pk=self.owner.pk).update(first_name='Renamed')
+        response = self._revalidate(url, response)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        skill = Skill.objects.create(name='Figma', key='figma')
+        ProfileSkill.objects.create(profile=self.owner.profile, skill=skill)
+        self.assertEqual(self._revalidate(url, response).status_code, status.HTTP_200_OK)
+
+
+class SparseFieldsetTests(APITestCase):
+    """
+    ?fields= / ?expand= narrow project responses before anything is computed.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name='Design', slug='design')
+        self.owner = User.objects.create_user(
+            username='owner', email='owner@example.com', password='password123',
+            country_origin='US', identity_number='owner-id'
+        )
+        self.project = Project.objects.create(
+            title='Logo', description='Description', budget=100, price=100,
+            category=self.category, client=self.owner,
+        )
+        Review.objects.create(project=self.project, reviewer=self.owner, reviewee=self.owner, rating=4, comment='Ok')
+        self.url = reverse('project_api:project-list')
+
+    def _list(self, params):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        list_sql = [q['sql'] for q in ctx.captured_queries if 'FROM "Project_project"' in q['sql']]
+        return response.data['results'][0], ' '.join(list_sql)
+
+    def test_fields_limits_payload_and_query(self):
+        item, sql = self._list({'fields': 'id,title,price'})
+        self.assertEqual(set(item), {'id', 'title', 'price'})
+        self.assertNotIn('Review_review', sql)
+        self.assertNotIn('User_user', sql)
+
+    def test_expand_selects_nested_fields(self):
+        item, sql = self._list({'expand': 'category_details'})
+        self.assertIn('title', item)
+        self.assertIn('category_details', item)
+        self.assertNotIn('client_details', item)
+        self.assertNotIn('average_rating', item)
+        self.assertNotIn('Review_review', sql)
+
+        item, _ = self._list({'fields': 'id', 'expand': 'average_rating'})
+        self.assertEqual(item, {'id': self.project.id, 'average_rating': 4.0})
+
+    def test_default_payload_unchanged(self):
+        item, _ = self._list({})
+        self.assertIn('client_details', item)
+        self.assertIn('view_count', item)
+        # owner_details reuses the client_details payload instead of rebuilding it
+        self.assertIs(item['owner_details'], item['client_details'])
+
+
+class ProfileProjectFieldsTests(APITestCase):
+    """
+    ProfileSerializer fills completed/portfolio/active/posted from one project query.
+    """
+
+    def setUp(self):
+        self.category = Category.objects.create(name='Design', slug='design')
+        self.users = []
+        for i in range(3):
+            user = User.objects.create_user(
+                username=f'client{i}', email=f'client{i}@example.com', password='password123',
+                country_origin='US', identity_number=f'client-{i}'
+            )
+            for state in (Project.ProjectStatus.COMPLETED, Project.ProjectStatus.IN_PROGRESS, Project.ProjectStatus.OPEN):
+                Project.objects.create(
+                    title=f'{user.username} {state}', description='Description', budget=100, price=100,
+                    category=self.category, client=user, status=state,
+                    thumbnail='project_thumbnails/logo.png' if state == Project.ProjectStatus.COMPLETED else None,
+                )
+            self.users.append(user)
+
+    def test_profile_fields(self):
+        from User.Serializers import ProfileSerializer
+
+        user = self.users[0]
+        with CaptureQueriesContext(connection) as ctx:
+            data = ProfileSerializer(user.profile).data
+        self.assertEqual(data['projects_posted'], 3)
+        self.assertEqual([p['title'] for p in data['completed_projects']], ['client0 COMPLETED'])
+        self.assertEqual([p['title'] for p in data['active_projects']], ['client0 IN_PROGRESS'])
+        self.assertEqual(data['portfolio'], ['/media/project_thumbnails/logo.png'])
+        self.assertEqual(data['completed_projects'][0]['thumbnail'], data['portfolio'][0])
+        project_queries = [q for q in ctx.captured_queries if 'Project_project' in q['sql']]
+        self.assertEqual(len(project_queries), 1)
+
+    def test_user_list_loads_projects_once(self):
+        from User.Serializers import UserSerializer
+
+        with CaptureQueriesContext(connection) as ctx:
+            data = UserSerializer(User.objects.filter(pk__in=[u.pk for u in self.users]), many=True).data
+        self.assertEqual([u['profile']['projects_posted'] for u in data], [3, 3, 3])
+        project_queries = [q for q in ctx.captured_queries if 'Project_project' in q['sql']]
+        self.assertEqual(len(project_queries), 1)
+
+
+class SerializerMemoTests(APITestCase):
+    """
+    Nested user serializers render each user once per GET request.
+    """
+
+    def setUp(self):
+        from utils.memo import reset_memo_stats
+
+        cache.clear()
+        reset_memo_stats()
+        self.category = Category.objects.create(name='Design', slug='design')
+        self.owner = User.objects.create_user(
+            username='owner', email='owner@example.com', password='password123',
+            country_origin='US', identity_number='owner-id'
+        )
+        for i in range(5):
+            Project.objects.create(
+                title=f'Gig {i}', description='Description', budget=100, price=100,
+                category=self.category, client=self.owner,
+            )
+
+    def test_owner_rendered_once_per_request(self):
+        from utils.memo import memo_stats
+
+        response = self.client.get(reverse('project_api:project-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        owners = [project['client_details'] for project in response.data['results']]
+        self.assertEqual(len(owners), 5)
+        self.assertTrue(all(owner == owners[0] for owner in owners))
+        self.assertEqual(owners[0]['username'], 'owner')
+        self.assertEqual(memo_stats()['freelancer_detail'], {'hits': 4, 'misses': 1, 'hit_rate': 0.8})
+
+    def test_stats_are_flushed_in_batches(self):
+        from utils.memo import STATS_KEY, memo_stats
+
+        for _ in range(2):
+            self.client.get(reverse('project_api:project-list'), {'page_size': 5})
+        # The request path keeps counts in process; reading the stats flushes them
+        self.assertIsNone(cache.get(STATS_KEY.format('freelancer_detail', 'miss')))
+        self.assertEqual(memo_stats()['freelancer_detail']['misses'], 1)
+        self.assertEqual(cache.get(STATS_KEY.format('freelancer_detail', 'miss')), 1)
+
+    def test_memo_does_not_outlive_the_request(self):
+        from utils.memo import memo_stats
+
+        url = reverse('project_api:project-detail', args=[Project.objects.first().pk])
+        self.client.force_authenticate(user=self.owner)  # Bypass the response cache
+        self.client.get(url)
+        self.owner.first_name = 'Renamed'
+        self.owner.save()
+        response = self.client.get(url)
+        self.assertEqual(response.data['client_details']['first_name'], 'Renamed')
+        self.assertEqual(memo_stats()['freelancer_detail']['misses'], 2)
+
+    def test_no_memo_outside_requests(self):
+        from User.Serializers import FreelancerDetailSerializer
+        from utils.memo import memo_stats
+
+        FreelancerDetailSerializer(self.owner).data
+        FreelancerDetailSerializer(self.owner).data
+        self.assertEqual(memo_stats()['freelancer_detail']['hit_rate'], None)
+
+
+class RoleClaimsTests(APITestCase):
+    """
+    Role permission checks are answered from the access token while its role_version is current.
+    """
+
+    def setUp(self):
+        self.freelancer_role, _ = Role.objects.get_or_create(name='FREELANCER')
+        self.user = User.objects.create_user(
+            username='client', email='client@example.com', password='password123',
+            country_origin='US', identity_number='client-id'
+        )
+        self.user.roles.add(self.freelancer_role)
+        self.my_jobs = reverse('project_api:project-my-jobs')
+
+    def _login(self):
+        response = self.client.post(
+            reverse('user_api:login'), {'email': 'client@example.com', 'password': 'password123'}, format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data['access']
+
+    def _role_queries(self, access):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.my_jobs)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [q for q in ctx.captured_queries if 'User_role' in q['sql']]
+
+    def test_login_token_carries_roles(self):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        token = AccessToken(self._login())
+        self.assertEqual(token['roles'], ['FREELANCER'])
+        self.assertEqual(token['role_version'], User.objects.get(pk=self.user.pk).role_version)
+        self.assertEqual(self._role_queries(str(token)), [])
+
+    def test_role_change_invalidates_claims(self):
+        access = self._login()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        response = self.client.post(reverse('user_api:add_freelancer_role'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # The old token still authenticates, but its roles are read from the database
+        self.assertEqual(len(self._role_queries(access)), 1)
+        self.assertEqual(self._role_queries(response.data['access']), [])
+
+    def test_claims_lose_to_removed_role(self):
+        access = self._login()
+        self.user.roles.remove(self.freelancer_role)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        self.assertEqual(self.client.get(self.my_jobs).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_stale_instance_does_not_roll_back_role_version(self):
+        stale = User.objects.get(pk=self.user.pk)
+        self.freelancer_role.users.clear()
+        stale.first_name = 'Renamed'
+        stale.save()
+        fresh = User.objects.get(pk=self.user.pk)
+        self.assertEqual(fresh.first_name, 'Renamed')
+        self.assertEqual(fresh.role_version, stale.role_version + 1)
+
+
+@override_settings(AUTH_USER_CACHE_TIMEOUT=60)
+class CachedAuthUserTests(APITestCase):
+    """
+    JWT authentication reads the user from a cached snapshot; saves and role changes drop it.
+    """
+
+    def setUp(self):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        cache.clear()
+        self.freelancer_role, _ = Role.objects.get_or_create(name='FREELANCER')
+        self.user = User.objects.create_user(
+            username='freelancer', email='freelancer@example.com', password='password123',
+            country_origin='US', identity_number='freelancer-id'
+        )
+        self.user.roles.add(self.freelancer_role)
+        # A token without role claims: roles must come from the snapshot
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+        self.url = reverse('project_api:project-my-jobs')
+
+    def _auth_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url)
+        return response, [q for q in ctx.captured_queries if 'FROM "User_user"' in q['sql'] or 'User_role' in q['sql']]
+
+    def test_warm_cache_runs_no_auth_queries(self):
+        response, queries = self._auth_queries()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 2)  # User row (with profile id) and roles
+        response, queries = self._auth_queries()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(queries, [])
+
+    @override_settings(AUTH_USER_CACHE_TIMEOUT=0)
+    def test_disabled_cache_reads_the_user_every_time(self):
+        for _ in range(2):
+            response, queries = self._auth_queries()
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(queries), 2)
+
+    def test_deferred_fields_load_in_one_query(self):
+        from User.auth_cache import get_cached_user
+
+        profile_id = self.user.profile.pk
+        user = get_cached_user(self.user.pk)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual((user.first_name, user.country_origin, user.identity_number), ('', 'US', self.user.identity_number))
+            self.assertEqual(user.profile.pk, profile_id)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(user.profile.skills, '')
+            self.assertIsNone(user.profile.bio)
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+    def test_role_change_and_deactivation_invalidate(self):
+        self._auth_queries()
+        self.user.roles.remove(self.freelancer_role)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.roles.add(self.freelancer_role)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+        response = self.client.post(reverse('user_api:account-deactivate'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class LoginResponseTests(APITestCase):
+    """
+    Login looks the user up once (email or username) and returns a compact payload.
+    """
+
+    def setUp(self):
+        client_role, _ = Role.objects.get_or_create(name='CLIENT')
+        self.user = User.objects.create_user(
+            username='jane', email='jane@example.com', password='password123',
+            country_origin='US', identity_number='jane-id'
+        )
+        self.user.roles.add(client_role)
+        self.url = reverse('user_api:login')
+
+    def test_login_by_username_or_email(self):
+        for identifier in ('jane', 'jane@example.com'):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.post(self.url, {'email': identifier, 'password': 'password123'}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data['user']['id'], self.user.pk)
+            self.assertEqual(response.data['roles'], ['CLIENT'])
+            self.assertNotIn('profile', response.data['user'])
+            self.assertEqual(len(ctx.captured_queries), 2)  # User, roles
+
+    def test_email_match_wins_over_username(self):
+        User.objects.create_user(
+            username='jane@example.com', email='other@example.com', password='other-password',
+            country_origin='US', identity_number='other-id'
+        )
+        response = self.client.post(self.url, {'email': 'jane@example.com', 'password': 'password123'}, format='json')
+        self.assertEqual(response.data['user']['id'], self.user.pk)
+
+    def test_wrong_password(self):
+        response = self.client.post(self.url, {'email': 'jane', 'password': 'wrong'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -2,7 +2,7 @@ from django.urls import path, include
 
 app_name = 'Project'
 from rest_framework.routers import DefaultRouter
-from .views import ProjectViewSet, CategoryViewSet, MilestoneViewSet, RecordProjectView
+from .views import ProjectViewSet, CategoryViewSet, MilestoneViewSet, RecordProjectView, ProjectImpressionsView
 from Proposal.views import ProposalListCreateView, ProposalDetailView
 from Review.views import ReviewCreateView
 
@@ -31,6 +31,7 @@ urlpatterns = [
     
     # Analytics routes
     path('<int:pk>/view/', RecordProjectView.as_view(), name='record-project-view'),
+    path('impressions/', ProjectImpressionsView.as_view(), name='project-impressions'),
 
     # Project routes (must come last)
     path('', include(project_router.urls)),
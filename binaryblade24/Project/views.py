@@ -11,24 +11,26 @@ Core Functionality:
 - Role-based project filtering (my projects vs. my jobs)
 
 API Endpoints:
-- GET    /api/projects/                    - List all OPEN projects (find work)
+- GET    /api/projects/                    - List all OPEN projects (find work, cursor-paginated)
 - POST   /api/projects/                    - Create new project (clients only)
 - GET    /api/projects/{id}/               - Retrieve project details
 - PUT    /api/projects/{id}/               - Update project (owner only)
 - DELETE /api/projects/{id}/               - Delete project (owner only)
 - GET    /api/projects/my_projects/        - Client's created projects
 - GET    /api/projects/my_jobs/            - Freelancer's active assignments
+- GET    /api/projects/impressions/        - Impression time series for the user's projects
 
 Author: BinaryBlade24 Team
 Last Modified: 2025-11-27
 """
 
-from rest_framework import viewsets, mixins, status, filters
+from rest_framework import viewsets, mixins, status
 from rest_framework.views import APIView
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated, AllowAny
 
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.db import transaction
 
@@ -36,11 +38,59 @@ from .models import Project, Category, Milestone
 from Proposal.models import Proposal
 from .Serializers import ProjectSerializer, MilestoneSerializer
 from .category_serializers import CategorySerializer
+from .category_tree import category_tree_version, get_category_tree
 from Proposal.serializers import ProposalSerializer
 from .Permissions import IsClient, IsFreelancer, IsProjectOwner, IsClientOrFreelancer
+from utils.cache import cache_response, is_shared_cache, namespace_versions
+from utils.conditional import conditional_response, make_etag, request_variant
+from utils.pagination import KeysetPagination
+from search.filters import FullTextSearchFilter
+from search.models import SearchDocument
 # from User.models import Profile # Unused and potential circular dependency
 
 
+# Data that appears in public project payloads ('views': rolled-up view counts)
+PROJECT_CACHE_NAMESPACES = ('projects', 'reviews', 'proposals', 'categories', 'views')
+
+
+def project_list_validators(view, request, *args, **kwargs):
+    """
+    ETag for a project list page from the cache namespace versions.
+
+    Every write to the data a page shows bumps one of them, so this costs no
+    query and runs before the response cache is consulted. The versions only
+    identify data when every process shares them: with a per-process cache
+    (no REDIS_URL) a worker that never saw a write would keep answering 304,
+    so there is no ETag.
+    """
+    if not is_shared_cache():
+        return None
+    etag = make_etag('projects', namespace_versions(PROJECT_CACHE_NAMESPACES), request_variant(request))
+    return etag, None
+
+
+def project_detail_validators(view, request, pk=None, **kwargs):
+    """ETag/Last-Modified for one project from its updated_at; none with a per-process cache."""
+    if not is_shared_cache():
+        return None
+    try:
+        updated_at = view.get_queryset().filter(pk=pk).order_by().values_list('updated_at', flat=True).first()
+    except (ValueError, TypeError):
+        return None
+    if updated_at is None:
+        return None
+    etag = make_etag(
+        'project', pk, updated_at,
+        namespace_versions(PROJECT_CACHE_NAMESPACES[1:]), request_variant(request),
+    )
+    return etag, updated_at
+
+
+def category_validators(view, request, pk=None, **kwargs):
+    """Categories change only with the category tree version."""
+    return make_etag('categories', pk, category_tree_version(), request_variant(request)), None
+
+
 class ProjectViewSet(viewsets.ModelViewSet):
     """
     Complete CRUD operations for projects with role-based access control.
@@ -62,8 +112,9 @@ class ProjectViewSet(viewsets.ModelViewSet):
     """
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
-    filter_backends = [filters.SearchFilter]
-    search_fields = ['title', 'description', 'category__name']
+    pagination_class = KeysetPagination
+    filter_backends = [FullTextSearchFilter]
+    search_kind = SearchDocument.Kind.PROJECT
     
     def get_permissions(self):
         """
@@ -104,12 +155,26 @@ class ProjectViewSet(viewsets.ModelViewSet):
             
         return [permission() for permission in self.permission_classes]
 
+    # Anonymous list/detail responses are cached; see utils/cache.py
+    @conditional_response(project_list_validators)
+    @cache_response('project_list', depends_on=PROJECT_CACHE_NAMESPACES)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional_response(project_detail_validators)
+    @cache_response('project_detail', depends_on=PROJECT_CACHE_NAMESPACES)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     def get_queryset(self):
         """
         Filter projects to show only OPEN opportunities with safe query param handling.
         """
         # Show only open projects (the "job board" for freelancers)
-        queryset = Project.objects.filter(status=Project.ProjectStatus.OPEN)
+        # Ratings, counts and proposal state are annotated so the list costs a fixed number of queries
+        queryset = Project.objects.filter(status=Project.ProjectStatus.OPEN).with_listing_stats(
+            self.request.user, fields=ProjectSerializer.requested_fields(self.request)
+        )
 
         # Filter by project type (GIG or JOB) if specified
         project_type = self.request.query_params.get('project_type')
@@ -129,10 +194,8 @@ class ProjectViewSet(viewsets.ModelViewSet):
         if category_id:
             try:
                 cat_id = int(category_id)
-                from django.db.models import Q
                 queryset = queryset.filter(
-                    Q(category_id=cat_id) | 
-                    Q(category__parent_id=cat_id)
+                    category_id__in=get_category_tree().descendant_ids(cat_id)
                 )
             except (ValueError, TypeError):
                 # Safely ignore invalid non-integer categories (e.g., 'undefined')
@@ -182,7 +245,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
         user = request.user
         
         # Get all projects where this user is the client
-        projects = Project.objects.filter(client=user)
+        projects = Project.objects.filter(client=user).with_listing_stats(user)
         
         # Serialize with full context (may expose additional fields)
         serializer = self.get_serializer(projects, many=True)
@@ -249,7 +312,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
         projects = Project.objects.filter(
             proposals__freelancer=user,
             proposals__status='ACCEPTED'
-        )
+        ).with_listing_stats(user)
         
         # Serialize with request context (enables conditional field exposure)
         serializer = self.get_serializer(projects, many=True)
@@ -343,7 +406,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
             # Fallback to role-based logic (Legacy/Safety)
             # Freelancers create GIGs (Fiverr-style), Clients create JOBS (Upwork-style)
             try:
-                user_roles = [role.name.lower() for role in user.roles.all()]
+                user_roles = [name.lower() for name in user.role_names()]
                 if 'freelancer' in user_roles:
                     project_type = Project.ProjectType.GIG
                 else:
@@ -391,6 +454,21 @@ class CategoryViewSet(viewsets.ModelViewSet):
     serializer_class = CategorySerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
+    @conditional_response(category_validators)
+    def list(self, request, *args, **kwargs):
+        # Served from the in-process category tree; no database access
+        return Response(get_category_tree().payload)
+
+    @conditional_response(category_validators)
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            category = get_category_tree().roots_by_id.get(int(kwargs['pk']))
+        except (TypeError, ValueError):
+            category = None
+        if category is None:
+            raise Http404
+        return Response(category)
+
 
 class MilestoneViewSet(viewsets.ModelViewSet):
     """
@@ -424,12 +502,13 @@ class RecordProjectView(APIView):
     """
     Endpoint to record a view (impression) for a project.
     POST /api/projects/{id}/view/
+
+    Returns 201 when the view is recorded (or queued in buffered mode) and
+    200 when it is a repeat view inside the de-duplication window.
     """
     permission_classes = [AllowAny] # Public can view projects
 
     def post(self, request, pk=None):
-        project = get_object_or_404(Project, pk=pk)
-        
         # Get IP address
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
         if x_forwarded_for:
@@ -440,13 +519,99 @@ class RecordProjectView(APIView):
         # Get user if authenticated
         user = request.user if request.user.is_authenticated else None
         
-        # Create view record
-        # Optional: Add logic to prevent duplicate views from same IP/User within X minutes
-        from .models import ProjectView
-        ProjectView.objects.create(
-            project=project,
-            ip_address=ip,
-            user=user
-        )
-        
+        # Repeat views from the same IP/User within PROJECT_VIEW_BUFFER['DEDUP_WINDOW'] are dropped.
+        # In buffered mode the row is spooled and bulk-inserted later (see Project/impressions.py).
+        from .impressions import record_impression
+        try:
+            outcome = record_impression(pk, ip, user)
+        except Project.DoesNotExist:
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        if outcome == 'duplicate':
+            return Response({"status": "duplicate view ignored"}, status=status.HTTP_200_OK)
         return Response({"status": "view recorded"}, status=status.HTTP_201_CREATED)
+
+
+class ProjectImpressionsView(APIView):
+    """
+    Impression time series for the authenticated user's projects (chart data).
+
+    GET /api/projects/impressions/?granularity=day&start=2025-01-01&end=2025-01-31&project=12
+
+    Query Parameters:
+        granularity: 'day' (default) or 'hour'
+        start, end: ISO dates/datetimes, end inclusive for dates
+            (defaults: last 30 days for 'day', last 48 hours for 'hour')
+        project: Optional project id to chart a single project
+
+    Response Format:
+        {
+            "granularity": "DAY",
+            "start": "2025-01-01T00:00:00Z",
+            "end": "2025-02-01T00:00:00Z",
+            "total": 42,
+            "series": [{"bucket": "2025-01-01T00:00:00Z", "views": 3}, ...]
+        }
+
+    Served from ProjectViewRollup, so cost depends on the range, not on how
+    many raw views exist.
+    """
+    permission_classes = [IsAuthenticated]
+
+    MAX_BUCKETS = 24 * 31
+
+    def get(self, request):
+        from datetime import datetime, time, timedelta
+        from django.utils import timezone
+        from django.utils.dateparse import parse_date, parse_datetime
+        from .analytics import impression_series
+        from .models import ProjectViewRollup
+
+        granularity = request.query_params.get('granularity', 'day').upper()
+        if granularity not in ProjectViewRollup.Granularity.values:
+            return Response({"detail": "granularity must be 'hour' or 'day'."}, status=status.HTTP_400_BAD_REQUEST)
+
+        def parse_bound(value, is_end):
+            day = parse_date(value)
+            if day is not None:
+                # Date-only bounds are inclusive: end=2025-01-31 covers that whole day
+                moment = datetime.combine(day + timedelta(days=1) if is_end else day, time.min)
+            else:
+                moment = parse_datetime(value)
+                if moment is None:
+                    raise ValueError(value)
+            return moment if timezone.is_aware(moment) else timezone.make_aware(moment)
+
+        now = timezone.now()
+        default_span = timedelta(days=30) if granularity == ProjectViewRollup.Granularity.DAY else timedelta(hours=48)
+        try:
+            end = parse_bound(request.query_params['end'], True) if 'end' in request.query_params else now
+            start = parse_bound(request.query_params['start'], False) if 'start' in request.query_params else end - default_span
+        except ValueError:
+            return Response({"detail": "start/end must be ISO 8601 dates or datetimes."}, status=status.HTTP_400_BAD_REQUEST)
+
+        step = timedelta(days=1) if granularity == ProjectViewRollup.Granularity.DAY else timedelta(hours=1)
+        if start >= end or (end - start) / step > self.MAX_BUCKETS:
+            return Response(
+                {"detail": f"Range must be positive and span at most {self.MAX_BUCKETS} buckets."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        projects = Project.objects.all() if request.user.is_staff else Project.objects.filter(client=request.user)
+        project_id = request.query_params.get('project')
+        if project_id:
+            try:
+                projects = projects.filter(pk=int(project_id))
+            except (ValueError, TypeError):
+                return Response({"detail": "project must be an integer id."}, status=status.HTTP_400_BAD_REQUEST)
+            if not projects.exists():
+                return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        series = impression_series(projects, granularity, start, end)
+        return Response({
+            "granularity": granularity,
+            "start": series[0]['bucket'] if series else start,
+            "end": end,
+            "total": sum(point['views'] for point in series),
+            "series": series,
+        })
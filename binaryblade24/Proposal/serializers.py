@@ -18,6 +18,7 @@ from rest_framework import serializers
 from .models import Proposal
 from Project.models import Project 
 from django.contrib.auth import get_user_model
+from utils.serializers import SparseFieldsetMixin
 
 User = get_user_model()
 
@@ -59,7 +60,7 @@ class ProjectNestedSerializer(serializers.ModelSerializer):
         fields = ['id', 'title', 'budget', 'description']
 
 
-class ProposalSerializer(serializers.ModelSerializer):
+class ProposalSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Main serializer for Proposal model with platform-enforced communication.
     
@@ -71,6 +72,9 @@ class ProposalSerializer(serializers.ModelSerializer):
     
     Fields:
     - project: returns full nested object {id, title, budget, description}
+
+    Supports ?fields= and ?expand= (see utils/serializers.py);
+    freelancer_details and project_details are expandable.
     """
     # Computed fields that require custom logic
     freelancer_details = serializers.SerializerMethodField(read_only=True)
@@ -93,6 +97,7 @@ class ProposalSerializer(serializers.ModelSerializer):
             'project_details',
             'thumbnail',
         ]
+        expandable_fields = ['freelancer_details', 'project_details']
         
         # Fields that should never be modified by client requests
         read_only_fields = [
@@ -36,6 +36,7 @@ from Project.models import Project
 from Proposal.serializers import ProposalSerializer, ProposalStatusUpdateSerializer
 from Project.Permissions import IsClient, IsFreelancer
 from .Permissions import IsProposalProjectOwner
+from utils.pagination import KeysetPagination
 # from User.models import Profile, User # Moved Profile (unused) and User (local import)
 
 
@@ -441,6 +442,7 @@ class UserProposalsView(generics.ListAPIView):
     
     serializer_class = ProposalSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         """
@@ -481,6 +483,7 @@ class PublicProposalsView(generics.ListAPIView):
     
     serializer_class = ProposalSerializer
     permission_classes = []  # Public access
+    pagination_class = KeysetPagination
     
     def get_queryset(self):
         """
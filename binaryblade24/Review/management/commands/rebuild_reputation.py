@@ -0,0 +1,20 @@
+"""
+Management command to rebuild ReputationStats from the reviews.
+
+The stats are maintained by Review signals; run this after bulk changes that
+bypass them (QuerySet.update, bulk_create, raw SQL) or to repair drift.
+
+Usage: python manage.py rebuild_reputation
+"""
+
+from django.core.management.base import BaseCommand
+
+from Review.reputation import rebuild_reputation
+
+
+class Command(BaseCommand):
+    help = 'Recomputes review counts, rating sums and histograms per user'
+
+    def handle(self, *args, **options):
+        users = rebuild_reputation()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt reputation stats for {users} users'))
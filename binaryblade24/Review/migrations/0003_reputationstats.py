@@ -0,0 +1,36 @@
+# Generated by Django 5.0.4 on 2026-10-17 04:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    from Review.reputation import rebuild_reputation
+    rebuild_reputation(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Review', '0002_alter_review_created_at_alter_review_rating_and_more'),
+        ('User', '0026_user_card_manager'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReputationStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='reputation', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('review_count', models.IntegerField(default=0)),
+                ('rating_sum', models.IntegerField(default=0)),
+                ('rating_1', models.IntegerField(default=0)),
+                ('rating_2', models.IntegerField(default=0)),
+                ('rating_3', models.IntegerField(default=0)),
+                ('rating_4', models.IntegerField(default=0)),
+                ('rating_5', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -18,3 +18,40 @@ class Review(models.Model):
 
     def __str__(self):
         return f'Review for {self.project} by {self.reviewer.username}'
+
+
+class ReputationStats(models.Model):
+    """
+    Materialized review aggregates for one user (as reviewee).
+
+    Kept current with F() updates by Review signals (Review/reputation.py), so
+    reading a user's rating is a primary-key lookup (or a join) instead of an
+    AVG over their reviews. `rebuild_reputation` recomputes every row.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name='reputation'
+    )
+    review_count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+    # Histogram of 1-5 star ratings
+    rating_1 = models.IntegerField(default=0)
+    rating_2 = models.IntegerField(default=0)
+    rating_3 = models.IntegerField(default=0)
+    rating_4 = models.IntegerField(default=0)
+    rating_5 = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def average(self):
+        """Average rating rounded to one decimal, or None without reviews."""
+        if self.review_count <= 0:
+            return None
+        return round(self.rating_sum / self.review_count, 1)
+
+    @property
+    def histogram(self):
+        """{1: count, ..., 5: count}"""
+        return {stars: getattr(self, f'rating_{stars}') for stars in range(1, 6)}
+
+    def __str__(self):
+        return f'Reputation of user {self.user_id}: {self.average} ({self.review_count})'
@@ -0,0 +1,100 @@
+"""
+Reputation Stats Maintenance
+
+ReputationStats holds each reviewee's review count, rating sum and 1-5
+histogram. Review signals (Review/signals.py) apply every change as a single
+UPDATE with F() expressions, so concurrent reviews never overwrite each
+other's counts:
+
+    created  -> +1 review, +rating, +1 in the rating's bucket
+    deleted  -> the reverse
+    changed  -> remove the old (reviewee, rating), add the new one
+
+QuerySet.update()/bulk_create()/raw SQL bypass the signals; run
+`python manage.py rebuild_reputation` after those (or to repair drift).
+"""
+
+from django.apps import apps as global_apps
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Now
+
+STARS = range(1, 6)
+
+
+def _bucket(rating):
+    return f'rating_{rating}' if rating in STARS else None
+
+
+def apply_review(user_id, rating, delta):
+    """
+    Add (`delta`=1) or remove (`delta`=-1) one review of `rating` for `user_id`.
+    """
+    from .models import ReputationStats
+
+    changes = {
+        'review_count': F('review_count') + delta,
+        'rating_sum': F('rating_sum') + delta * rating,
+        'updated_at': Now(),  # update() skips auto_now
+    }
+    bucket = _bucket(rating)
+    if bucket:
+        changes[bucket] = F(bucket) + delta
+
+    if ReputationStats.objects.filter(user_id=user_id).update(**changes):
+        return
+    if delta < 0:
+        return  # Nothing recorded to remove; rebuild_reputation repairs this
+    try:
+        with transaction.atomic():
+            initial = {'review_count': 1, 'rating_sum': rating}
+            if bucket:
+                initial[bucket] = 1
+            ReputationStats.objects.create(user_id=user_id, **initial)
+    except IntegrityError:
+        # Created concurrently since the UPDATE above
+        ReputationStats.objects.filter(user_id=user_id).update(**changes)
+
+
+def rebuild_reputation(apps=None):
+    """
+    Recompute every ReputationStats row from the reviews.
+
+    Args:
+        apps: Model registry (the migration passes its historical apps)
+
+    Returns:
+        int: Number of users with reviews
+    """
+    apps = apps or global_apps
+    Review = apps.get_model('Review', 'Review')
+    ReputationStats = apps.get_model('Review', 'ReputationStats')
+
+    rows = Review.objects.order_by().values('reviewee_id').annotate(
+        review_count=Count('pk'),
+        rating_sum=Sum('rating'),
+        **{f'rating_{stars}': Count('pk', filter=Q(rating=stars)) for stars in STARS},
+    )
+    with transaction.atomic():
+        ReputationStats.objects.all().delete()
+        ReputationStats.objects.bulk_create(
+            [ReputationStats(user_id=row.pop('reviewee_id'), **row) for row in rows],
+            batch_size=1000,
+        )
+    return ReputationStats.objects.count()
+
+
+def user_rating(user):
+    """
+    Average rating received by `user` (one decimal), or None without reviews.
+
+    Reads ReputationStats: free when the caller used select_related('reputation'),
+    otherwise one primary-key lookup.
+    """
+    from django.core.exceptions import ObjectDoesNotExist
+
+    try:
+        stats = user.reputation
+    except ObjectDoesNotExist:
+        return None
+    return stats.average if stats is not None else None
@@ -0,0 +1,33 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Review
+from .reputation import apply_review
+
+
+@receiver(pre_save, sender=Review)
+def remember_previous_rating(sender, instance, raw=False, **kwargs):
+    """Keep the stored (reviewee, rating) so post_save can move it."""
+    instance._previous_rating = None
+    if instance.pk and not raw:
+        instance._previous_rating = (
+            Review.objects.filter(pk=instance.pk).values_list('reviewee_id', 'rating').first()
+        )
+
+
+@receiver(post_save, sender=Review)
+def update_reputation_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_previous_rating', None)
+    current = (instance.reviewee_id, instance.rating)
+    if previous == current:
+        return
+    if previous is not None:
+        apply_review(*previous, delta=-1)
+    apply_review(*current, delta=1)
+
+
+@receiver(post_delete, sender=Review)
+def update_reputation_on_delete(sender, instance, **kwargs):
+    apply_review(instance.reviewee_id, instance.rating, delta=-1)
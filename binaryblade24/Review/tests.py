@@ -1,3 +1,124 @@
-from django.test import TestCase
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from Project.models import Category, Project
+from Review.models import ReputationStats, Review
+from Review.reputation import rebuild_reputation, user_rating
+
+User = get_user_model()
+
+
+class ReputationStatsTests(APITestCase):
+    """
+    ReputationStats must track every review create/change/delete and back the rating reads.
+    """
+
+    def setUp(self):
+        self.client_user = User.objects.create_user(
+            username='client', email='client@example.com', password='password123',
+            country_origin='US', identity_number='client-id'
+        )
+        self.freelancer = User.objects.create_user(
+            username='freelancer', email='freelancer@example.com', password='password123',
+            country_origin='US', identity_number='freelancer-id'
+        )
+        self.other = User.objects.create_user(
+            username='other', email='other@example.com', password='password123',
+            country_origin='US', identity_number='other-id'
+        )
+        category = Category.objects.create(name='Design', slug='design')
+        self.project = Project.objects.create(
+            title='Logo', description='Description', budget=100, price=100,
+            category=category, client=self.client_user,
+        )
+
+    def _review(self, rating, reviewee=None):
+        return Review.objects.create(
+            project=self.project, reviewer=self.client_user,
+            reviewee=reviewee or self.freelancer, rating=rating, comment='Review',
+        )
+
+    def _stats(self, user=None):
+        return ReputationStats.objects.get(user=user or self.freelancer)
+
+    def test_create_change_and_delete_update_stats(self):
+        first = self._review(5)
+        self._review(4)
+        stats = self._stats()
+        self.assertEqual((stats.review_count, stats.rating_sum), (2, 9))
+        self.assertEqual(stats.histogram, {1: 0, 2: 0, 3: 0, 4: 1, 5: 1})
+        self.assertEqual(stats.average, 4.5)
+
+        first.rating = 2
+        first.save()
+        stats = self._stats()
+        self.assertEqual((stats.review_count, stats.rating_sum), (2, 6))
+        self.assertEqual(stats.histogram, {1: 0, 2: 1, 3: 0, 4: 1, 5: 0})
+
+        first.reviewee = self.other
+        first.save()
+        self.assertEqual(self._stats().review_count, 1)
+        self.assertEqual(self._stats(self.other).histogram[2], 1)
+
+        first.delete()
+        stats = self._stats(self.other)
+        self.assertEqual((stats.review_count, stats.rating_sum, stats.average), (0, 0, None))
+
+    def test_rebuild_repairs_drift(self):
+        self._review(3)
+        self._review(5)
+        ReputationStats.objects.filter(user=self.freelancer).update(review_count=40, rating_5=0)
+        # bulk_create bypasses the signals
+        Review.objects.bulk_create([Review(
+            project=self.project, reviewer=self.client_user, reviewee=self.other, rating=1, comment='Bad',
+        )])
+
+        out = StringIO()
+        call_command('rebuild_reputation', stdout=out)
+        self.assertIn('2', out.getvalue())
+        self.assertEqual(self._stats().histogram, {1: 0, 2: 0, 3: 1, 4: 0, 5: 1})
+        self.assertEqual(self._stats().review_count, 2)
+        self.assertEqual(self._stats(self.other).average, 1.0)
+        self.assertEqual(rebuild_reputation(), 2)
+
+    def test_rating_read_is_one_lookup(self):
+        self._review(4)
+        user = User.objects.get(pk=self.freelancer.pk)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(user_rating(user), 4.0)
+        self.assertEqual(len(queries), 1)
+
+        user = User.objects.select_related('reputation').get(pk=self.freelancer.pk)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(user_rating(user), 4.0)
+            self.assertEqual(user_rating(self.other), None)
+        self.assertEqual(len(queries), 1)  # Only `other`, which has no row
+
+    def test_breakdown_endpoint(self):
+        self._review(5)
+        self._review(5)
+        self._review(1)
+        self.client.force_authenticate(user=self.client_user)
+
+        response = self.client.get(reverse('review_api:user-ratings-breakdown', kwargs={'pk': self.freelancer.pk}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {
+            'user': self.freelancer.pk,
+            'review_count': 3,
+            'average': 3.7,
+            'histogram': {1: 1, 2: 0, 3: 0, 4: 0, 5: 2},
+        })
+
+        response = self.client.get(reverse('review_api:user-ratings-breakdown', kwargs={'pk': self.other.pk}))
+        self.assertEqual(response.data['review_count'], 0)
+        self.assertIsNone(response.data['average'])
+
+        response = self.client.get(reverse('review_api:user-ratings-breakdown', kwargs={'pk': 999999}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import ReviewCreateView, UserReviewsView
+from .views import ReviewCreateView, UserRatingsBreakdownView, UserReviewsView
 
 app_name = 'review_api'
 
@@ -9,4 +9,7 @@ urlpatterns = [
     
     # List all reviews for a specific user
     path('users/<int:pk>/', UserReviewsView.as_view(), name='user-reviews'),
+
+    # Review count, average and 1-5 star histogram for a user
+    path('users/<int:pk>/breakdown/', UserRatingsBreakdownView.as_view(), name='user-ratings-breakdown'),
 ]
@@ -1,6 +1,8 @@
 from rest_framework import generics
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
-from .models import Review
+from .models import ReputationStats, Review
 from .Serializer import ReviewSerializer
 from django.shortcuts import get_object_or_404
 from Project.models import Project
@@ -27,4 +29,22 @@ class UserReviewsView(generics.ListAPIView):
 
     def get_queryset(self):
         user = get_object_or_404(User, pk=self.kwargs.get('pk'))
-        return Review.objects.filter(reviewee=user)
\ No newline at end of file
+        return Review.objects.filter(reviewee=user)
+
+class UserRatingsBreakdownView(APIView):
+    """
+    Rating summary for a specific user: review count, average and 1-5 star histogram.
+
+    Served from the user's ReputationStats row (one primary-key lookup).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        user = get_object_or_404(User, pk=pk)
+        stats = ReputationStats.objects.filter(user=user).first() or ReputationStats(user=user)
+        return Response({
+            'user': user.pk,
+            'review_count': stats.review_count,
+            'average': stats.average,
+            'histogram': stats.histogram,
+        })
@@ -11,7 +11,8 @@ except Exception:
     # Fallback to get_user_model at runtime if direct import isn't possible
     User = get_user_model()
 from django.contrib.auth.hashers import make_password
-from django.db.models import Avg
+from utils.memo import MemoizedSerializerMixin
+from utils.serializers import SparseFieldsetMixin
 
 # from Project.models import Project # Moved inside methods to avoid circular dependency
 # from Review.models import Review # Moved inside methods to avoid circular dependency
@@ -28,10 +29,13 @@ class CaseInsensitiveSlugRelatedField(serializers.SlugRelatedField):
             self.fail('invalid')
 
 # Ensure User is the concrete custom User model (imported above)
-class FreelancerDetailSerializer(serializers.ModelSerializer):
+class FreelancerDetailSerializer(MemoizedSerializerMixin, serializers.ModelSerializer):
     """
     Minimal serializer for User details, used for nesting.
+
+    Rendered once per user per request (utils/memo.py).
     """
+    memo_label = 'freelancer_detail'
     avg_rating = serializers.SerializerMethodField(read_only=True)
     
     class Meta:
@@ -39,14 +43,12 @@ class FreelancerDetailSerializer(serializers.ModelSerializer):
         fields = ['id', 'username', 'first_name', 'last_name', 'avg_rating']
 
     def get_avg_rating(self, obj):
-        """Get average rating from user profile."""
-        from Review.models import Review
+        """Get average rating from the user's ReputationStats (joined by project listings)."""
+        from Review.reputation import user_rating
         try:
-            # Aggregate from Review model
-            agg = Review.objects.filter(reviewee=obj).aggregate(avg=Avg('rating'))
-            avg = agg.get('avg')
+            avg = user_rating(obj)
             if avg is not None:
-                return round(avg, 1)
+                return avg
             
             # Fallback to profile rating if review aggregation yields nothing
             # Note: Accessing obj.profile might fail if there's a schema mismatch (e.g. missing wallet_balance)
@@ -56,14 +58,44 @@ class FreelancerDetailSerializer(serializers.ModelSerializer):
             # Exception caught here includes OperationalError (missing columns)
             return 0.0
 
-class UserContactSerializer(serializers.ModelSerializer):
+class UserContactSerializer(MemoizedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer exposing contact details, used when an agreement is reached.
     """
+    memo_label = 'user_contact'
+
     class Meta:
         model = User
         fields = ['id', 'username', 'first_name', 'last_name', 'email', 'phone_number']
 
+def _load_client_projects(user_ids):
+    """
+    ProfileSerializer project fields for `user_ids`, from one query.
+
+    Returns:
+        dict: {user_id: {'completed': [...], 'active': [...], 'posted': int}}
+    """
+    from Project.models import Project
+
+    storage = Project._meta.get_field('thumbnail').storage
+    grouped = {user_id: {'completed': [], 'active': [], 'posted': 0} for user_id in user_ids}
+    rows = Project.objects.filter(client_id__in=user_ids).order_by('pk').values_list(
+        'client_id', 'id', 'title', 'thumbnail', 'status',
+    )
+    for client_id, project_id, title, thumbnail, status in rows:
+        projects = grouped[client_id]
+        projects['posted'] += 1
+        if status == Project.ProjectStatus.COMPLETED:
+            projects['completed'].append({
+                'id': project_id,
+                'title': title,
+                'thumbnail': storage.url(thumbnail) if thumbnail else None,
+                'status': status,
+            })
+        elif status == Project.ProjectStatus.IN_PROGRESS:
+            projects['active'].append({'id': project_id, 'title': title, 'status': status})
+    return grouped
+
 class ProfileSerializer(serializers.ModelSerializer):
     # Computed/read-only fields
     completed_projects = serializers.SerializerMethodField(read_only=True)
@@ -82,48 +114,104 @@ class ProfileSerializer(serializers.ModelSerializer):
 
         read_only_fields = ('completed_projects', 'portfolio', 'active_projects', 'projects_posted', 'avg_rating')
 
+    def _client_projects(self, obj):
+        """
+        The profile owner's projects, grouped for the four project fields.
+
+        Loaded with one query for every user in the response: when the root
+        serializer is a list of users or profiles, the first profile fetches
+        the projects of all of them and caches them in the serializer context.
+        """
+        cache = self.context.setdefault('_client_projects', {})
+        if obj.user_id not in cache:
+            user_ids = {obj.user_id}
+            root = self.root
+            if isinstance(root, serializers.ListSerializer) and root.instance is not None:
+                for item in root.instance:
+                    if isinstance(item, User):
+                        user_ids.add(item.pk)
+                    elif isinstance(item, Profile):
+                        user_ids.add(item.user_id)
+            cache.update(_load_client_projects(user_ids - cache.keys()))
+        return cache[obj.user_id]
+
     def get_completed_projects(self, obj):
         """Return a list of minimal completed project info for this user's created projects."""
-        from Project.models import Project
-        projects = Project.objects.filter(client=obj.user, status=Project.ProjectStatus.COMPLETED)
-        result = []
-        for p in projects:
-            result.append({
-                'id': p.id,
-                'title': p.title,
-                'thumbnail': p.thumbnail.url if p.thumbnail else None,
-                'status': p.status,
-            })
-        return result
+        return self._client_projects(obj)['completed']
 
     def get_portfolio(self, obj):
         """Return a list of thumbnail URLs from completed projects (portfolio)."""
-        from Project.models import Project
-        projects = Project.objects.filter(client=obj.user, status=Project.ProjectStatus.COMPLETED).exclude(thumbnail='')
-        thumbs = [p.thumbnail.url for p in projects if p.thumbnail]
-        return thumbs
+        return [p['thumbnail'] for p in self._client_projects(obj)['completed'] if p['thumbnail']]
 
     def get_active_projects(self, obj):
-        from Project.models import Project
-        projects = Project.objects.filter(client=obj.user, status=Project.ProjectStatus.IN_PROGRESS)
-        return [{'id': p.id, 'title': p.title, 'status': p.status} for p in projects]
+        return self._client_projects(obj)['active']
 
     def get_projects_posted(self, obj):
-        from Project.models import Project
-        return Project.objects.filter(client=obj.user).count()
+        return self._client_projects(obj)['posted']
 
     def get_avg_rating(self, obj):
-        from Review.models import Review
-        # Prefer calculating from Review model; fall back to stored profile.rating
-        agg = Review.objects.filter(reviewee=obj.user).aggregate(avg=Avg('rating'))
-        avg = agg.get('avg')
+        from Review.reputation import user_rating
+        # Prefer the materialized review average; fall back to stored profile.rating
+        avg = user_rating(obj.user)
         if avg is None:
             return obj.rating
-        # round to one decimal for presentation
-        return round(avg, 1)
+        return avg
+
+
+class FreelancerCardProfileSerializer(serializers.ModelSerializer):
+    """Profile part of FreelancerCardSerializer; the numbers come from the joined ReputationStats and annotations."""
+    avg_rating = serializers.SerializerMethodField()
+    review_count = serializers.SerializerMethodField()
+    completed_count = serializers.IntegerField(source='user.completed_total', read_only=True)
+
+    class Meta:
+        model = Profile
+        fields = ('bio', 'skills', 'hourly_rate', 'level', 'availability', 'avg_rating', 'review_count', 'completed_count')
+        read_only_fields = fields
+
+    def get_avg_rating(self, obj):
+        from Review.reputation import user_rating
+        avg = user_rating(obj.user)
+        if avg is None:
+            return obj.rating
+        return avg
+
+    def get_review_count(self, obj):
+        stats = getattr(obj.user, 'reputation', None)
+        return stats.review_count if stats is not None else 0
+
+
+class FreelancerCardSerializer(serializers.ModelSerializer):
+    """
+    What a freelancer search result shows, without contact or identity data.
+
+    Expects a `User.objects.with_card_stats()` queryset; it reads only the
+    joined profile, the prefetched roles and the annotations, so a page of
+    results costs a fixed number of queries.
+    """
+    roles = serializers.SlugRelatedField(many=True, read_only=True, slug_field='name')
+    profile = FreelancerCardProfileSerializer(read_only=True)
+
+    class Meta:
+        model = User
+        fields = ('id', 'username', 'first_name', 'last_name', 'profile_picture', 'country_origin', 'roles', 'profile')
+
+
+class LoginUserSerializer(serializers.ModelSerializer):
+    """
+    Identity returned by the login views; roles travel next to it.
+
+    Only plain columns, so it costs no queries. The full user and profile
+    come from `/api/auth/users/{id}/` and `/api/auth/users/{id}/profile/`.
+    """
+    class Meta:
+        model = User
+        fields = ('id', 'username', 'email', 'first_name', 'last_name', 'profile_picture', 'country_origin')
+        read_only_fields = fields
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """Supports ?fields= and ?expand= (see utils/serializers.py); profile is expandable."""
     password = serializers.CharField(write_only=True, required=True, min_length=8)
     profile = ProfileSerializer(required=False)
     roles = CaseInsensitiveSlugRelatedField(
@@ -137,6 +225,7 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
         fields = ('id', 'username', 'first_name', 'last_name', 'email', 'password', 'profile', 'identity_number', 'profile_picture', 'roles', 'date_joined', 'last_login', 'country_origin', 'phone_number', 'phone_country_code')
         read_only_fields = ('id', 'date_joined', 'last_login')
+        expandable_fields = ('profile',)
 
     def create(self, validated_data):
         profile_data = validated_data.pop('profile', None)
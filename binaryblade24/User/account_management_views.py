@@ -17,6 +17,8 @@ class DeactivateAccountView(APIView):
         user = request.user
         user.deactivated_at = timezone.now()
         user.is_active = False
+        # Also drops the cached auth snapshot (User/signals.py), so the
+        # user's tokens stop authenticating immediately
         user.save()
         
         return Response({
@@ -0,0 +1,101 @@
+"""
+Short-lived cache of the user behind a JWT.
+
+Every authenticated request used to load the user row (and, in permission
+checks, its roles) before the view ran. RoleClaimsJWTAuthentication reads a
+compact snapshot from the configured cache instead:
+
+    {"id": 7, "username": "jane", "email": "jane@example.com",
+     "is_active": True, "is_staff": False, "is_superuser": False,
+     "role_version": 3, "roles": ["CLIENT"], "profile_id": 7}
+
+and rebuilds a User from it with the remaining fields deferred. Reading one
+of those loads the rest of the row in a single query (SnapshotRowMixin),
+so views that need the full user pay one query, and views that only need
+the id, flags or roles pay none. `user.profile` is a Profile whose fields
+other than the id are deferred the same way.
+
+Snapshots live for AUTH_USER_CACHE_TIMEOUT seconds (0 disables the cache)
+and are dropped when the user or their profile is saved or deleted, or
+their roles change (User/signals.py). They are dropped again on commit, so
+a request racing a transaction cannot re-cache the old row for long.
+
+Dropping a snapshot only reaches other processes through a shared cache, so
+the cache is off by default unless the cache backend is shared (Redis);
+enabling it on per-process locmem lets other workers authenticate a
+deactivated user, with revoked role claims, until the snapshot expires.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router, transaction
+
+from utils.cache import is_shared_cache
+
+KEY = 'auth_user:{}'
+SNAPSHOT_FIELDS = ('id', 'username', 'email', 'is_active', 'is_staff', 'is_superuser', 'role_version')
+
+
+def _timeout():
+    return getattr(settings, 'AUTH_USER_CACHE_TIMEOUT', 60 if is_shared_cache() else 0)
+
+
+def _snapshot(user_id, claims):
+    from .models import User
+
+    row = User.objects.filter(pk=user_id).values(*SNAPSHOT_FIELDS, 'profile__id').first()
+    if row is None:
+        return None
+    row['profile_id'] = row.pop('profile__id')
+    if claims is not None and claims[1] == row['role_version']:
+        # The token's role claims are current (User/authentication.py)
+        row['roles'] = sorted(claims[0])
+    else:
+        row['roles'] = sorted(User.roles.through.objects.filter(user_id=user_id).values_list('role__name', flat=True))
+    return row
+
+
+def _build(snapshot):
+    from .models import Profile, User
+
+    db = router.db_for_read(User)
+    # from_db() takes the values in model field order
+    names = [field.attname for field in User._meta.concrete_fields if field.attname in SNAPSHOT_FIELDS]
+    user = User.from_db(db, names, [snapshot[name] for name in names])
+    user._auth_snapshot = True
+    user._role_names = frozenset(snapshot['roles'])
+    if snapshot['profile_id'] is not None:
+        profile = Profile.from_db(db, ('id', 'user_id'), (snapshot['profile_id'], user.pk))
+        profile._auth_snapshot = True
+        User.profile.related.set_cached_value(user, profile)
+        Profile.user.field.set_cached_value(profile, user)
+    return user
+
+
+def get_cached_user(user_id, claims=None):
+    """
+    User `user_id` rebuilt from its cached snapshot, loading it on a miss.
+
+    Args:
+        user_id (int): Primary key from the token
+        claims (tuple|None): The token's (role names, role_version), used
+            instead of a roles query on a miss when the version is current
+
+    Returns:
+        User|None: None when the user does not exist
+    """
+    timeout = _timeout()
+    snapshot = cache.get(KEY.format(user_id)) if timeout else None
+    if snapshot is None:
+        snapshot = _snapshot(user_id, claims)
+        if snapshot is None:
+            return None
+        if timeout:
+            cache.set(KEY.format(user_id), snapshot, timeout)
+    return _build(snapshot)
+
+
+def forget_user(*user_ids):
+    """Drop the cached snapshots of `user_ids`, now and when the transaction commits."""
+    keys = [KEY.format(user_id) for user_id in user_ids]
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,55 @@
+"""
+JWT authentication that answers role checks from the access token.
+
+Tokens issued by User/tokens.py carry the user's role names and the user's
+`role_version` at issue time:
+
+    {"user_id": 7, "role": "CLIENT", "roles": ["CLIENT", "FREELANCER"], "role_version": 3, ...}
+
+When the version still matches the user row, the roles are attached to the
+user so `user.role_names()` / `user.has_role()` (Project/Permissions.py)
+need no query. Any change to the user's roles bumps `role_version`
+(User/signals.py); older tokens, and tokens without the claims, keep working
+and use the roles stored with the user instead.
+
+The user itself comes from a short-lived cached snapshot (User/auth_cache.py),
+so with a warm cache authentication runs no queries at all.
+"""
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .auth_cache import get_cached_user
+
+ROLES_CLAIM = 'roles'
+ROLE_VERSION_CLAIM = 'role_version'
+
+
+class RoleClaimsJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN or api_settings.USER_ID_FIELD != 'id':
+            # Needs the password hash / another lookup field: not in the snapshot
+            user = super().get_user(validated_token)
+        else:
+            user = self._get_cached_user(validated_token)
+        roles = validated_token.get(ROLES_CLAIM)
+        if roles is not None and validated_token.get(ROLE_VERSION_CLAIM) == user.role_version:
+            user._role_names = frozenset(roles)
+        return user
+
+    def _get_cached_user(self, validated_token):
+        """JWTAuthentication.get_user(), reading the user from its cached snapshot."""
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        roles = validated_token.get(ROLES_CLAIM)
+        claims = (roles, validated_token.get(ROLE_VERSION_CLAIM)) if roles is not None else None
+        user = get_cached_user(user_id, claims)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
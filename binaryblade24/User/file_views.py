@@ -9,6 +9,7 @@ import os
 
 from .models import FileAttachment
 from utils.file_utils import validate_file, format_file_size
+from utils.pagination import KeysetPagination
 
 class FileUploadView(APIView):
     permission_classes = [permissions.IsAuthenticated]
@@ -61,16 +62,20 @@ class FileUploadView(APIView):
 
 class FileListView(APIView):
     permission_classes = [permissions.IsAuthenticated]
+    keyset_ordering = ('-uploaded_at', '-id')
 
     def get(self, request, *args, **kwargs):
         category = request.query_params.get('category')
-        files = FileAttachment.objects.filter(user=request.user).order_by('-uploaded_at')
+        files = FileAttachment.objects.filter(user=request.user)
         
         if category:
             files = files.filter(category=category)
+
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(files, request, view=self)
             
         data = []
-        for f in files:
+        for f in page:
             data.append({
                 'id': f.id,
                 'url': f.file.url,
@@ -82,7 +87,7 @@ class FileListView(APIView):
                 'description': f.description
             })
             
-        return Response(data)
+        return paginator.get_paginated_response(data)
 
 class FileDeleteView(APIView):
     permission_classes = [permissions.IsAuthenticated]
@@ -0,0 +1,97 @@
+"""
+Management command to benchmark serializing a page of freelancer search results.
+
+Creates N freelancers with profiles, reviews and completed hires inside a
+transaction that is rolled back, then serializes the same page with the full
+UserSerializer (what search used to return) and with FreelancerCardSerializer
+on a `with_card_stats()` queryset, reporting queries and time for each.
+
+Usage: python manage.py benchmark_freelancer_cards --freelancers 50
+"""
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from Project.models import Category, Project
+from Proposal.models import Proposal
+from Review.models import Review
+from User.models import Role, User
+from User.Serializers import FreelancerCardSerializer, UserSerializer
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks UserSerializer vs. FreelancerCardSerializer for a search page (rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--freelancers', type=int, default=50, help='Results on the page')
+        parser.add_argument('--runs', type=int, default=10, help='Timed runs per serializer')
+
+    def handle(self, *args, **options):
+        count = options['freelancers']
+        try:
+            with transaction.atomic():
+                ids = self._populate(count)
+                runs = {
+                    'UserSerializer': lambda: UserSerializer(
+                        User.objects.filter(pk__in=ids), many=True,
+                    ).data,
+                    'FreelancerCardSerializer': lambda: FreelancerCardSerializer(
+                        User.objects.filter(pk__in=ids).with_card_stats(), many=True,
+                    ).data,
+                }
+                self.stdout.write(f'{"serializer":<26}{"queries":>9}{"p50 ms":>10}')
+                for name, run in runs.items():
+                    queries, p50 = self._measure(run, options['runs'])
+                    self.stdout.write(f'{name:<26}{queries:>9}{p50:>10.1f}')
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _populate(self, count):
+        freelancer_role, _ = Role.objects.get_or_create(name='freelancer')
+        client = User.objects.create_user(
+            username='card-benchmark-client', email='card-benchmark-client@example.com', password=None,
+            country_origin='US', identity_number='card-benchmark-client',
+        )
+        category = Category.objects.create(name='Card Benchmark', slug='card-benchmark')
+
+        ids = []
+        for i in range(count):
+            user = User.objects.create_user(
+                username=f'card-benchmark-{i}', email=f'card-benchmark-{i}@example.com', password=None,
+                country_origin='US', identity_number=f'card-benchmark-{i}',
+            )
+            user.roles.add(freelancer_role)
+            user.profile.skills = 'Python,Django,React'
+            user.profile.hourly_rate = 40
+            user.profile.save()
+            for state in (Project.ProjectStatus.COMPLETED, Project.ProjectStatus.IN_PROGRESS):
+                project = Project.objects.create(
+                    title=f'Card benchmark {i} {state}', description='Benchmark', budget=100, price=100,
+                    category=category, client=client, status=state,
+                )
+                Proposal.objects.create(
+                    project=project, freelancer=user, bid_amount=100,
+                    status=Proposal.ProposalStatus.ACCEPTED,
+                )
+                Review.objects.create(project=project, reviewer=client, reviewee=user, rating=5)
+            ids.append(user.pk)
+        return ids
+
+    def _measure(self, run, runs):
+        with CaptureQueriesContext(connection) as queries:
+            run()
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            run()
+            samples.append((time.perf_counter() - start) * 1000)
+        return len(queries), statistics.median(samples)
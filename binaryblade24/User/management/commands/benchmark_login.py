@@ -0,0 +1,107 @@
+"""
+Management command to benchmark the login endpoint.
+
+Creates a user with roles, a profile and a few projects inside a transaction
+that is rolled back, then logs in by username repeatedly with:
+
+    before  the previous LoginView body: email lookup, then username lookup,
+            and the full UserSerializer (nested ProfileSerializer) in the response
+    after   the current LoginView: one email-or-username lookup and the
+            compact LoginUserSerializer payload
+
+and reports queries per login and logins/sec. Password hashing dominates a
+real login; --fast-hashing switches to MD5 for the run so the difference in
+database and serialization work is visible.
+
+Usage: python manage.py benchmark_login --logins 50 --fast-hashing
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIRequestFactory
+
+from Project.models import Category, Project
+from User.models import Role, User
+from User.Serializers import UserSerializer
+from User.tokens import tokens_for_user
+from User.views import LoginView
+
+PASSWORD = 'benchmark-password'
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks the previous vs. the current login response (logins/sec, rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=20, help='Timed logins per variant')
+        parser.add_argument('--fast-hashing', action='store_true', help='Use MD5 password hashing for the run')
+
+    def handle(self, *args, **options):
+        hashers = ['django.contrib.auth.hashers.MD5PasswordHasher'] if options['fast_hashing'] else None
+        with override_settings(**({'PASSWORD_HASHERS': hashers} if hashers else {})):
+            try:
+                with transaction.atomic():
+                    username = self._populate()
+                    view = LoginView.as_view()
+                    factory = APIRequestFactory()
+                    variants = {
+                        'before': lambda: self._legacy_login(username),
+                        'after': lambda: view(
+                            factory.post('/api/auth/login/', {'email': username, 'password': PASSWORD}, format='json')
+                        ).render(),
+                    }
+                    self.stdout.write(f'{"variant":<8}{"queries":>9}{"logins/sec":>12}')
+                    rates = {}
+                    for name, run in variants.items():
+                        queries, rates[name] = self._measure(run, options['logins'])
+                        self.stdout.write(f'{name:<8}{queries:>9}{rates[name]:>12.1f}')
+                    raise _Rollback
+            except _Rollback:
+                pass
+        self.stdout.write(self.style.SUCCESS(f'Speed-up: {rates["after"] / rates["before"]:.2f}x'))
+
+    def _populate(self):
+        client_role, _ = Role.objects.get_or_create(name='CLIENT')
+        freelancer_role, _ = Role.objects.get_or_create(name='FREELANCER')
+        user = User.objects.create_user(
+            username='login-benchmark', email='login-benchmark@example.com', password=PASSWORD,
+            country_origin='US', identity_number='login-benchmark',
+        )
+        user.roles.add(client_role, freelancer_role)
+        category = Category.objects.create(name='Login Benchmark', slug='login-benchmark')
+        for state in (Project.ProjectStatus.COMPLETED, Project.ProjectStatus.IN_PROGRESS, Project.ProjectStatus.OPEN):
+            Project.objects.create(
+                title=f'Login benchmark {state}', description='Benchmark', budget=100, price=100,
+                category=category, client=user, status=state,
+            )
+        return user.username
+
+    def _legacy_login(self, identifier):
+        """What LoginView did before: two lookups and the full user payload."""
+        user = User.objects.filter(email=identifier).first()
+        if user is None:
+            user = User.objects.filter(username=identifier).first()
+        user.check_password(PASSWORD)
+        user_roles = list(user.roles.values_list('name', flat=True))
+        refresh = tokens_for_user(user, role=user_roles[0], roles=user_roles)
+        return {
+            'refresh': str(refresh),
+            'access': str(refresh.access_token),
+            'user': UserSerializer(user).data,
+            'roles': user_roles,
+        }
+
+    def _measure(self, run, logins):
+        with CaptureQueriesContext(connection) as queries:
+            run()
+        start = time.perf_counter()
+        for _ in range(logins):
+            run()
+        return len(queries), logins / (time.perf_counter() - start)
@@ -0,0 +1,79 @@
+# Generated by Django 5.0.4 on 2026-10-17 04:12
+
+import django.db.models.deletion
+from collections import Counter
+
+from django.db import migrations, models
+
+
+def backfill_skills(apps, schema_editor):
+    """
+    Create Skill/ProfileSkill rows from Profile.skills strings.
+
+    Spellings that differ only in case or whitespace become one skill named
+    after its most common spelling, and every string is rewritten with the
+    canonical names.
+    """
+    from User.skills import parse_skills
+
+    Profile = apps.get_model('User', 'Profile')
+    Skill = apps.get_model('User', 'Skill')
+    ProfileSkill = apps.get_model('User', 'ProfileSkill')
+
+    profiles = list(Profile.objects.exclude(skills='').values_list('pk', 'skills'))
+    parsed = {pk: parse_skills(value) for pk, value in profiles}
+    spellings = Counter(name for names in parsed.values() for name in names)
+
+    canonical = {}
+    for name, _ in spellings.most_common():
+        canonical.setdefault(name.casefold(), name)
+    Skill.objects.bulk_create([Skill(name=name, key=key) for key, name in canonical.items()], batch_size=1000)
+    skill_ids = dict(Skill.objects.values_list('key', 'pk'))
+
+    links = []
+    for pk, names in parsed.items():
+        keys = list(dict.fromkeys(name.casefold() for name in names))
+        links.extend(ProfileSkill(profile_id=pk, skill_id=skill_ids[key]) for key in keys)
+        value = ','.join(canonical[key] for key in keys)[:255]
+        Profile.objects.filter(pk=pk).update(skills=value)
+    ProfileSkill.objects.bulk_create(links, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('User', '0024_profile_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('key', models.CharField(max_length=100, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ProfileSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='profile_skills', to='User.profile')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='profile_skills', to='User.skill')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='skill_set',
+            field=models.ManyToManyField(blank=True, related_name='profiles', through='User.ProfileSkill', to='User.skill'),
+        ),
+        migrations.AddIndex(
+            model_name='profileskill',
+            index=models.Index(fields=['skill', 'profile'], name='profile_skill_by_skill'),
+        ),
+        migrations.AddConstraint(
+            model_name='profileskill',
+            constraint=models.UniqueConstraint(fields=('profile', 'skill'), name='unique_profile_skill'),
+        ),
+        migrations.RunPython(backfill_skills, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.4 on 2026-10-17 04:18
+
+import User.models
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('User', '0025_skill_profileskill'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='user',
+            managers=[
+                ('objects', User.models.CustomUserManager()),
+            ],
+        ),
+    ]
@@ -1,17 +1,78 @@
 from django.db import models
-from django.contrib.auth.models import AbstractUser, Permission, Group
+from django.contrib.auth.models import AbstractUser, Permission, Group, UserManager
 from django.conf import settings # Needed for settings.AUTH_USER_MODEL reference
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.contrib.auth.hashers import check_password
 
-from django.db.models import Avg
 from decimal import Decimal
 from .countries import COUNTRIES
 
 # Generate choices from COUNTRIES list
 COUNTRY_CHOICES = [(country['code'], country['name']) for country in COUNTRIES]
 
-class User(AbstractUser):
+class UserQuerySet(models.QuerySet):
+    """
+    Query helpers for user listings.
+    """
+
+    def with_card_stats(self):
+        """
+        Load everything FreelancerCardSerializer displays in one query per page.
+
+        The profile is joined, roles are prefetched and the per-user numbers
+        are correlated subqueries, so serializing N users costs the same as
+        serializing one.
+
+        Ratings come from the joined ReputationStats (`reputation`).
+
+        Annotations:
+            completed_total (int): Completed projects the user was hired for
+                (accepted proposals)
+        """
+        # Imported here to avoid circular dependency (Proposal imports User)
+        from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+        from django.db.models.functions import Coalesce
+        from Proposal.models import Proposal
+
+        hires = Proposal.objects.filter(
+            freelancer=OuterRef('pk'),
+            status=Proposal.ProposalStatus.ACCEPTED,
+            project__status='COMPLETED',
+        ).order_by().values('freelancer')
+
+        return self.select_related('profile', 'reputation').prefetch_related('roles').annotate(
+            completed_total=Coalesce(
+                Subquery(hires.annotate(total=Count('pk')).values('total'), output_field=IntegerField()),
+                Value(0),
+            ),
+        )
+
+
+class SnapshotRowMixin:
+    """
+    Instances rebuilt from an auth snapshot (User/auth_cache.py) defer most
+    fields; the first deferred field read loads all of them in one query
+    instead of one query per field.
+    """
+    def refresh_from_db(self, using=None, fields=None, *args, **kwargs):
+        if fields is None or not getattr(self, '_auth_snapshot', False):
+            return super().refresh_from_db(using, fields, *args, **kwargs)
+        deferred = self.get_deferred_fields()
+        if deferred.issuperset(fields):
+            fields = list(deferred)
+        # refresh_from_db() forgets cached relations (e.g. user.profile);
+        # only deferred columns were loaded, so keep them
+        related = dict(self._state.fields_cache)
+        super().refresh_from_db(using, fields, *args, **kwargs)
+        for name, value in related.items():
+            self._state.fields_cache.setdefault(name, value)
+
+
+class CustomUserManager(UserManager.from_queryset(UserQuerySet)):
+    """Django's UserManager plus the UserQuerySet helpers (User.objects.with_card_stats())."""
+
+
+class User(SnapshotRowMixin, AbstractUser):
 
     # Custom fields added to the core User model
     country_origin = models.CharField(
@@ -66,7 +127,39 @@ class User(AbstractUser):
         verbose_name='user permissions',
     )
     roles = models.ManyToManyField('Role', related_name='users')
+    # Incremented on every change to `roles` (User/signals.py). Access tokens
+    # carry the role names and this version; they are only trusted while it
+    # still matches (User/authentication.py)
+    role_version = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = CustomUserManager()
+
+    def save(self, *args, **kwargs):
+        # role_version is only moved forward by UPDATE ... F(); an instance
+        # loaded before a role change must not write its older value back
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'role_version' and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
+    def role_names(self):
+        """
+        Names of the user's roles, as a frozenset.
 
+        Taken from the access token's claims when they are current
+        (User/authentication.py); otherwise loaded with one query and kept
+        on the instance.
+        """
+        if getattr(self, '_role_names', None) is None:
+            self._role_names = frozenset(self.roles.values_list('name', flat=True))
+        return self._role_names
+
+    def has_role(self, *names):
+        """Whether the user holds any of the roles `names` (exact names)."""
+        return not self.role_names().isdisjoint(names)
 
     def check_identity_number(self, raw_identity_number):
         return check_password(raw_identity_number, self.identity_number)
@@ -90,7 +183,7 @@ class Role(models.Model):
         return self.name
 
 
-class Profile(models.Model):
+class Profile(SnapshotRowMixin, models.Model):
     
     # One-to-One link to User model
     user = models.OneToOneField(
@@ -102,7 +195,10 @@ class Profile(models.Model):
     # Other non-identity profile fields
     bio = models.TextField(blank=True, null=True)
     address = models.CharField(max_length=255, blank=True, null=True)
+    # Comma-separated canonical skill names, kept for API compatibility. The
+    # normalized rows in `skill_set` are synced from it on save (User/skills.py)
     skills = models.CharField(max_length=255, blank=True)
+    skill_set = models.ManyToManyField('Skill', through='ProfileSkill', related_name='profiles', blank=True)
     hourly_rate = models.DecimalField(max_digits=7, decimal_places=2, null=True, blank=True)
     rating = models.DecimalField(max_digits=2, decimal_places=1, null=True )
     wallet_balance = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'))
@@ -137,6 +233,9 @@ class Profile(models.Model):
         db_index=True  # Index for filtering available freelancers
     )
 
+    # Last-Modified / ETag source for conditional profile reads
+    updated_at = models.DateTimeField(auto_now=True)
+
     # Computed properties for convenience / API use
     @property
     def completed_projects(self):
@@ -166,18 +265,18 @@ class Profile(models.Model):
 
     @property
     def average_rating(self):
-        """Return the aggregated average rating calculated from Review records.
+        """Return the average rating received in reviews.
 
         If the `rating` field on Profile is already populated it will be returned as a
-        convenience; otherwise the value is computed from Review.reviewee (reviews_received).
+        convenience; otherwise the value is read from the user's ReputationStats.
         """
+        from Review.reputation import user_rating
+
         # Use cached rating if present
         if self.rating is not None:
             return float(self.rating)
 
-        # Aggregate from Review model via the user's related name `reviews_received`
-        agg = self.user.reviews_received.aggregate(avg=Avg('rating'))
-        avg = agg.get('avg')
+        avg = user_rating(self.user)
         return float(avg) if avg is not None else None
 
     class Meta:
@@ -189,6 +288,32 @@ class Profile(models.Model):
         roles = ', '.join([role.name for role in self.user.roles.all()])
         return f"{self.user.username}'s Profile ({roles})"
 
+
+class Skill(models.Model):
+    """A distinct skill; `key` is the casefolded, whitespace-collapsed name used to match spellings."""
+    name = models.CharField(max_length=100)
+    key = models.CharField(max_length=100, unique=True)
+
+    def __str__(self):
+        return self.name
+
+
+class ProfileSkill(models.Model):
+    """Profile <-> Skill link, indexed both ways for skill filters and facet counts."""
+    profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name='profile_skills')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='profile_skills')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['profile', 'skill'], name='unique_profile_skill'),
+        ]
+        indexes = [
+            models.Index(fields=['skill', 'profile'], name='profile_skill_by_skill'),
+        ]
+
+    def __str__(self):
+        return f"{self.profile_id}:{self.skill_id}"
+
 class Payment(models.Model):
     PAYMENT_METHOD_CHOICES = [
         ('stripe', 'Stripe'),
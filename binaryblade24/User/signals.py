@@ -1,8 +1,13 @@
 import logging
 from django.contrib.auth.signals import user_logged_in
 from django.dispatch import receiver
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from utils.cache import bump_namespace
+from .auth_cache import forget_user
 from .models import User, Profile, NotificationPreferences, UserPreferences
+from .skills import sync_profile_skills
 
 
 logger = logging.getLogger(__name__)
@@ -35,3 +40,63 @@ def create_user_preferences(sender, instance, created, **kwargs):
             language='en',
             timezone='UTC'
         )
+
+
+@receiver(post_save, sender=Profile)
+def sync_skills(sender, instance, raw=False, **kwargs):
+    """
+    Keep ProfileSkill rows in step with Profile.skills.
+
+    Skill facets (search options) are cached under the 'skills' namespace.
+    """
+    if raw:
+        return
+    if sync_profile_skills(instance):
+        bump_namespace('skills')
+        transaction.on_commit(lambda: bump_namespace('skills'))
+
+
+@receiver(m2m_changed, sender=User.roles.through)
+def bump_role_version(sender, instance, action, reverse, pk_set=None, **kwargs):
+    """
+    Invalidate the role claims in the affected users' access tokens.
+
+    Tokens carrying an older `role_version` fall back to reading the roles
+    from the database (User/authentication.py).
+    """
+    if reverse and action == 'pre_clear':
+        # post_clear has no pk_set; remember who loses the role
+        instance._cleared_user_ids = list(instance.users.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        user_ids = [instance.pk]
+        instance._role_names = None
+    elif action == 'post_clear':
+        user_ids = getattr(instance, '_cleared_user_ids', [])
+    else:
+        user_ids = list(pk_set or ())
+    if not user_ids:
+        return
+
+    User.objects.filter(pk__in=user_ids).update(role_version=F('role_version') + 1)
+    forget_user(*user_ids)
+    if not reverse:
+        instance.refresh_from_db(fields=['role_version'])
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_saved_user(sender, instance, raw=False, **kwargs):
+    """Drop the cached auth snapshot (User/auth_cache.py); covers deactivation."""
+    if not raw:
+        forget_user(instance.pk)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def forget_profile_user(sender, instance, raw=False, **kwargs):
+    if not raw:
+        forget_user(instance.user_id)
@@ -0,0 +1,99 @@
+"""
+Skill normalization.
+
+Profile.skills stays a comma-separated string for API compatibility; the
+Skill / ProfileSkill tables hold the same data normalized so skill filters
+and facet counts are indexed joins instead of substring scans.
+
+Spellings that differ only in case or whitespace ("react  native",
+"React Native") are one Skill, matched by its `key`. Saving a profile
+(User/signals.py) links it to its skills and rewrites `skills` with the
+canonical names.
+"""
+
+import re
+
+SEPARATORS = re.compile(r'[,;]')
+
+
+def canonical_name(name):
+    """Collapse whitespace: '  React   Native ' -> 'React Native' (max 100 characters)."""
+    return ' '.join(name.split())[:100]
+
+
+def parse_skills(value):
+    """
+    Distinct skill names in a Profile.skills string, in order; first spelling wins.
+
+    "python, Django ,PYTHON" -> ["python", "Django"]
+    """
+    seen, names = set(), []
+    for part in SEPARATORS.split(value or ''):
+        name = canonical_name(part)
+        if name and name.casefold() not in seen:
+            seen.add(name.casefold())
+            names.append(name)
+    return names
+
+
+def get_or_create_skills(names, Skill=None):
+    """
+    Skill rows for `names`, reusing existing spellings.
+
+    Args:
+        names (list[str]): Canonical names, as returned by parse_skills()
+        Skill: Model class (the migration passes its historical model)
+
+    Returns:
+        list: Skill instances in the order of `names`
+    """
+    if Skill is None:
+        from .models import Skill
+    keys = [name.casefold() for name in names]
+    found = {skill.key: skill for skill in Skill.objects.filter(key__in=keys)}
+    missing = [Skill(name=name, key=key) for name, key in zip(names, keys) if key not in found]
+    if missing:
+        # Another request may create the same skill concurrently
+        Skill.objects.bulk_create(missing, ignore_conflicts=True)
+        found.update((skill.key, skill) for skill in Skill.objects.filter(key__in=[s.key for s in missing]))
+    return [found[key] for key in keys]
+
+
+def sync_profile_skills(profile):
+    """
+    Link `profile` to the skills in `profile.skills` and canonicalize the string.
+
+    Returns:
+        bool: Whether the profile's skills changed
+    """
+    from .models import Profile, ProfileSkill
+
+    skills = get_or_create_skills(parse_skills(profile.skills))
+    wanted = {skill.pk for skill in skills}
+    current = set(ProfileSkill.objects.filter(profile=profile).values_list('skill_id', flat=True))
+    if wanted != current:
+        ProfileSkill.objects.filter(profile=profile, skill_id__in=current - wanted).delete()
+        ProfileSkill.objects.bulk_create(
+            [ProfileSkill(profile=profile, skill_id=skill_id) for skill_id in wanted - current],
+            ignore_conflicts=True,
+        )
+
+    canonical = ','.join(skill.name for skill in skills)[:255]
+    if canonical != profile.skills:
+        Profile.objects.filter(pk=profile.pk).update(skills=canonical)
+        profile.skills = canonical
+    return wanted != current
+
+
+def filter_by_skills(users, value):
+    """
+    Narrow a User queryset to profiles with any of the skills in `value`.
+
+    Args:
+        users: User queryset
+        value (str): Comma-separated skill names (any spelling)
+    """
+    keys = [name.casefold() for name in parse_skills(value)]
+    if not keys:
+        return users
+    return users.filter(profile__profile_skills__skill__key__in=keys).distinct()
@@ -0,0 +1,28 @@
+"""
+Token issuing for the login and registration views.
+"""
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .authentication import ROLE_VERSION_CLAIM, ROLES_CLAIM
+
+
+def tokens_for_user(user, role=None, roles=None):
+    """
+    Refresh token for `user` carrying its role claims; `.access_token` inherits them.
+
+    Args:
+        user (User): Authenticated user (its `role_version` must be current)
+        role (str|None): Primary role for the `role` claim
+        roles (list[str]|None): The user's role names, if already loaded
+
+    Returns:
+        RefreshToken
+    """
+    if roles is None:
+        roles = user.role_names()
+    refresh = RefreshToken.for_user(user)
+    if role is not None:
+        refresh['role'] = role
+    refresh[ROLES_CLAIM] = sorted(roles)
+    refresh[ROLE_VERSION_CLAIM] = user.role_version
+    return refresh
@@ -1,15 +1,22 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, serializers
-from .Serializers import UserSerializer, ProfileSerializer
+from .Serializers import FreelancerCardSerializer, LoginUserSerializer, UserSerializer, ProfileSerializer
 from django.contrib.auth import get_user_model
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
 from .Permissions import IsOwnerOrAdmin
+from utils.cache import cache_response
+from utils.conditional import conditional_response, make_etag, request_variant
+from search.autocomplete import suggest
+from search.backends import search_results
+from search.models import SearchDocument
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from rest_framework_simplejwt.tokens import RefreshToken
-from .models import Profile, Role #, Payment
+from .models import Profile, ProfileSkill, Role, Skill #, Payment
+from .skills import filter_by_skills
+from .tokens import tokens_for_user
 
 # from Project.models import Project
 # import stripe
@@ -21,6 +28,20 @@ from django.views.decorators.csrf import csrf_exempt
 
 User = get_user_model()
 
+
+def find_login_user(identifier):
+    """
+    User whose email, or failing that username, is `identifier`.
+
+    One query over the two unique (indexed) columns; an email match wins
+    when the identifier is one user's email and another's username.
+    """
+    if not identifier:
+        return None
+    users = list(User.objects.filter(Q(email=identifier) | Q(username=identifier))[:2])
+    return next((user for user in users if user.email == identifier), users[0] if users else None)
+
+
 class LoginView(APIView):
     """Simple login endpoint that returns user data and all their roles."""
     permission_classes = [AllowAny]
@@ -32,10 +53,7 @@ class LoginView(APIView):
         if not email or not password:
             return Response({'detail': 'Email and password are required'}, status=status.HTTP_400_BAD_REQUEST)
         
-        user = User.objects.filter(email=email).first()
-        if user is None:
-            # Fallback to username
-            user = User.objects.filter(username=email).first()
+        user = find_login_user(email)  # Email or username
         
         if user is None or not user.check_password(password):
             return Response({'detail': 'Invalid credentials'}, status=status.HTTP_401_UNAUTHORIZED)
@@ -63,14 +81,13 @@ class LoginView(APIView):
         if not user_roles:
             return Response({'detail': 'User has no assigned roles'}, status=status.HTTP_400_BAD_REQUEST)
         
-        # Generate tokens
-        refresh = RefreshToken.for_user(user)
-        refresh['role'] = user_roles[0]  # Add primary role to token
+        # Generate tokens; the access token carries every role (User/authentication.py)
+        refresh = tokens_for_user(user, role=user_roles[0], roles=user_roles)  # Primary role in 'role'
         
         response_data = {
             'refresh': str(refresh),
             'access': str(refresh.access_token),
-            'user': UserSerializer(user).data,
+            'user': LoginUserSerializer(user).data,  # Full profile: /api/auth/users/{id}/profile/
             'roles': user_roles
         }
         
@@ -88,10 +105,7 @@ class LoginWithRoleView(APIView):
         password = request.data.get('password')
         role_name = request.data.get('role')
         
-        user = User.objects.filter(email=email).first()
-        if user is None:
-            # As a fallback, try to authenticate against the username
-            user = User.objects.filter(username=email).first()
+        user = find_login_user(email)  # Email or username
         
         if user is None or not user.check_password(password):
             return Response({'detail': 'Invalid credentials'}, status=status.HTTP_401_UNAUTHORIZED)
@@ -114,16 +128,16 @@ class LoginWithRoleView(APIView):
                 'days_remaining': max(0, days_remaining)
             }, status=status.HTTP_403_FORBIDDEN)
             
-        if role_name not in user.roles.values_list('name', flat=True):
+        user_roles = list(user.roles.values_list('name', flat=True))
+        if role_name not in user_roles:
             return Response({'detail': 'Invalid role for this user.'}, status=status.HTTP_400_BAD_REQUEST)
             
-        refresh = RefreshToken.for_user(user)
-        refresh['role'] = role_name
+        refresh = tokens_for_user(user, role=role_name, roles=user_roles)
         
         response_data = {
             'refresh': str(refresh),
             'access': str(refresh.access_token),
-            'user': UserSerializer(user).data,
+            'user': LoginUserSerializer(user).data,  # Full profile: /api/auth/users/{id}/profile/
             'roles': [role_name]
         }
         
@@ -146,9 +160,8 @@ class RegisterView(APIView):
                 user = serializer.save()
                 
                 # Generate tokens for the new user
-                refresh = RefreshToken.for_user(user)
-                if user.roles.exists():
-                    refresh['role'] = user.roles.first().name
+                first_role = user.roles.order_by('pk').first()
+                refresh = tokens_for_user(user, role=first_role.name if first_role else None)
                 
                 response_data = UserSerializer(user).data
                 response_data['refresh'] = str(refresh)
@@ -180,7 +193,7 @@ class UserListView(APIView):
 
     def get(self, request, format=None):
         users = User.objects.all()
-        serializer = UserSerializer(users, many=True)
+        serializer = UserSerializer(users, many=True, context={'request': request})
         return Response(serializer.data)
 
 
@@ -192,7 +205,7 @@ class UserDetailView(APIView):
 
     def get(self, request, pk, format=None):
         user = get_object_or_404(User, pk=pk)
-        serializer = UserSerializer(user)
+        serializer = UserSerializer(user, context={'request': request})
         return Response(serializer.data)
 
     def patch(self, request, pk, format=None):
@@ -205,12 +218,42 @@ class UserDetailView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+def profile_validators(view, request, pk=None, **kwargs):
+    """
+    ETag/Last-Modified for a profile: the profile and user rows, the skill
+    links, the user's projects (completed/active lists and counts) and the
+    review stats (average rating). Every part is read from the database, so
+    the tag holds across workers without a shared cache.
+    """
+    from django.db.models import Count, Max
+    from Project.models import Project
+
+    row = Profile.objects.filter(user_id=pk).values_list(
+        'updated_at', 'user__first_name', 'user__last_name', 'user__profile_picture',
+        'user__reputation__updated_at',
+    ).first()
+    if row is None:
+        return None
+    profile_updated, first_name, last_name, picture, reputation_updated = row
+    skills = ProfileSkill.objects.filter(profile__user_id=pk).aggregate(latest=Max('pk'), total=Count('pk'))
+    projects = Project.objects.filter(client_id=pk).aggregate(latest=Max('updated_at'), total=Count('pk'))
+    last_modified = max(filter(None, [profile_updated, projects['latest'], reputation_updated]))
+    etag = make_etag(
+        'profile', pk, profile_updated, first_name, last_name, picture, reputation_updated,
+        skills['latest'], skills['total'], projects['latest'], projects['total'], request_variant(request),
+    )
+    return etag, last_modified
+
+
 class UserProfileView(APIView):
     """
     Retrieve or update a user's profile.
+
+    GET supports conditional requests (ETag / Last-Modified, 304 when unchanged).
     """
     permission_classes = [IsAuthenticated, IsOwnerOrAdmin]
 
+    @conditional_response(profile_validators)
     def get(self, request, pk, format=None):
         user = get_object_or_404(User, pk=pk)
         profile = get_object_or_404(Profile, user=user)
@@ -242,14 +285,18 @@ class AddFreelancerRoleView(APIView):
         freelancer_role, _ = Role.objects.get_or_create(name='freelancer')
         client_role, _ = Role.objects.get_or_create(name='client')
         
-        # Add the roles to the user
+        # Add the roles to the user; this bumps user.role_version, so tokens
+        # issued before still work but no longer vouch for the roles
         user.roles.add(freelancer_role, client_role)
         
         serializer = UserSerializer(user)
-        return Response(serializer.data, status=status.HTTP_200_OK)
-
+        response_data = serializer.data
+        # Fresh tokens carrying the new role set
+        refresh = tokens_for_user(user, role=request.auth.get('role') if request.auth else None)
+        response_data['refresh'] = str(refresh)
+        response_data['access'] = str(refresh.access_token)
+        return Response(response_data, status=status.HTTP_200_OK)
 
-from django.db.models import Q
 
 class UserSearchView(APIView):
     """
@@ -264,19 +311,10 @@ class UserSearchView(APIView):
         level = request.query_params.get('level')
         country = request.query_params.get('country')
         availability = request.query_params.get('availability')
+        skills = request.query_params.get('skills')
 
         # Start with all users who have a 'freelancer' role
-        users = User.objects.filter(roles__name='freelancer')
-
-        if query:
-            # Search in username, names, bio, skills
-            users = users.filter(
-                Q(username__icontains=query) |
-                Q(first_name__icontains=query) |
-                Q(last_name__icontains=query) |
-                Q(profile__bio__icontains=query) |
-                Q(profile__skills__icontains=query)
-            ).distinct()
+        users = User.objects.filter(roles__name='freelancer').with_card_stats()
 
         # Apply Filters
         if min_rate:
@@ -289,11 +327,17 @@ class UserSearchView(APIView):
             users = users.filter(country_origin=country)
         if availability:
             users = users.filter(profile__availability=availability)
+        if skills:
+            users = filter_by_skills(users, skills)
 
         # Pagination (Simple limit for now, can use standard DRF pagination)
         # users = users[:20] 
 
-        serializer = UserSerializer(users, many=True)
+        if query:
+            # Full-text search over names, skills and bio, best matches first
+            users = search_results(users, SearchDocument.Kind.PROFILE, query)
+
+        serializer = FreelancerCardSerializer(users, many=True, context={'request': request})
         return Response(serializer.data)
 
 
@@ -475,9 +519,11 @@ class UserSearchView(APIView):
 # GLOBAL SEARCH & FILTERS
 # -----------------------------------------------------------------------------
 
-from django.db.models import Min, Max, Q
-from Project.models import Project, Category
+from django.db.models import Count, Min, Max, Q
+from Project.models import Project
+from Project.category_tree import get_category_tree
 from Project.Serializers import ProjectSerializer
+from utils.sections import run_sections
 from .Serializers import UserSerializer # Assuming this exists and includes Profile data
 
 class SearchFilterOptionsView(APIView):
@@ -486,12 +532,14 @@ class SearchFilterOptionsView(APIView):
     """
     permission_classes = [AllowAny]
     authentication_classes = []
+    skill_facet_limit = 50
 
+    # Rate ranges come from profiles, which do not bump a namespace: they
+    # refresh when API_CACHE_TIMEOUT expires
+    @cache_response('search_options', depends_on=('categories', 'projects', 'skills'))
     def get(self, request):
         # 1. Categories (Full Hierarchy)
-        from Project.category_serializers import CategorySerializer
-        categories_qs = Category.objects.filter(parent=None).prefetch_related('subcategories')
-        categories_data = CategorySerializer(categories_qs, many=True).data
+        categories_data = get_category_tree().payload
         
         # 2. Hourly Rates (from Profiles)
         rate_stats = Profile.objects.aggregate(
@@ -505,8 +553,16 @@ class SearchFilterOptionsView(APIView):
             max_budget=Max('budget')
         )
         
+        # 4. Most listed skills with freelancer counts (indexed join on ProfileSkill)
+        skills = Skill.objects.filter(
+            profile_skills__profile__user__roles__name='freelancer'
+        ).annotate(
+            count=Count('profile_skills', distinct=True)
+        ).order_by('-count', 'name')[:self.skill_facet_limit]
+
         return Response({
             "categories": categories_data,
+            "skills": [{"name": skill.name, "count": skill.count} for skill in skills],
             "freelancer_rates": {
                 "min": rate_stats['min_rate'] or 0,
                 "max": rate_stats['max_rate'] or 500
@@ -522,6 +578,10 @@ class SearchFilterOptionsView(APIView):
 class GlobalSearchView(APIView):
     """
     Unified search endpoint for Users, Projects, and Categories.
+
+    The sections run concurrently (utils/sections.py). A section that overruns
+    SEARCH_SECTION_TIMEOUT comes back empty and is listed under "timed_out";
+    with DEBUG on, per-section timings are sent in a Server-Timing header.
     """
     permission_classes = [AllowAny]
     authentication_classes = []
@@ -529,88 +589,93 @@ class GlobalSearchView(APIView):
     def get(self, request):
         query = request.query_params.get('q', '')
         category_id = request.query_params.get('category')
-        min_price = request.query_params.get('min_price') # Covers rate or budget
-        max_price = request.query_params.get('max_price')
-        rating = request.query_params.get('rating')
         search_type = request.query_params.get('type', 'all') # 'all', 'freelancers', 'projects'
 
-        results = {}
+        category_tree = get_category_tree()
+        if category_id:
+            try:
+                category_id = int(category_id)
+            except (ValueError, TypeError):
+                category_id = None  # Ignore invalid ids such as 'undefined'
+        params = request.query_params
+        limit = 20 if search_type == 'all' else 50
 
-        # ---------------------------------------------------------
-        # 1. SEARCH FREELANCERS (if type is 'all' or 'freelancers')
-        # ---------------------------------------------------------
+        sections = {}
         if search_type in ['all', 'freelancers']:
-            users = User.objects.filter(roles__name='freelancer')
-            
-            if query:
-                users = users.filter(
-                    Q(username__icontains=query) |
-                    Q(first_name__icontains=query) |
-                    Q(last_name__icontains=query) |
-                    Q(profile__bio__icontains=query) |
-                    Q(profile__skills__icontains=query)
-                ).distinct()
-
-            # Filters
-            if min_price:
-                users = users.filter(profile__hourly_rate__gte=min_price)
-            if max_price:
-                users = users.filter(profile__hourly_rate__lte=max_price)
-            if rating:
-                users = users.filter(profile__rating__gte=rating)
-            if category_id:
-                # Filter freelancers who have GIGs in this category or its subcategories
-                users = users.filter(
-                    Q(created_projects__category_id=category_id) |
-                    Q(created_projects__category__parent_id=category_id)
-                ).distinct()
-            
-            user_limit = 20 if search_type == 'all' else 50
-            results['freelancers'] = UserSerializer(users[:user_limit], many=True).data
-
-        # ---------------------------------------------------------
-        # 2. SEARCH PROJECTS (if type is 'all' or 'projects')
-        # ---------------------------------------------------------
+            sections['freelancers'] = lambda: self.search_freelancers(params, query, category_tree, category_id, limit)
         if search_type in ['all', 'projects']:
-            # Search Projects (OPEN only)
-            projects = Project.objects.filter(status='OPEN')
-            
-            # Filter by project_type (JOB or GIG) if specified
-            project_type = request.query_params.get('project_type')
-            if project_type:
-                projects = projects.filter(project_type=project_type.upper())
-            
-            if query:
-                projects = projects.filter(
-                    Q(title__icontains=query) |
-                    Q(description__icontains=query) |
-                    Q(category__name__icontains=query)
-                ).distinct()
-                
-            # Filters
-            if min_price:
-                projects = projects.filter(budget__gte=min_price)
-            if max_price:
-                projects = projects.filter(budget__lte=max_price)
-            if category_id:
-                projects = projects.filter(
-                    Q(category_id=category_id) | 
-                    Q(category__parent_id=category_id)
-                )
-                
-            project_limit = 20 if search_type == 'all' else 50
-            results['projects'] = ProjectSerializer(projects[:project_limit], many=True).data
-
-        # ---------------------------------------------------------
-        # 3. SEARCH CATEGORIES (only if query present and type is 'all')
-        # ---------------------------------------------------------
-        if search_type == 'all' and query:
-            categories = Category.objects.filter(name__icontains=query)[:5]
-            results['categories'] = list(categories.values('id', 'name', 'slug'))
-        elif search_type == 'all' and not query:
-             results['categories'] = []
+            sections['projects'] = lambda: self.search_projects(params, query, category_tree, category_id, limit)
+        if search_type == 'all':
+            # Only matched when a query is present
+            sections['categories'] = lambda: category_tree.search(query, limit=5) if query else []
+
+        sectioned = run_sections(sections, timeout=settings.SEARCH_SECTION_TIMEOUT, fallback=[])
+        results = dict(sectioned.values)
+        if sectioned.timed_out:
+            results['timed_out'] = sectioned.timed_out
+
+        response = Response(results)
+        if settings.DEBUG:
+            response['Server-Timing'] = sectioned.server_timing()
+        return response
+
+    def search_freelancers(self, params, query, category_tree, category_id, limit):
+        users = User.objects.filter(roles__name='freelancer').with_card_stats()
+
+        # Filters
+        min_price = params.get('min_price')  # Covers rate or budget
+        max_price = params.get('max_price')
+        rating = params.get('rating')
+        skills = params.get('skills')  # Comma-separated
+        if min_price:
+            users = users.filter(profile__hourly_rate__gte=min_price)
+        if max_price:
+            users = users.filter(profile__hourly_rate__lte=max_price)
+        if rating:
+            users = users.filter(profile__rating__gte=rating)
+        if skills:
+            users = filter_by_skills(users, skills)
+        if category_id:
+            # Filter freelancers who have GIGs in this category or its subcategories
+            users = users.filter(
+                created_projects__category_id__in=category_tree.descendant_ids(category_id)
+            ).distinct()
 
-        return Response(results)
+        if query:
+            # Full-text search over names, skills and bio, best matches first
+            users = search_results(users, SearchDocument.Kind.PROFILE, query, limit)
+        else:
+            users = users[:limit]
+        return FreelancerCardSerializer(users, many=True).data
+
+    def search_projects(self, params, query, category_tree, category_id, limit):
+        # Search Projects (OPEN only)
+        projects = Project.objects.filter(status='OPEN')
+
+        # Filter by project_type (JOB or GIG) if specified
+        project_type = params.get('project_type')
+        if project_type:
+            projects = projects.filter(project_type=project_type.upper())
+
+        # Filters
+        min_price = params.get('min_price')
+        max_price = params.get('max_price')
+        if min_price:
+            projects = projects.filter(budget__gte=min_price)
+        if max_price:
+            projects = projects.filter(budget__lte=max_price)
+        if category_id:
+            projects = projects.filter(
+                category_id__in=category_tree.descendant_ids(category_id)
+            )
+
+        projects = projects.with_listing_stats()
+        if query:
+            # Full-text search over title, category and description, best matches first
+            projects = search_results(projects, SearchDocument.Kind.PROJECT, query, limit)
+        else:
+            projects = projects[:limit]
+        return ProjectSerializer(projects, many=True).data
 
 class UserSuggestionView(APIView):
     """
@@ -624,44 +689,6 @@ class UserSuggestionView(APIView):
         if len(query) < 2:
             return Response([])
 
-        suggestions = []
-
-        # 1. Matching Categories
-        categories = Category.objects.filter(name__icontains=query)[:3]
-        for cat in categories:
-            suggestions.append({'type': 'category', 'text': cat.name, 'id': cat.id})
-
-        # 2. Matching Projects
-        projects = Project.objects.filter(title__icontains=query, status='OPEN')[:3]
-        for p in projects:
-            suggestions.append({'type': 'project', 'text': p.title, 'id': p.id})
-
-        # 3. Matching Users
-        users = User.objects.filter(roles__name='freelancer').filter(
-            Q(username__icontains=query) |
-            Q(first_name__icontains=query) |
-            Q(last_name__icontains=query)
-        )[:3]
-        
-        for user in users:
-            name_str = f"{user.first_name} {user.last_name} ({user.username})"
-            suggestions.append({
-                "type": "user",
-                "text": name_str.strip(),
-                "id": user.id
-            })
-
-        # 4. Matching Skills (from Profile)
-        profiles = Profile.objects.filter(skills__icontains=query)[:5]
-        found_skills = set()
-        for p in profiles:
-            if not p.skills: continue
-            for skill in p.skills.split(','):
-                skill = skill.strip()
-                if query.lower() in skill.lower() and skill not in found_skills:
-                    found_skills.add(skill)
-                    suggestions.append({'type': 'skill', 'text': skill})
-                    if len(found_skills) >= 2: break
-            if len(found_skills) >= 2: break
-
-        return Response(suggestions)
+        # Categories, open projects, freelancers and skills from the
+        # autocomplete index (search/autocomplete.py), in one query
+        return Response(suggest(query))
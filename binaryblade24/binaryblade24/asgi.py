@@ -2,6 +2,8 @@
 ASGI config for binaryblade24 project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+The `realtime` process in the Procfile serves it (for the SSE event stream,
+realtime/views.py); the REST API can keep running under WSGI.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -14,3 +16,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'binaryblade24.settings')
 
 application = get_asgi_application()
+
+# A broker that cannot reach the web workers' events fails here, at boot
+from realtime.broker import get_broker  # noqa: E402
+
+get_broker()
@@ -68,8 +68,10 @@ INSTALLED_APPS = [
     'dashboard',
     'message',
     'notifications',
+    'realtime',
     'Order',
     'escrow',
+    'search',
 ]
 
 # SEO: Site ID for sitemap framework
@@ -95,6 +97,8 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    # Renders each nested user once per GET request (utils/memo.py)
+    'utils.memo.SerializerMemoMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -136,6 +140,51 @@ DATABASES = {
 AUTH_USER_MODEL = 'User.User'
 
 
+# ====================================================================
+# CACHING
+# ====================================================================
+
+# Redis in production (set REDIS_URL, e.g. redis://localhost:6379/0 for the
+# docker-compose service); per-process locmem otherwise, which is what tests use
+REDIS_URL = config('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'binaryblade',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'binaryblade',
+        }
+    }
+
+# Real-time event stream (realtime/): broker class (dotted path; default
+# RedisBroker with REDIS_URL, InMemoryBroker otherwise), seconds between
+# keep-alive pings, client reconnect delay and events buffered per connection.
+# REALTIME_STANDALONE marks an ASGI process that only serves streams while
+# separate web workers publish (the Procfile's `realtime`); it then requires
+# a cross-process broker
+REALTIME_BROKER = config('REALTIME_BROKER', default='')
+REALTIME_STANDALONE = config('REALTIME_STANDALONE', default=False, cast=bool)
+REALTIME_HEARTBEAT = config('REALTIME_HEARTBEAT', default=15, cast=float)
+REALTIME_RETRY_MS = config('REALTIME_RETRY_MS', default=3000, cast=int)
+REALTIME_QUEUE_SIZE = config('REALTIME_QUEUE_SIZE', default=100, cast=int)
+
+# Seconds anonymous API responses stay cached (utils/cache.py); entries are
+# also invalidated early by model signals
+API_CACHE_TIMEOUT = config('API_CACHE_TIMEOUT', default=300, cast=int)
+
+# Without a shared cache (no REDIS_URL), category edits in one process reach
+# the others' category trees (Project/category_tree.py) within this many seconds
+CATEGORY_TREE_LOCAL_TIMEOUT = config('CATEGORY_TREE_LOCAL_TIMEOUT', default=30, cast=int)
+
+
 # ====================================================================
 # STATIC & MEDIA FILES AND WHITENOISE
 # ====================================================================
@@ -161,11 +210,54 @@ STORAGES = {
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # simplejwt's JWTAuthentication, plus role claims for permission checks
+        'User.authentication.RoleClaimsJWTAuthentication',
         # You may also want TokenAuthentication or BasicAuthentication here if needed
     )
 }
 
+# Full-text search (search/backends.py). Defaults to the database vendor's
+# backend: PostgreSQL tsvector/GIN, SQLite FTS5, LIKE elsewhere
+SEARCH_BACKEND = config('SEARCH_BACKEND', default='')
+SEARCH_MAX_RESULTS = config('SEARCH_MAX_RESULTS', default=500, cast=int)
+
+# Global search runs its sections (freelancers, projects, categories) on a
+# shared thread pool (utils/sections.py). A section still running after
+# SECTION_TIMEOUT seconds of running (its queries are cancelled then) is
+# returned empty and listed under "timed_out"; sections run inline in the
+# request thread while every worker is busy
+SEARCH_SECTION_WORKERS = config('SEARCH_SECTION_WORKERS', default=4, cast=int)
+SEARCH_SECTION_TIMEOUT = config('SEARCH_SECTION_TIMEOUT', default=1.5, cast=float)
+
+# Keyset pagination (utils.pagination.KeysetPagination) used by list endpoints
+API_PAGE_SIZE = config('API_PAGE_SIZE', default=20, cast=int)
+API_MAX_PAGE_SIZE = config('API_MAX_PAGE_SIZE', default=100, cast=int)
+
+# Project impression ingestion (Project/impressions.py)
+# ENABLED: spool views locally and bulk-insert them instead of one INSERT per page view
+# DEDUP_WINDOW: seconds during which repeat views by the same user/IP are dropped
+PROJECT_VIEW_BUFFER = {
+    'ENABLED': config('PROJECT_VIEW_BUFFERING', default=False, cast=bool),
+    'SPOOL_DIR': config('PROJECT_VIEW_SPOOL_DIR', default=os.path.join(BASE_DIR, 'impression_spool')),
+    'MAX_BATCH': 500,
+    'FLUSH_INTERVAL': 5,
+    'DEDUP_WINDOW': 30 * 60,
+}
+
+# Raw ProjectView rows older than this are deleted by rollup_project_views once
+# they are folded into ProjectViewRollup (None keeps raw rows forever)
+PROJECT_VIEW_RETENTION_DAYS = config('PROJECT_VIEW_RETENTION_DAYS', default=None, cast=lambda v: int(v) if v else None)
+
+# Seconds a raw ProjectView row waits before rollup_project_views folds it, so
+# inserts with lower ids that commit later are not skipped; must exceed the
+# longest view-inserting transaction (e.g. a buffered bulk insert)
+PROJECT_VIEW_ROLLUP_GRACE = config('PROJECT_VIEW_ROLLUP_GRACE', default=300, cast=int)
+
+# Seconds a JWT-authenticated user's snapshot is cached (User/auth_cache.py); 0 disables.
+# Needs a cache shared by every process: with per-process locmem, a deactivation
+# or role change would only drop the snapshot in the process that saved it
+AUTH_USER_CACHE_TIMEOUT = config('AUTH_USER_CACHE_TIMEOUT', default=60 if REDIS_URL else 0, cast=int)
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=15),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
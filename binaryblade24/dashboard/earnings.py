@@ -0,0 +1,216 @@
+"""
+Earnings and spend buckets.
+
+EarningsBucket rows hold, per user, role and UTC month/day, the total of the
+user's completed orders:
+
+    FREELANCER  sum of OrderItem.final_price sold, number of orders
+    CLIENT      sum of Order.total_amount spent, number of orders
+
+An order is dated by Order.completed_at, which is set once when it first
+completes. When an order or one of its items changes, the signals in
+dashboard/signals.py call schedule_bucket_refresh() for the order's users and
+completion date; on commit the month and day buckets containing that date
+are recomputed from the orders in that period only. A refund or deletion
+drops the order from the recompute, so buckets never keep stale amounts.
+
+rebuild_buckets() recomputes every bucket (migration backfill,
+`rebuild_dashboards`).
+"""
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.apps import apps as global_apps
+from django.db import transaction
+from django.db.models import Count, DateField, Sum
+from django.db.models.functions import Trunc
+
+from .models import DashboardSnapshot, EarningsBucket
+from .snapshots import collect_on_commit
+
+FREELANCER = DashboardSnapshot.Role.FREELANCER
+CLIENT = DashboardSnapshot.Role.CLIENT
+MONTH = EarningsBucket.Granularity.MONTH
+DAY = EarningsBucket.Granularity.DAY
+
+COMPLETED = 'COMPLETED'
+TRUNC_KINDS = {MONTH: 'month', DAY: 'day'}
+PERIODS_PER_YEAR = {MONTH: 12, DAY: 365}
+
+
+def calculate_tax(annual_income):
+    """Calculate tax based on simplified SA tax brackets (2024)"""
+    income = Decimal(str(annual_income))
+    tax = Decimal('0')
+
+    # Tax brackets (simplified for demonstration)
+    if income <= 237100:
+        tax = income * Decimal('0.18')
+    elif income <= 370500:
+        tax = Decimal('42678') + (income - Decimal('237100')) * Decimal('0.26')
+    elif income <= 512800:
+        tax = Decimal('77362') + (income - Decimal('370500')) * Decimal('0.31')
+    elif income <= 673000:
+        tax = Decimal('121475') + (income - Decimal('512800')) * Decimal('0.36')
+    elif income <= 857900:
+        tax = Decimal('179147') + (income - Decimal('673000')) * Decimal('0.39')
+    else:
+        tax = Decimal('251258') + (income - Decimal('857900')) * Decimal('0.41')
+
+    return float(tax)
+
+
+def period_tax(amount, granularity):
+    """
+    Estimated tax on `amount` earned in one month/day.
+
+    The brackets are annual, so the period is annualized at its own rate and
+    the yearly tax is split back to one period.
+    """
+    if not amount or amount <= 0:
+        return 0
+    periods = PERIODS_PER_YEAR[granularity]
+    return round(calculate_tax(Decimal(amount) * periods) / periods, 2)
+
+
+def bucket_start(day, granularity):
+    """First day of the month/day bucket containing `day` (a date or datetime)."""
+    if isinstance(day, datetime):
+        day = day.astimezone(dt_timezone.utc).date()
+    return day.replace(day=1) if granularity == MONTH else day
+
+
+def next_bucket(start, granularity):
+    """Start of the bucket after the one starting at `start`."""
+    if granularity == DAY:
+        return start + timedelta(days=1)
+    return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def months_before(start, months):
+    """First day of the month `months` months before the month of `start`."""
+    index = start.year * 12 + start.month - 1 - months
+    return start.replace(year=index // 12, month=index % 12 + 1, day=1)
+
+
+def _source(role, apps=None):
+    """
+    Completed-order rows counted for `role`, with their user and date fields.
+
+    Returns:
+        tuple: (queryset, user field, completion datetime field, amount aggregate, order-count aggregate)
+    """
+    apps = apps or global_apps
+    if role == FREELANCER:
+        OrderItem = apps.get_model('Order', 'OrderItem')
+        return (
+            OrderItem.objects.filter(order__status=COMPLETED), 'freelancer_id', 'order__completed_at',
+            Sum('final_price'), Count('order', distinct=True),
+        )
+    Order = apps.get_model('Order', 'Order')
+    return Order.objects.filter(status=COMPLETED), 'client_id', 'completed_at', Sum('total_amount'), Count('pk')
+
+
+def refresh_buckets(role, user_ids, day):
+    """Recompute the `role` month and day buckets containing `day` for `user_ids`."""
+    queryset, user_field, date_field, amount, orders = _source(role)
+    for granularity in TRUNC_KINDS:
+        start = bucket_start(day, granularity)
+        lower = datetime.combine(start, time.min, tzinfo=dt_timezone.utc)
+        upper = datetime.combine(next_bucket(start, granularity), time.min, tzinfo=dt_timezone.utc)
+        totals = {
+            user_id: (total, count)
+            for user_id, total, count in queryset.filter(**{
+                f'{user_field}__in': user_ids, f'{date_field}__gte': lower, f'{date_field}__lt': upper,
+            }).order_by().values_list(user_field).annotate(total=amount, orders=orders)
+        }
+        buckets = EarningsBucket.objects.filter(role=role, granularity=granularity, bucket_start=start)
+        buckets.filter(user_id__in=set(user_ids) - totals.keys()).delete()
+        for user_id, (total, count) in totals.items():
+            buckets.update_or_create(
+                user_id=user_id, role=role, granularity=granularity, bucket_start=start,
+                defaults={'amount': total or 0, 'order_count': count},
+            )
+
+
+def schedule_bucket_refresh(role, user_ids, completed_at):
+    """Refresh the `role` buckets of `user_ids` around `completed_at` when the transaction commits."""
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if completed_at is None or not user_ids:
+        return
+    collect_on_commit('_earnings_refresh', _run_scheduled, {(role, bucket_start(completed_at, DAY)): user_ids})
+
+
+def _run_scheduled(pending):
+    for (role, day), user_ids in pending.items():
+        refresh_buckets(role, user_ids, day)
+
+
+def rebuild_buckets(apps=None):
+    """
+    Recompute every EarningsBucket from the completed orders.
+
+    Args:
+        apps: Model registry (the migration passes its historical apps)
+
+    Returns:
+        int: Number of buckets written
+    """
+    apps = apps or global_apps
+    Bucket = apps.get_model('dashboard', 'EarningsBucket')
+    buckets = []
+    for role in (FREELANCER, CLIENT):
+        queryset, user_field, date_field, amount, orders = _source(role, apps)
+        for granularity, kind in TRUNC_KINDS.items():
+            rows = queryset.filter(**{f'{date_field}__isnull': False}).annotate(
+                bucket=Trunc(date_field, kind, output_field=DateField(), tzinfo=dt_timezone.utc)
+            ).order_by().values_list(user_field, 'bucket').annotate(total=amount, orders=orders)
+            buckets.extend(
+                Bucket(
+                    user_id=user_id, role=role, granularity=granularity, bucket_start=start,
+                    amount=total or 0, order_count=count,
+                )
+                for user_id, start, total, count in rows
+            )
+    with transaction.atomic():
+        Bucket.objects.all().delete()
+        Bucket.objects.bulk_create(buckets, batch_size=1000)
+    return len(buckets)
+
+
+def earnings_series(user, role, granularity, start, end):
+    """
+    Totals per bucket for `user` in [start, end), zero-filled for charts.
+
+    Args:
+        user (User): Whose buckets
+        role (str): FREELANCER (earnings) or CLIENT (spend)
+        granularity (str): EarningsBucket.Granularity value
+        start (date): Inclusive lower bound (floored to a bucket)
+        end (date): Exclusive upper bound
+
+    Returns:
+        list[dict]: [{"bucket": date, "amount": Decimal, "orders": int}, ...] in ascending order
+    """
+    start = bucket_start(start, granularity)
+    found = {
+        row[0]: row[1:]
+        for row in EarningsBucket.objects.filter(
+            user=user, role=role, granularity=granularity, bucket_start__gte=start, bucket_start__lt=end,
+        ).values_list('bucket_start', 'amount', 'order_count')
+    }
+    series = []
+    bucket = start
+    while bucket < end:
+        amount, orders = found.get(bucket, (Decimal('0'), 0))
+        series.append({'bucket': bucket, 'amount': amount, 'orders': orders})
+        bucket = next_bucket(bucket, granularity)
+    return series
+
+
+def current_bucket_amount(user, role, granularity, today):
+    """The `user`'s total in the bucket containing `today`; one lookup."""
+    amount = EarningsBucket.objects.filter(
+        user=user, role=role, granularity=granularity, bucket_start=bucket_start(today, granularity),
+    ).values_list('amount', flat=True).first()
+    return amount or Decimal('0')
@@ -0,0 +1,33 @@
+"""
+Management command to recompute the stored dashboard snapshots and the
+earnings buckets.
+
+Both are refreshed by model signals (dashboard/signals.py); run this after
+bulk changes that bypass them (QuerySet.update, bulk_create, raw SQL) or to
+repair drift. Only users who have opened a dashboard have a snapshot.
+
+Usage: python manage.py rebuild_dashboards [--role FREELANCER|CLIENT]
+"""
+
+from django.core.management.base import BaseCommand
+
+from dashboard.models import DashboardSnapshot
+from dashboard.earnings import rebuild_buckets
+from dashboard.snapshots import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the stored freelancer and client dashboard snapshots and earnings buckets'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--role', choices=DashboardSnapshot.Role.values, help='Only rebuild this dashboard')
+        parser.add_argument('--batch-size', type=int, default=500, help='Users recomputed per batch')
+        parser.add_argument('--skip-buckets', action='store_true', help='Leave the earnings buckets as they are')
+
+    def handle(self, *args, **options):
+        roles = [options['role']] if options['role'] else None
+        snapshots = rebuild(roles, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {snapshots} dashboard snapshots'))
+        if not options['skip_buckets']:
+            buckets = rebuild_buckets()
+            self.stdout.write(self.style.SUCCESS(f'Rebuilt {buckets} earnings buckets'))
@@ -0,0 +1,44 @@
+# Generated by Django 5.0.4 on 2026-10-17 04:45
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('FREELANCER', 'Freelancer'), ('CLIENT', 'Client')], max_length=10)),
+                ('total_earnings', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=12)),
+                ('total_spent', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=12)),
+                ('active_projects', models.IntegerField(default=0)),
+                ('concluded_projects', models.IntegerField(default=0)),
+                ('total_orders', models.IntegerField(default=0)),
+                ('freelancers_hired', models.IntegerField(default=0)),
+                ('recent_transactions', models.JSONField(default=list)),
+                ('total_conversations', models.IntegerField(default=0)),
+                ('replied_conversations', models.IntegerField(default=0)),
+                ('total_impressions', models.IntegerField(default=0)),
+                ('recent_proposals', models.JSONField(default=list)),
+                ('proposals_received', models.IntegerField(default=0)),
+                ('open_projects', models.IntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dashboard_snapshots', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='dashboardsnapshot',
+            constraint=models.UniqueConstraint(fields=('user', 'role'), name='unique_dashboard_snapshot'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.0.4 on 2026-10-17 04:50
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    from dashboard.earnings import rebuild_buckets
+    rebuild_buckets(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Order', '0004_order_completed_at'),
+        ('dashboard', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EarningsBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('FREELANCER', 'Freelancer'), ('CLIENT', 'Client')], max_length=10)),
+                ('granularity', models.CharField(choices=[('MONTH', 'Month'), ('DAY', 'Day')], max_length=5)),
+                ('bucket_start', models.DateField(help_text='First day (UTC) of the month/day this bucket covers')),
+                ('amount', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=12)),
+                ('order_count', models.PositiveIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='earnings_buckets', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='earningsbucket',
+            constraint=models.UniqueConstraint(fields=('user', 'role', 'granularity', 'bucket_start'), name='unique_earnings_bucket'),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,82 @@
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import models
+
+
+class DashboardSnapshot(models.Model):
+    """
+    Precomputed dashboard figures for one user in one role.
+
+    Created the first time the dashboard is opened, then kept current by
+    model signals that recompute only the affected sections for the affected
+    users (dashboard/snapshots.py). `rebuild_dashboards` recomputes them in bulk.
+    """
+    class Role(models.TextChoices):
+        FREELANCER = 'FREELANCER', 'Freelancer'
+        CLIENT = 'CLIENT', 'Client'
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='dashboard_snapshots')
+    role = models.CharField(max_length=10, choices=Role.choices)
+
+    # Orders (freelancer: order items sold; client: orders placed)
+    total_earnings = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0'))
+    total_spent = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0'))
+    active_projects = models.IntegerField(default=0)
+    concluded_projects = models.IntegerField(default=0)
+    total_orders = models.IntegerField(default=0)
+    freelancers_hired = models.IntegerField(default=0)
+    recent_transactions = models.JSONField(default=list)
+
+    # Freelancer: conversations and replies (response rate), project views
+    total_conversations = models.IntegerField(default=0)
+    replied_conversations = models.IntegerField(default=0)
+    total_impressions = models.IntegerField(default=0)
+
+    # Proposals (freelancer: latest submitted; client: received) and open projects
+    recent_proposals = models.JSONField(default=list)
+    proposals_received = models.IntegerField(default=0)
+    open_projects = models.IntegerField(default=0)
+
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'role'], name='unique_dashboard_snapshot'),
+        ]
+
+    def __str__(self):
+        return f'{self.get_role_display()} dashboard of user {self.user_id}'
+
+
+class EarningsBucket(models.Model):
+    """
+    Completed-order totals per user, role and month/day (UTC).
+
+    FREELANCER buckets hold earnings (order items sold), CLIENT buckets hold
+    spend (orders placed), both dated by Order.completed_at. Order signals
+    recompute the buckets an order falls in (dashboard/earnings.py), so the
+    time series and the monthly tax estimate read a handful of rows however
+    long the user's history is.
+    """
+    class Granularity(models.TextChoices):
+        MONTH = 'MONTH', 'Month'
+        DAY = 'DAY', 'Day'
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='earnings_buckets')
+    role = models.CharField(max_length=10, choices=DashboardSnapshot.Role.choices)
+    granularity = models.CharField(max_length=5, choices=Granularity.choices)
+    bucket_start = models.DateField(help_text="First day (UTC) of the month/day this bucket covers")
+    amount = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0'))
+    order_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'role', 'granularity', 'bucket_start'],
+                name='unique_earnings_bucket',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.role} {self.granularity} {self.bucket_start}: {self.amount}"
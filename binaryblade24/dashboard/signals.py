@@ -0,0 +1,86 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from message.models import Conversation, Message
+from Order.models import Order, OrderItem
+from Project.analytics import rollups_landed
+from Project.models import Project
+from Proposal.models import Proposal
+from .earnings import schedule_bucket_refresh
+from .snapshots import CLIENT, FREELANCER, schedule_refresh
+
+
+@receiver(post_save, sender=Order)
+@receiver(post_delete, sender=Order)
+def refresh_order_dashboards(sender, instance, raw=False, **kwargs):
+    """An order's status or total changed: its client and the freelancers on its items, and their buckets."""
+    if raw:
+        return
+    freelancer_ids = set(instance.items.values_list('freelancer_id', flat=True))
+    schedule_refresh(CLIENT, [instance.client_id], 'orders')
+    schedule_refresh(FREELANCER, freelancer_ids, 'orders')
+    schedule_bucket_refresh(CLIENT, [instance.client_id], instance.completed_at)
+    schedule_bucket_refresh(FREELANCER, freelancer_ids, instance.completed_at)
+
+
+@receiver(post_save, sender=OrderItem)
+@receiver(post_delete, sender=OrderItem)
+def refresh_order_item_dashboards(sender, instance, raw=False, **kwargs):
+    """An item was sold or removed: the freelancer's earnings and the client's hires."""
+    if raw:
+        return
+    schedule_refresh(FREELANCER, [instance.freelancer_id], 'orders')
+    order = Order.objects.filter(pk=instance.order_id).values('client_id', 'completed_at').first()
+    if order is not None:
+        schedule_refresh(CLIENT, [order['client_id']], 'orders')
+        schedule_bucket_refresh(FREELANCER, [instance.freelancer_id], order['completed_at'])
+
+
+@receiver(post_save, sender=Proposal)
+@receiver(post_delete, sender=Proposal)
+def refresh_proposal_dashboards(sender, instance, raw=False, created=True, **kwargs):
+    """The freelancer's recent proposals; the project owner's count when one is added or removed."""
+    if raw:
+        return
+    schedule_refresh(FREELANCER, [instance.freelancer_id], 'proposals')
+    if created:
+        schedule_refresh(
+            CLIENT, Project.objects.filter(pk=instance.project_id).values_list('client_id', flat=True), 'proposals'
+        )
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def refresh_project_dashboards(sender, instance, raw=False, **kwargs):
+    """The owner's open projects."""
+    if raw:
+        return
+    schedule_refresh(CLIENT, [instance.client_id], 'projects')
+
+
+@receiver(post_save, sender=Conversation)
+@receiver(post_delete, sender=Conversation)
+def refresh_conversation_dashboards(sender, instance, raw=False, created=True, **kwargs):
+    """Both participants' conversation counts."""
+    if raw or not created:
+        return
+    schedule_refresh(FREELANCER, [instance.participant_1_id, instance.participant_2_id], 'conversations')
+
+
+@receiver(post_save, sender=Message)
+@receiver(post_delete, sender=Message)
+def refresh_message_dashboards(sender, instance, raw=False, created=True, **kwargs):
+    """A first (or last) reply changes the sender's response rate."""
+    if raw or not created:
+        return
+    schedule_refresh(FREELANCER, [instance.sender_id], 'conversations')
+
+
+@receiver(rollups_landed)
+def refresh_impression_dashboards(sender, project_ids, **kwargs):
+    """New views were rolled up: the owners' impressions."""
+    schedule_refresh(
+        FREELANCER,
+        Project.objects.filter(pk__in=project_ids).values_list('client_id', flat=True).distinct(),
+        'impressions',
+    )
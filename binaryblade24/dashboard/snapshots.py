@@ -0,0 +1,301 @@
+"""
+Dashboard snapshots: compute, store and refresh the dashboard figures.
+
+Each dashboard is split into sections. A section is computed for many users
+at once with grouped queries, so the same code serves a single refresh and
+the bulk rebuild:
+
+    FREELANCER  orders         total_earnings, active/concluded_projects, total_orders
+                conversations  total_conversations, replied_conversations
+                impressions    total_impressions
+                proposals      recent_proposals (latest 3)
+    CLIENT      orders         total_spent, active/concluded_projects,
+                               freelancers_hired, recent_transactions (latest 5)
+                projects       open_projects
+                proposals      proposals_received
+
+get_snapshot() creates the snapshot the first time a dashboard is opened
+(or recomputes it for ?fresh=1). Afterwards the model signals in
+dashboard/signals.py call schedule_refresh() with the users and sections a
+change touches; the recompute runs once per transaction, on commit, and
+only for users that already have a snapshot.
+"""
+from collections import defaultdict
+
+from django.db import connection, transaction
+from django.db.models import Count, Exists, F, OuterRef, Q, Sum, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from .models import DashboardSnapshot
+
+FREELANCER = DashboardSnapshot.Role.FREELANCER
+CLIENT = DashboardSnapshot.Role.CLIENT
+
+ACTIVE_ORDER_STATUSES = ('PENDING', 'PAID')
+COMPLETED = 'COMPLETED'
+RECENT_PROPOSALS = 3
+RECENT_TRANSACTIONS = 5
+
+
+def _recent(queryset, partition, order_by, limit):
+    """The latest `limit` rows of `queryset` per `partition`, newest first."""
+    return queryset.annotate(
+        rank=Window(RowNumber(), partition_by=F(partition), order_by=[F(order_by).desc(), F('pk').desc()])
+    ).filter(rank__lte=limit).order_by(partition, 'rank')
+
+
+def _freelancer_orders(user_ids):
+    from Order.models import OrderItem
+
+    completed = Q(order__status=COMPLETED)
+    rows = OrderItem.objects.filter(freelancer_id__in=user_ids).order_by().values('freelancer_id').annotate(
+        total_earnings=Sum('final_price', filter=completed),
+        active_projects=Count('pk', filter=Q(order__status__in=ACTIVE_ORDER_STATUSES)),
+        concluded_projects=Count('pk', filter=completed),
+        total_orders=Count('pk'),
+    )
+    values = {}
+    for row in rows:
+        user_id = row.pop('freelancer_id')
+        row['total_earnings'] = row['total_earnings'] or 0
+        values[user_id] = row
+    return values
+
+
+def _freelancer_conversations(user_ids):
+    from message.models import Conversation, Message
+
+    values = defaultdict(lambda: {'total_conversations': 0, 'replied_conversations': 0})
+    for participant in ('participant_1', 'participant_2'):
+        rows = Conversation.objects.filter(**{f'{participant}_id__in': user_ids}).order_by().values_list(
+            f'{participant}_id'
+        ).annotate(
+            total=Count('pk'),
+            replied=Count('pk', filter=Exists(
+                Message.objects.filter(conversation=OuterRef('pk'), sender=OuterRef(participant))
+            )),
+        )
+        for user_id, total, replied in rows:
+            values[user_id]['total_conversations'] += total
+            values[user_id]['replied_conversations'] += replied
+    return values
+
+
+def _freelancer_impressions(user_ids):
+    from Project.analytics import owner_view_totals
+
+    return {user_id: {'total_impressions': views} for user_id, views in owner_view_totals(user_ids).items()}
+
+
+def _freelancer_proposals(user_ids):
+    from Proposal.models import Proposal
+
+    values = defaultdict(lambda: {'recent_proposals': []})
+    rows = _recent(
+        Proposal.objects.filter(freelancer_id__in=user_ids), 'freelancer_id', 'created_at', RECENT_PROPOSALS
+    ).values_list('freelancer_id', 'project__title', 'status', 'created_at')
+    for user_id, title, proposal_status, created_at in rows:
+        values[user_id]['recent_proposals'].append({
+            'title': title,
+            'status': proposal_status,
+            'date': created_at.strftime('%Y-%m-%d'),
+        })
+    return values
+
+
+def _client_orders(user_ids):
+    from Order.models import Order, OrderItem
+
+    completed = Q(status=COMPLETED)
+    values = defaultdict(lambda: {'freelancers_hired': 0, 'recent_transactions': []})
+    rows = Order.objects.filter(client_id__in=user_ids).order_by().values('client_id').annotate(
+        total_spent=Sum('total_amount', filter=completed),
+        active_projects=Count('pk', filter=Q(status__in=ACTIVE_ORDER_STATUSES)),
+        concluded_projects=Count('pk', filter=completed),
+    )
+    for row in rows:
+        row['total_spent'] = row['total_spent'] or 0
+        values[row.pop('client_id')].update(row)
+
+    hired = OrderItem.objects.filter(order__client_id__in=user_ids).order_by().values_list(
+        'order__client_id'
+    ).annotate(freelancers=Count('freelancer', distinct=True))
+    for user_id, freelancers in hired:
+        values[user_id]['freelancers_hired'] = freelancers
+
+    recent = _recent(
+        Order.objects.filter(client_id__in=user_ids), 'client_id', 'created_at', RECENT_TRANSACTIONS
+    ).values_list('client_id', 'id', 'total_amount', 'order_number', 'created_at')
+    for user_id, order_id, amount, order_number, created_at in recent:
+        values[user_id]['recent_transactions'].append({
+            'id': order_id,
+            'amount': str(amount),
+            'project': f'Order #{order_number}',
+            'date': created_at.strftime('%Y-%m-%d'),
+        })
+    return values
+
+
+def _client_projects(user_ids):
+    from Project.models import Project
+
+    rows = Project.objects.filter(
+        client_id__in=user_ids, status=Project.ProjectStatus.OPEN
+    ).order_by().values_list('client_id').annotate(open_projects=Count('pk'))
+    return {user_id: {'open_projects': count} for user_id, count in rows}
+
+
+def _client_proposals(user_ids):
+    from Proposal.models import Proposal
+
+    rows = Proposal.objects.filter(project__client_id__in=user_ids).order_by().values_list(
+        'project__client_id'
+    ).annotate(proposals_received=Count('pk'))
+    return {user_id: {'proposals_received': count} for user_id, count in rows}
+
+
+# role -> section -> (compute function, snapshot fields it fills)
+SECTIONS = {
+    FREELANCER: {
+        'orders': (_freelancer_orders, ('total_earnings', 'active_projects', 'concluded_projects', 'total_orders')),
+        'conversations': (_freelancer_conversations, ('total_conversations', 'replied_conversations')),
+        'impressions': (_freelancer_impressions, ('total_impressions',)),
+        'proposals': (_freelancer_proposals, ('recent_proposals',)),
+    },
+    CLIENT: {
+        'orders': (_client_orders, (
+            'total_spent', 'active_projects', 'concluded_projects', 'freelancers_hired', 'recent_transactions',
+        )),
+        'projects': (_client_projects, ('open_projects',)),
+        'proposals': (_client_proposals, ('proposals_received',)),
+    },
+}
+
+
+def compute(role, user_ids, sections=None):
+    """
+    Snapshot values of `sections` (default: all) for every user in `user_ids`.
+
+    Users without activity in a section get the field defaults.
+
+    Returns:
+        dict: {user_id: {field: value}}
+    """
+    user_ids = list(user_ids)
+    values = {user_id: {} for user_id in user_ids}
+    for name in sections or SECTIONS[role]:
+        func, fields = SECTIONS[role][name]
+        found = func(user_ids)
+        for user_id in user_ids:
+            values[user_id].update({field: DashboardSnapshot._meta.get_field(field).get_default() for field in fields})
+            values[user_id].update(found.get(user_id, {}))
+    return values
+
+
+def get_snapshot(user, role, fresh=False):
+    """
+    The stored `role` dashboard of `user`, computed when missing or `fresh`.
+
+    The stored read is one query, with the user and profile joined.
+    """
+    snapshot = None
+    if not fresh:
+        snapshot = DashboardSnapshot.objects.select_related('user__profile').filter(user=user, role=role).first()
+    if snapshot is None:
+        snapshot, _ = DashboardSnapshot.objects.update_or_create(
+            user=user, role=role, defaults=compute(role, [user.pk])[user.pk]
+        )
+    return snapshot
+
+
+def refresh(role, user_ids, sections=None):
+    """
+    Recompute `sections` of the existing `role` snapshots of `user_ids`.
+
+    Returns:
+        int: Number of snapshots refreshed
+    """
+    existing = list(DashboardSnapshot.objects.filter(user_id__in=user_ids, role=role).values_list('user_id', flat=True))
+    if not existing:
+        return 0
+    now = timezone.now()
+    for user_id, values in compute(role, existing, sections).items():
+        DashboardSnapshot.objects.filter(user_id=user_id, role=role).update(**values, refreshed_at=now)
+    return len(existing)
+
+
+def collect_on_commit(name, flush, requests):
+    """
+    Add `requests` ({key: ids}) to the pending requests `name` of the current transaction.
+
+    On commit `flush(pending)` runs once with everything collected, so a
+    change that fires several signals does its follow-up work once. Outside
+    a transaction (autocommit) it runs right away.
+    """
+    pending = connection.__dict__.setdefault(name, defaultdict(set))
+    for key, ids in requests.items():
+        pending[key].update(ids)
+    # Registered on every call, after adding: in autocommit on_commit runs
+    # the callback immediately, and a callback dropped by a rollback must
+    # not leave the requests of the next transaction without one. Later
+    # ones find nothing left to do.
+    transaction.on_commit(lambda: _flush_pending(name, flush))
+
+
+def _flush_pending(name, flush):
+    pending = connection.__dict__.pop(name, None)
+    if pending:
+        flush(pending)
+
+
+def schedule_refresh(role, user_ids, *sections):
+    """
+    Refresh `sections` of the `role` snapshots of `user_ids` when the transaction commits.
+
+    Requests made during one transaction are merged, so each section is
+    recomputed once per user.
+    """
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if not user_ids:
+        return
+    collect_on_commit('_dashboard_refresh', _run_scheduled, {(role, section): user_ids for section in sections})
+
+
+def _run_scheduled(pending):
+    by_users = defaultdict(list)
+    for (role, section), user_ids in pending.items():
+        by_users[(role, frozenset(user_ids))].append(section)
+    for (role, user_ids), sections in by_users.items():
+        refresh(role, user_ids, sections)
+
+
+def rebuild(roles=None, batch_size=500):
+    """
+    Recompute every stored snapshot of `roles` (default: both), `batch_size` users at a time.
+
+    Repairs drift from changes that bypass model signals (QuerySet.update,
+    bulk_create, raw SQL).
+
+    Returns:
+        int: Number of snapshots rebuilt
+    """
+    rebuilt = 0
+    now = timezone.now()
+    for role in roles or SECTIONS:
+        fields = [field for _, section_fields in SECTIONS[role].values() for field in section_fields]
+        snapshots = DashboardSnapshot.objects.filter(role=role).order_by('pk')
+        last_pk = 0
+        while True:
+            batch = list(snapshots.filter(pk__gt=last_pk).only('pk', 'user_id')[:batch_size])
+            if not batch:
+                break
+            values = compute(role, [snapshot.user_id for snapshot in batch])
+            for snapshot in batch:
+                for field, value in values[snapshot.user_id].items():
+                    setattr(snapshot, field, value)
+                snapshot.refreshed_at = now
+            DashboardSnapshot.objects.bulk_update(batch, fields + ['refreshed_at'])
+            rebuilt += len(batch)
+            last_pk = batch[-1].pk
+    return rebuilt
@@ -0,0 +1,353 @@
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from rest_framework import status
+from django.test import TransactionTestCase
+from rest_framework.test import APIClient, APITestCase
+
+from dashboard.earnings import rebuild_buckets
+from dashboard.models import DashboardSnapshot, EarningsBucket
+from message.models import Conversation, Message
+from Order.models import Escrow, Order, OrderItem
+from Project.models import Category, Project, ProjectView
+from Proposal.models import Proposal
+
+User = get_user_model()
+
+
+class FreelancerDashboardTests(APITestCase):
+    """
+    The freelancer dashboard costs a fixed number of queries and is served from its snapshot.
+    """
+
+    def setUp(self):
+        self.freelancer = User.objects.create_user(
+            username='freelancer', email='freelancer@example.com', password='password123',
+            country_origin='US', identity_number='freelancer-id'
+        )
+        self.category = Category.objects.create(name='Design', slug='design')
+        self.gig = Project.objects.create(
+            title='Logo gig', description='Description', budget=100, price=100,
+            category=self.category, client=self.freelancer,
+        )
+        self.url = reverse('dashboard_api:freelancer-dashboard')
+        self.client.force_authenticate(user=self.freelancer)
+        self.buyers = 0
+
+    def _add_activity(self, count):
+        """`count` orders (alternating completed / paid) and conversations (every other one answered)."""
+        for i in range(count):
+            self.buyers += 1
+            buyer = User.objects.create_user(
+                username=f'buyer{self.buyers}', email=f'buyer{self.buyers}@example.com', password='password123',
+                country_origin='US', identity_number=f'buyer-{self.buyers}'
+            )
+            order = Order.objects.create(client=buyer, total_amount=0, status='COMPLETED' if i % 2 == 0 else 'PAID')
+            OrderItem.objects.create(order=order, project=self.gig, tier='SIMPLE', base_price=100, freelancer=self.freelancer)
+            conversation = Conversation.objects.create(project=self.gig, participant_1=buyer, participant_2=self.freelancer)
+            Message.objects.create(conversation=conversation, sender=buyer, body='Hi')
+            if i % 2 == 0:
+                Message.objects.create(conversation=conversation, sender=self.freelancer, body='Hello')
+            ProjectView.objects.create(project=self.gig, ip_address=f'10.0.0.{self.buyers}')
+            job = Project.objects.create(
+                title=f'Job {self.buyers}', description='Description', budget=100, price=100,
+                category=self.category, client=buyer,
+            )
+            Proposal.objects.create(project=job, freelancer=self.freelancer, bid_amount=100)
+
+    def _get(self, fresh=False):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, {'fresh': 1} if fresh else {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, len(ctx.captured_queries)
+
+    def test_query_count_is_fixed(self):
+        self._add_activity(2)
+        _, few = self._get(fresh=True)
+        self._add_activity(8)
+        response, many = self._get(fresh=True)
+        self.assertEqual(few, many)
+        self.assertLessEqual(many, 12)  # Five section queries, the upsert, the profile and this month's bucket
+
+        self.assertEqual(response.data['total_orders'], 10)
+        self.assertEqual(response.data['concluded_projects'], 5)  # 1 + 4 completed
+        self.assertEqual(response.data['active_projects'], 5)
+        self.assertEqual(response.data['total_earnings'], Decimal('500.00'))
+        self.assertEqual(response.data['response_rate'], '50%')
+        self.assertEqual(response.data['total_impressions'], 10)
+        self.assertEqual(len(response.data['recent_proposals']), 3)
+
+    def test_empty_dashboard(self):
+        response, _ = self._get()
+        self.assertEqual(response.data['total_orders'], 0)
+        self.assertEqual(response.data['total_earnings'], 0)
+        self.assertEqual(response.data['response_rate'], 'N/A')
+        self.assertEqual(response.data['total_impressions'], 0)
+
+    def test_snapshot_read_is_two_queries(self):
+        self._add_activity(3)
+        self._get()
+        response, queries = self._get()
+        self.assertEqual(queries, 2)  # The snapshot and this month's earnings bucket
+        self.assertEqual(response.data['total_orders'], 3)
+
+    def test_changes_refresh_the_snapshot_on_commit(self):
+        self._add_activity(2)
+        self._get()
+        with self.captureOnCommitCallbacks(execute=True):
+            self._add_activity(2)
+        response, _ = self._get()
+        self.assertEqual(response.data['total_orders'], 4)
+        self.assertEqual(response.data['concluded_projects'], 2)
+        self.assertEqual(response.data['response_rate'], '50%')
+        self.assertEqual(len(response.data['recent_proposals']), 3)
+        self.assertEqual(response.data['recent_proposals'][0]['title'], 'Job 4')
+
+        # Views reach the dashboard when they are rolled up
+        self.assertEqual(response.data['total_impressions'], 2)
+        with self.captureOnCommitCallbacks(execute=True), override_settings(PROJECT_VIEW_ROLLUP_GRACE=0):
+            call_command('rollup_project_views', stdout=StringIO())
+        self.assertEqual(self._get()[0].data['total_impressions'], 4)
+
+    def test_rebuild_command_repairs_drift(self):
+        self._add_activity(2)
+        self._get()
+        DashboardSnapshot.objects.update(total_orders=99, recent_proposals=[])
+
+        out = StringIO()
+        call_command('rebuild_dashboards', stdout=out)
+        self.assertIn('1', out.getvalue())
+        response, _ = self._get()
+        self.assertEqual(response.data['total_orders'], 2)
+        self.assertEqual(len(response.data['recent_proposals']), 2)
+
+
+class ClientDashboardTests(APITestCase):
+    """
+    The client dashboard is built from its snapshot and follows order and proposal changes.
+    """
+
+    def setUp(self):
+        self.buyer = User.objects.create_user(
+            username='buyer', email='buyer@example.com', password='password123',
+            country_origin='US', identity_number='buyer-id'
+        )
+        self.freelancer = User.objects.create_user(
+            username='freelancer', email='freelancer@example.com', password='password123',
+            country_origin='US', identity_number='freelancer-id'
+        )
+        category = Category.objects.create(name='Design', slug='design')
+        self.gig = Project.objects.create(
+            title='Logo gig', description='Description', budget=100, price=100,
+            category=category, client=self.freelancer,
+        )
+        self.job = Project.objects.create(
+            title='Website job', description='Description', budget=100, price=100,
+            category=category, client=self.buyer, status=Project.ProjectStatus.OPEN,
+        )
+        self.url = reverse('dashboard_api:client-dashboard')
+        self.client.force_authenticate(user=self.buyer)
+
+    def _order(self, order_status):
+        order = Order.objects.create(client=self.buyer, total_amount=100, status=order_status)
+        OrderItem.objects.create(order=order, project=self.gig, tier='SIMPLE', base_price=100, freelancer=self.freelancer)
+        return order
+
+    def test_dashboard_follows_changes(self):
+        self._order('COMPLETED')
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['completed_projects'], 1)
+        self.assertEqual(response.data['freelancers_hired'], 1)
+        self.assertEqual(response.data['open_projects'], 1)
+        self.assertEqual(response.data['proposals_received'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            order = self._order('PENDING')
+            Proposal.objects.create(project=self.job, freelancer=self.freelancer, bid_amount=100)
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['active_projects'], 1)
+        self.assertEqual(response.data['proposals_received'], 1)
+        self.assertEqual(len(response.data['recent_transactions']), 2)
+        self.assertEqual(response.data['recent_transactions'][0]['id'], order.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Order.objects.filter(pk=order.pk).update(status='COMPLETED')  # Bypasses the signals
+        self.assertEqual(self.client.get(self.url).data['active_projects'], 1)
+        response = self.client.get(self.url, {'fresh': 1})
+        self.assertEqual((response.data['active_projects'], response.data['completed_projects']), (0, 2))
+
+
+class EarningsBucketTests(APITestCase):
+    """
+    Earnings buckets follow order completion and back the time series and the monthly tax.
+    """
+
+    def setUp(self):
+        self.buyer = User.objects.create_user(
+            username='buyer', email='buyer@example.com', password='password123',
+            country_origin='US', identity_number='buyer-id'
+        )
+        self.freelancer = User.objects.create_user(
+            username='freelancer', email='freelancer@example.com', password='password123',
+            country_origin='US', identity_number='freelancer-id'
+        )
+        category = Category.objects.create(name='Design', slug='design')
+        self.gig = Project.objects.create(
+            title='Logo gig', description='Description', budget=100, price=100,
+            category=category, client=self.freelancer,
+        )
+        self.url = reverse('dashboard_api:earnings-timeseries')
+        self.client.force_authenticate(user=self.freelancer)
+
+    def _order(self, completed_at, order_status='COMPLETED', price=100):
+        with self.captureOnCommitCallbacks(execute=True):
+            order = Order.objects.create(
+                client=self.buyer, total_amount=price, status=order_status, completed_at=completed_at,
+            )
+            OrderItem.objects.create(order=order, project=self.gig, tier='SIMPLE', base_price=price, freelancer=self.freelancer)
+        return order
+
+    def _buckets(self, role='FREELANCER', granularity='MONTH'):
+        return dict(EarningsBucket.objects.filter(
+            user=self.freelancer if role == 'FREELANCER' else self.buyer, role=role, granularity=granularity,
+        ).values_list('bucket_start', 'amount'))
+
+    def test_completion_and_refund_update_buckets(self):
+        january = datetime(2026, 1, 15, 12, tzinfo=dt_timezone.utc)
+        self._order(january)
+        order = self._order(january.replace(day=20))
+        self._order(None, order_status='PAID')
+        self.assertEqual(self._buckets(), {january.date().replace(day=1): Decimal('200.00')})
+        self.assertEqual(self._buckets('CLIENT'), {january.date().replace(day=1): Decimal('200.00')})
+        self.assertEqual(len(self._buckets(granularity='DAY')), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            order.status = 'REFUNDED'
+            order.save()
+        self.assertEqual(self._buckets(), {january.date().replace(day=1): Decimal('100.00')})
+        self.assertEqual(list(self._buckets(granularity='DAY')), [january.date()])
+
+        expected = set(EarningsBucket.objects.values_list('user', 'role', 'granularity', 'bucket_start', 'amount'))
+        rebuild_buckets()
+        self.assertEqual(set(EarningsBucket.objects.values_list('user', 'role', 'granularity', 'bucket_start', 'amount')), expected)
+
+    def test_completing_sets_completed_at(self):
+        order = self._order(None, order_status='PAID')
+        with self.captureOnCommitCallbacks(execute=True):
+            order.status = 'COMPLETED'
+            order.save(update_fields=['status'])
+        order.refresh_from_db()
+        self.assertIsNotNone(order.completed_at)
+        self.assertEqual(sum(self._buckets().values()), Decimal('100.00'))
+
+    def test_timeseries_cost_does_not_depend_on_history(self):
+        self._order(datetime(2026, 2, 3, tzinfo=dt_timezone.utc), price=30000)
+        params = {'granularity': 'month', 'start': '2026-01-01', 'end': '2026-03-31'}
+        with CaptureQueriesContext(connection) as few:
+            response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([point['amount'] for point in response.data['series']], [0, Decimal('30000.00'), 0])
+        self.assertEqual(response.data['orders'], 1)
+        # 30000 a month is 360000 a year: (42678 + 122900 * 0.26) / 12
+        self.assertEqual(response.data['series'][1]['estimated_tax'], 6219.33)
+        self.assertEqual(response.data['estimated_tax'], 6219.33)
+
+        for day in range(1, 11):
+            self._order(datetime(2025, 6, day, tzinfo=dt_timezone.utc))
+        with CaptureQueriesContext(connection) as many:
+            self.client.get(self.url, params)
+        self.assertEqual(len(few), len(many))
+
+        response = self.client.get(self.url, {'granularity': 'day', 'start': '2025-06-01', 'end': '2025-06-30'})
+        self.assertEqual(len(response.data['series']), 30)
+        self.assertEqual(response.data['total'], Decimal('1000.00'))
+
+        response = self.client.get(self.url, {'role': 'client'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('estimated_tax', response.data)
+        self.assertEqual(len(response.data['series']), 12)
+
+    def test_default_month_range_ends_anywhere_in_a_month(self):
+        for end, first in (('2024-02-28', '2023-03-01'), ('2024-02-29', '2023-03-01'), ('2024-03-31', '2023-04-01')):
+            response = self.client.get(self.url, {'granularity': 'month', 'end': end})
+            self.assertEqual(response.status_code, status.HTTP_200_OK, end)
+            self.assertEqual(len(response.data['series']), 12)
+            self.assertEqual(str(response.data['series'][0]['bucket']), first)
+
+    def test_invalid_parameters(self):
+        for params in ({'granularity': 'week'}, {'role': 'admin'}, {'start': 'yesterday'},
+                       {'start': '2026-02-01', 'end': '2026-01-01'}, {'granularity': 'day', 'start': '2020-01-01'}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+
+
+class AutocommitRefreshTests(TransactionTestCase):
+    """
+    Writes outside a transaction (the views run in autocommit) refresh the snapshots right away.
+    """
+
+    def setUp(self):
+        self.buyer = User.objects.create_user(
+            username='buyer', email='buyer@example.com', password='password123',
+            country_origin='US', identity_number='buyer-id'
+        )
+        self.freelancer = User.objects.create_user(
+            username='freelancer', email='freelancer@example.com', password='password123',
+            country_origin='US', identity_number='freelancer-id'
+        )
+        self.category = Category.objects.create(name='Design', slug='design')
+        self.gig = Project.objects.create(
+            title='Logo gig', description='Description', budget=100, price=100,
+            category=self.category, client=self.freelancer,
+        )
+
+    def _dashboard(self, user, name):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        response = client.get(reverse(f'dashboard_api:{name}'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_plain_saves_refresh_snapshots(self):
+        self._dashboard(self.buyer, 'client-dashboard')
+        self._dashboard(self.freelancer, 'freelancer-dashboard')
+
+        job = Project.objects.create(
+            title='Website job', description='Description', budget=100, price=100,
+            category=self.category, client=self.buyer,
+        )
+        order = Order.objects.create(client=self.buyer, total_amount=100, status='PAID')
+        OrderItem.objects.create(order=order, project=self.gig, tier='SIMPLE', base_price=100, freelancer=self.freelancer)
+        conversation = Conversation.objects.create(project=self.gig, participant_1=self.buyer, participant_2=self.freelancer)
+        Message.objects.create(conversation=conversation, sender=self.freelancer, body='Hello')
+        Proposal.objects.create(project=job, freelancer=self.freelancer, bid_amount=100)
+
+        client_dashboard = self._dashboard(self.buyer, 'client-dashboard')
+        self.assertEqual(client_dashboard['open_projects'], 1)
+        self.assertEqual(client_dashboard['active_projects'], 1)
+        self.assertEqual(client_dashboard['proposals_received'], 1)
+        freelancer_dashboard = self._dashboard(self.freelancer, 'freelancer-dashboard')
+        self.assertEqual(freelancer_dashboard['total_orders'], 1)
+        self.assertEqual(freelancer_dashboard['response_rate'], '100%')
+        self.assertEqual(len(freelancer_dashboard['recent_proposals']), 1)
+
+    def test_completed_order_reaches_the_timeseries(self):
+        order = Order.objects.create(client=self.buyer, total_amount=100, status='PAID')
+        OrderItem.objects.create(order=order, project=self.gig, tier='SIMPLE', base_price=100, freelancer=self.freelancer)
+        Escrow.objects.create(order=order, amount=100)
+        self.assertTrue(order.approve_and_release_payment())
+
+        client = APIClient()
+        client.force_authenticate(user=self.freelancer)
+        response = client.get(reverse('dashboard_api:earnings-timeseries'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total'], Decimal('100.00'))
+        self.assertEqual(response.data['series'][-1]['amount'], Decimal('100.00'))
+        self.assertEqual(self._dashboard(self.freelancer, 'freelancer-dashboard')['month_earnings'], Decimal('100.00'))
@@ -1,11 +1,13 @@
 from django.urls import path
 
 app_name = 'dashboard'
-from .views import FreelancerDashboardAPIView, ClientDashboardAPIView, api_home
+from .views import FreelancerDashboardAPIView, ClientDashboardAPIView, EarningsTimeSeriesAPIView, CacheStatsAPIView, api_home
 
 urlpatterns = [
     path('', api_home, name='api-home'),
     path('freelancer/<int:user_id>/', FreelancerDashboardAPIView.as_view(), name='freelancer-dashboard-detail'),
     path('freelancer/', FreelancerDashboardAPIView.as_view(), name='freelancer-dashboard'),
     path('client/', ClientDashboardAPIView.as_view(), name='client-dashboard'),
+    path('timeseries/', EarningsTimeSeriesAPIView.as_view(), name='earnings-timeseries'),
+    path('cache-stats/', CacheStatsAPIView.as_view(), name='cache-stats'),
 ]
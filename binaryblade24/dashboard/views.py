@@ -1,21 +1,32 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework import status
-from django.db.models import Sum, Avg, Count, Q
 from django.shortcuts import render
 from django.urls import get_resolver
 # Models moved inside methods to avoid circular dependencies
 
+
+def wants_fresh(request):
+    """?fresh=1 recomputes the snapshot instead of reading the stored one."""
+    return request.query_params.get('fresh', '').lower() in ('1', 'true', 'yes')
+
+
 class FreelancerDashboardAPIView(APIView):
+    """
+    Freelancer dashboard, read from the user's DashboardSnapshot.
+
+    The snapshot is built on the first visit and refreshed when orders,
+    proposals, conversations or project views change (dashboard/snapshots.py).
+    ?fresh=1 recomputes it now.
+    """
     permission_classes = [IsAuthenticated]
 
     def get(self, request, user_id=None):
+        from django.utils import timezone
         from User.models import User
-        from Order.models import OrderItem
-        from Project.models import ProjectView
-        from Proposal.models import Proposal
-        from message.models import Conversation
+        from .earnings import MONTH, current_bucket_amount, period_tax
+        from .snapshots import FREELANCER, get_snapshot
         
         if user_id:
             # If user_id is provided, check if the requesting user is an admin
@@ -29,188 +40,194 @@ class FreelancerDashboardAPIView(APIView):
             # If no user_id, use the logged-in user
             freelancer = request.user
 
-        # Total Earnings (from completed order items)
-        total_earnings = OrderItem.objects.filter(
-            freelancer=freelancer,
-            order__status='COMPLETED'
-        ).aggregate(total=Sum('final_price'))['total'] or 0
+        snapshot = get_snapshot(freelancer, FREELANCER, fresh=wants_fresh(request))
+        total_earnings = snapshot.total_earnings or 0
 
         # Estimated Tax Calculation (Simplified South African Tax Brackets)
-        # Using progressive tax rates based on annual income
-        from decimal import Decimal
-        
-        def calculate_tax(annual_income):
-            """Calculate tax based on simplified SA tax brackets (2024)"""
-            income = Decimal(str(annual_income))
-            tax = Decimal('0')
-            
-            # Tax brackets (simplified for demonstration)
-            if income <= 237100:
-                tax = income * Decimal('0.18')
-            elif income <= 370500:
-                tax = Decimal('42678') + (income - Decimal('237100')) * Decimal('0.26')
-            elif income <= 512800:
-                tax = Decimal('77362') + (income - Decimal('370500')) * Decimal('0.31')
-            elif income <= 673000:
-                tax = Decimal('121475') + (income - Decimal('512800')) * Decimal('0.36')
-            elif income <= 857900:
-                tax = Decimal('179147') + (income - Decimal('673000')) * Decimal('0.39')
-            else:
-                tax = Decimal('251258') + (income - Decimal('857900')) * Decimal('0.41')
-            
-            return float(tax)
-        
-        estimated_tax = calculate_tax(total_earnings) if total_earnings > 0 else 0
-
-        # Active Projects (Orders in progress)
-        active_projects = OrderItem.objects.filter(
-            freelancer=freelancer,
-            order__status__in=['PENDING', 'PAID']
-        ).count()
-
-        # Concluded Projects (Completed orders)
-        concluded_projects = OrderItem.objects.filter(
-            freelancer=freelancer,
-            order__status='COMPLETED'
-        ).count()
-
-        # Total Orders (All items)
-        total_orders = OrderItem.objects.filter(
-            freelancer=freelancer
-        ).count()
+        # On this month's earnings (EarningsBucket), annualized for the brackets
+        month_earnings = current_bucket_amount(freelancer, FREELANCER, MONTH, timezone.now())
+        estimated_tax = period_tax(month_earnings, MONTH)
 
         # Achievement Rating
-        achievement_rating = freelancer.profile.rating or 0
+        achievement_rating = snapshot.user.profile.rating or 0
 
         # Response Rate Calculation
         # Definition: Percentage of conversations where the freelancer has replied
-        # 1. Get all conversations where the user is a participant
-        conversations = Conversation.objects.filter(
-            Q(participant_1=freelancer) | Q(participant_2=freelancer)
-        )
-        total_conversations = conversations.count()
-        
-        if total_conversations > 0:
-            # 2. significant conversations (where freelancer sent at least one message)
-            replied_count = 0
-            for convo in conversations:
-                if convo.messages.filter(sender=freelancer).exists():
-                    replied_count += 1
-            
-            rate = (replied_count / total_conversations) * 100
+        if snapshot.total_conversations > 0:
+            rate = (snapshot.replied_conversations / snapshot.total_conversations) * 100
             response_rate = f"{int(rate)}%"
         else:
             response_rate = "N/A" # No conversations yet
 
-        # Total Impressions (Real data from ProjectView)
-        # Count all views on projects created by this freelancer
-        total_impressions = ProjectView.objects.filter(
-            project__client=freelancer 
-        ).count()
+        # Total Impressions (ProjectViewRollup buckets + views not rolled up yet)
+        total_impressions = snapshot.total_impressions
         
         # Format for readability (e.g. 1.2K) if large
         if total_impressions > 1000:
             total_impressions = f"{total_impressions/1000:.1f}K"
 
-        # Recent Proposals (Keeping this for now, though less relevant in Fiverr model)
-        recent_proposals = Proposal.objects.filter(freelancer=freelancer).order_by('-created_at')[:3]
-        recent_proposals_data = [
-            {
-                "title": p.project.title,
-                "status": p.status,
-                "date": p.created_at.strftime("%Y-%m-%d")
-            }
-            for p in recent_proposals
-        ]
-
         data = {
             'total_earnings': total_earnings,
+            'month_earnings': month_earnings,
             'estimated_monthly_tax': estimated_tax,
-            'active_projects': active_projects,
-            'concluded_projects': concluded_projects,
-            'total_orders': total_orders,
+            'active_projects': snapshot.active_projects,
+            'concluded_projects': snapshot.concluded_projects,
+            'total_orders': snapshot.total_orders,
             'achievement_rating': achievement_rating,
             'response_rate': response_rate,
             'total_impressions': total_impressions,
-            'recent_proposals': recent_proposals_data,
+            'recent_proposals': snapshot.recent_proposals,
+            'refreshed_at': snapshot.refreshed_at,
         }
 
         return Response(data)
 
 
 class ClientDashboardAPIView(APIView):
+    """Client dashboard, read from the user's DashboardSnapshot (?fresh=1 recomputes it)."""
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        from Order.models import Order
-        from Project.models import Project
-        from Proposal.models import Proposal
-        from User.models import User
-        
-        client = request.user
-
-        # Total Spent
-        total_spent = Order.objects.filter(
-            client=client,
-            status='COMPLETED'
-        ).aggregate(total=Sum('total_amount'))['total'] or 0
-
-        # Active Projects (Orders)
-        active_projects = Order.objects.filter(
-            client=client,
-            status__in=['PENDING', 'PAID']
-        ).count()
-
-        # Completed Projects (Orders)
-        completed_projects = Order.objects.filter(
-            client=client,
-            status='COMPLETED'
-        ).count()
-
-        # Open Projects (Gigs created? Clients don't create gigs usually, but if they posted jobs)
-        # In Fiverr model, clients don't have "Open Projects". 
-        # But if we support hybrid, we count OPEN projects owned by client.
-        open_projects = Project.objects.filter(
-            client=client,
-            status='OPEN'
-        ).count()
-
-        # Total Proposals Received (Legacy)
-        total_proposals_received = Proposal.objects.filter(
-            project__client=client
-        ).count()
-
-        # Number of Freelancers Hired (Distinct freelancers in orders)
-        # Using correct related name 'received_orders' from OrderItem model
-        freelancers_hired = User.objects.filter(
-            received_orders__order__client=client
-        ).distinct().count()
-
-        # Recent Transactions
-        # Using Orders as transactions for now
-        recent_orders = Order.objects.filter(client=client).order_by('-created_at')[:5]
-        recent_transactions = [
-            {
-                "id": o.id,
-                "amount": o.total_amount,
-                "project": f"Order #{o.order_number}",
-                "date": o.created_at.strftime("%Y-%m-%d")
-            }
-            for o in recent_orders
-        ]
+        from .snapshots import CLIENT, get_snapshot
+
+        snapshot = get_snapshot(request.user, CLIENT, fresh=wants_fresh(request))
 
         data = {
-            'total_spent': total_spent,
-            'active_projects': active_projects,
-            'completed_projects': completed_projects,
-            'open_projects': open_projects,
-            'proposals_received': total_proposals_received, # Fixed key name to match frontend
-            'freelancers_hired': freelancers_hired,
-            'recent_transactions': recent_transactions,
+            'total_spent': snapshot.total_spent or 0,
+            'active_projects': snapshot.active_projects,  # Orders pending or paid
+            'completed_projects': snapshot.concluded_projects,  # Completed orders
+            'open_projects': snapshot.open_projects,
+            'proposals_received': snapshot.proposals_received, # Fixed key name to match frontend
+            'freelancers_hired': snapshot.freelancers_hired,  # Distinct freelancers in orders
+            'recent_transactions': snapshot.recent_transactions,  # Latest orders
+            'refreshed_at': snapshot.refreshed_at,
+        }
+
+        return Response(data)
+
+class EarningsTimeSeriesAPIView(APIView):
+    """
+    Earnings (freelancer) or spend (client) per month or day.
+
+    GET /api/dashboard/timeseries/
+
+    Query Parameters:
+        role: 'freelancer' (default) or 'client'
+        granularity: 'month' (default) or 'day'
+        start, end: ISO 8601 dates, both inclusive
+            (defaults: the last 12 months for 'month', the last 30 days for 'day')
+
+    Response Format:
+        {
+            "role": "FREELANCER",
+            "granularity": "MONTH",
+            "start": "2025-01-01",
+            "end": "2026-01-01",
+            "total": "1250.00",
+            "orders": 6,
+            "estimated_tax": 225.0,
+            "series": [{"bucket": "2025-01-01", "amount": "250.00", "orders": 1, "estimated_tax": 45.0}, ...]
         }
 
+    Tax is estimated per bucket from that period's earnings and is only
+    returned for the freelancer role. Served from EarningsBucket, so cost
+    depends on the range, not on how many orders the user has.
+    """
+    permission_classes = [IsAuthenticated]
+
+    MAX_BUCKETS = {'MONTH': 120, 'DAY': 366}
+
+    def get(self, request):
+        from datetime import timedelta
+        from django.utils import timezone
+        from django.utils.dateparse import parse_date
+        from .earnings import bucket_start, earnings_series, months_before, next_bucket, period_tax
+        from .models import DashboardSnapshot, EarningsBucket
+
+        role = request.query_params.get('role', 'freelancer').upper()
+        if role not in DashboardSnapshot.Role.values:
+            return Response({"detail": "role must be 'freelancer' or 'client'."}, status=status.HTTP_400_BAD_REQUEST)
+        granularity = request.query_params.get('granularity', 'month').upper()
+        if granularity not in EarningsBucket.Granularity.values:
+            return Response({"detail": "granularity must be 'month' or 'day'."}, status=status.HTTP_400_BAD_REQUEST)
+
+        def parse_bound(name):
+            day = parse_date(request.query_params[name])
+            if day is None:
+                raise ValueError(name)
+            return day
+
+        today = timezone.now().date()
+        try:
+            # Date bounds are inclusive: end=2025-01-31 covers that whole day
+            end = parse_bound('end') + timedelta(days=1) if 'end' in request.query_params else None
+            start = parse_bound('start') if 'start' in request.query_params else None
+        except ValueError:
+            return Response({"detail": "start/end must be ISO 8601 dates."}, status=status.HTTP_400_BAD_REQUEST)
+
+        if granularity == EarningsBucket.Granularity.MONTH:
+            end = end or next_bucket(bucket_start(today, granularity), granularity)
+            # Twelve months, the last one holding the final day of the range
+            start = start or months_before(bucket_start(end - timedelta(days=1), granularity), 11)
+            buckets = (end.year - start.year) * 12 + end.month - start.month + (end.day > 1)
+        else:
+            end = end or today + timedelta(days=1)
+            start = start or end - timedelta(days=30)
+            buckets = (end - start).days
+        if start >= end or buckets > self.MAX_BUCKETS[granularity]:
+            return Response(
+                {"detail": f"Range must be positive and span at most {self.MAX_BUCKETS[granularity]} buckets."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        series = earnings_series(request.user, role, granularity, start, end)
+        data = {
+            "role": role,
+            "granularity": granularity,
+            "start": series[0]['bucket'] if series else start,
+            "end": end,
+            "total": sum((point['amount'] for point in series), 0),
+            "orders": sum(point['orders'] for point in series),
+        }
+        if role == DashboardSnapshot.Role.FREELANCER:
+            for point in series:
+                point['estimated_tax'] = period_tax(point['amount'], granularity)
+            data["estimated_tax"] = round(sum(point['estimated_tax'] for point in series), 2)
+        data["series"] = series
         return Response(data)
 
+
+class CacheStatsAPIView(APIView):
+    """
+    Hit/miss counters for the public API response cache (utils/cache.py)
+    and the request-scoped serializer memo (utils/memo.py).
+
+    GET returns the counters per cached view and memoized serializer;
+    DELETE resets them.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        from django.conf import settings
+        from utils.cache import cache_stats
+        from utils.memo import memo_stats
+
+        return Response({
+            "backend": settings.CACHES['default']['BACKEND'],
+            "timeout": getattr(settings, 'API_CACHE_TIMEOUT', 300),
+            "views": cache_stats(),
+            "serializer_memo": memo_stats(),
+        })
+
+    def delete(self, request):
+        from utils.cache import reset_cache_stats
+        from utils.memo import reset_memo_stats
+
+        reset_cache_stats()
+        reset_memo_stats()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 def get_all_urls():
     """
     Scans all registered URL patterns and returns a sorted list of paths,
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.4 on 2026-10-17 04:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('User', '0027_user_role_version'),
+        ('message', '0006_alter_message_is_read_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['conversation', 'timestamp'], name='message_mes_convers_87e3c3_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.4 on 2026-10-17 04:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('User', '0027_user_role_version'),
+        ('message', '0007_message_message_mes_convers_87e3c3_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='message',
+            name='message_mes_convers_87e3c3_idx',
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['conversation', 'timestamp', 'id'], name='message_mes_convers_06a667_idx'),
+        ),
+    ]
@@ -2,6 +2,43 @@ from django.db import models
 from django.conf import settings
 from Project.models import Project
 
+class ConversationQuerySet(models.QuerySet):
+    """
+    Query helpers for the inbox.
+    """
+
+    def with_inbox_stats(self, user):
+        """
+        Annotate what ConversationSerializer shows about each conversation's messages.
+
+        The latest message and the unread count are correlated subqueries, so
+        an inbox costs the same number of queries however many conversations
+        and messages it holds, and no message rows are loaded.
+
+        Args:
+            user (User): Viewer; messages they sent never count as unread
+
+        Annotations:
+            last_message_body (str|None): Body of the latest message
+            last_message_timestamp (datetime|None): When it was sent (None without messages)
+            last_message_sender (str|None): Username of its sender
+            unread_total (int): Unread messages sent by the other participant
+        """
+        from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+        from django.db.models.functions import Coalesce
+
+        latest = Message.objects.filter(conversation=OuterRef('pk')).order_by('-timestamp', '-pk')
+        unread = Message.objects.filter(
+            conversation=OuterRef('pk'), is_read=False
+        ).exclude(sender=user).order_by().values('conversation').annotate(total=Count('pk')).values('total')
+        return self.annotate(
+            last_message_body=Subquery(latest.values('body')[:1]),
+            last_message_timestamp=Subquery(latest.values('timestamp')[:1]),
+            last_message_sender=Subquery(latest.values('sender__username')[:1]),
+            unread_total=Coalesce(Subquery(unread, output_field=IntegerField()), Value(0)),
+        )
+
+
 class Conversation(models.Model):
     """
     Represents a conversation thread between two users about a specific project.
@@ -13,6 +50,8 @@ class Conversation(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ConversationQuerySet.as_manager()
+
     class Meta:
         unique_together = ['project', 'participant_1', 'participant_2']
         ordering = ['-updated_at']
@@ -46,6 +85,7 @@ class Message(models.Model):
         ordering = ['timestamp']
         indexes = [
             models.Index(fields=['conversation', 'is_read']),  # Unread messages in a conversation
+            models.Index(fields=['conversation', 'timestamp', 'id']),  # Latest message (inbox) and history windows
             models.Index(fields=['sender', 'timestamp']),  # User's message history
         ]
 
@@ -1,9 +1,12 @@
 from rest_framework import serializers
 from .models import Message, Conversation
 from User.models import User, FileAttachment
+from utils.memo import MemoizedSerializerMixin
+
+class UserMinimalSerializer(MemoizedSerializerMixin, serializers.ModelSerializer):
+    """Minimal user info for message display (rendered once per user per request)"""
+    memo_label = 'user_minimal'
 
-class UserMinimalSerializer(serializers.ModelSerializer):
-    """Minimal user info for message display"""
     class Meta:
         model = User
         fields = ['id', 'username', 'first_name', 'last_name', 'email']
@@ -50,18 +53,33 @@ class ConversationSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
     
     def get_last_message(self, obj):
-        """Get the most recent message in the conversation"""
-        last_msg = obj.messages.last()
-        if last_msg:
-            return {
-                'body': last_msg.body,
-                'timestamp': last_msg.timestamp,
-                'sender': last_msg.sender.username
-            }
-        return None
+        """
+        Get the most recent message in the conversation.
+
+        Read from the with_inbox_stats() annotations; a conversation loaded
+        without them (e.g. just created) is looked up directly.
+        """
+        if not hasattr(obj, 'last_message_timestamp'):
+            last_msg = obj.messages.select_related('sender').order_by('-timestamp', '-pk').first()
+            if last_msg:
+                return {
+                    'body': last_msg.body,
+                    'timestamp': last_msg.timestamp,
+                    'sender': last_msg.sender.username
+                }
+            return None
+        if obj.last_message_timestamp is None:
+            return None
+        return {
+            'body': obj.last_message_body,
+            'timestamp': obj.last_message_timestamp,
+            'sender': obj.last_message_sender
+        }
     
     def get_unread_count(self, obj):
-        """Count unread messages for the current user"""
+        """Count unread messages for the current user (the unread_total annotation when present)"""
+        if hasattr(obj, 'unread_total'):
+            return obj.unread_total
         request = self.context.get('request')
         if request and request.user:
             return obj.messages.filter(is_read=False).exclude(sender=request.user).count()
@@ -0,0 +1,172 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from message.models import Conversation, Message
+from Project.models import Category, Project
+
+User = get_user_model()
+
+
+class InboxTests(APITestCase):
+    """
+    The conversation list costs a fixed number of queries and loads no messages.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='inbox', email='inbox@example.com', password='password123',
+            country_origin='US', identity_number='inbox-id'
+        )
+        self.category = Category.objects.create(name='Design', slug='design')
+        self.url = reverse('message_api:conversation-list')
+        self.client.force_authenticate(user=self.user)
+        self.others = 0
+
+    def _add_conversations(self, count, messages=3):
+        """`count` conversations; the other participant sends every message but the last."""
+        conversations = []
+        for _ in range(count):
+            self.others += 1
+            other = User.objects.create_user(
+                username=f'other{self.others}', email=f'other{self.others}@example.com', password='password123',
+                country_origin='US', identity_number=f'other-{self.others}'
+            )
+            project = Project.objects.create(
+                title=f'Job {self.others}', description='Description', budget=100, price=100,
+                category=self.category, client=other,
+            )
+            conversation = Conversation.objects.create(project=project, participant_1=other, participant_2=self.user)
+            for i in range(messages):
+                sender = self.user if i == messages - 1 else other
+                Message.objects.create(conversation=conversation, sender=sender, body=f'Message {i}')
+            conversations.append(conversation)
+        return conversations
+
+    def _list(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, ctx.captured_queries
+
+    def test_query_count_is_fixed(self):
+        self._add_conversations(2)
+        _, few = self._list()
+        self._add_conversations(8, messages=6)
+        response, many = self._list()
+        self.assertEqual(len(few), len(many))
+        self.assertLessEqual(len(many), 2)
+        # Messages only appear inside the conversation query's subqueries
+        self.assertFalse(any(query['sql'].startswith('SELECT "message_message"') for query in many))
+
+        self.assertIsInstance(response.data, list)  # the inbox is not paginated
+        self.assertEqual(len(response.data), 10)
+        for conversation in response.data:
+            self.assertEqual(conversation['last_message']['sender'], 'inbox')
+            self.assertIn(conversation['unread_count'], (2, 5))
+
+    def test_last_message_and_unread_count(self):
+        conversation, = self._add_conversations(1, messages=4)
+        quiet, = self._add_conversations(1, messages=0)
+        self.client.post(reverse('message_api:conversation-mark-read', kwargs={'pk': conversation.pk}))
+
+        response, _ = self._list()
+        self.assertIsInstance(response.data, list)
+        by_id = {item['id']: item for item in response.data}
+        self.assertEqual(by_id[conversation.pk]['last_message']['body'], 'Message 3')
+        self.assertEqual(by_id[conversation.pk]['unread_count'], 0)
+        self.assertIsNone(by_id[quiet.pk]['last_message'])
+        self.assertEqual(by_id[quiet.pk]['unread_count'], 0)
+
+
+class MessageHistoryTests(APITestCase):
+    """
+    Message lists are before/after windows of the history, oldest first.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='reader', email='reader@example.com', password='password123',
+            country_origin='US', identity_number='reader-id'
+        )
+        self.other = User.objects.create_user(
+            username='writer', email='writer@example.com', password='password123',
+            country_origin='US', identity_number='writer-id'
+        )
+        category = Category.objects.create(name='Design', slug='design')
+        project = Project.objects.create(
+            title='Job', description='Description', budget=100, price=100, category=category, client=self.other,
+        )
+        self.conversation = Conversation.objects.create(project=project, participant_1=self.other, participant_2=self.user)
+        self.messages = [
+            Message.objects.create(conversation=self.conversation, sender=self.other, body=f'Message {i}').pk
+            for i in range(25)
+        ]
+        self.url = reverse('message_api:message-list')
+        self.client.force_authenticate(user=self.user)
+
+    def _get(self, **params):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, {'conversation': self.conversation.pk, 'limit': 10, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, len(ctx.captured_queries)
+
+    def _ids(self, response):
+        return [message['id'] for message in response.data['results']]
+
+    def test_default_is_latest_window(self):
+        response, _ = self._get()
+        self.assertEqual(self._ids(response), self.messages[-10:])
+        self.assertIsNone(response.data['next'])
+        self.assertIn(f'before={self.messages[-10]}', response.data['previous'])
+
+    def test_walk_back_through_history(self):
+        seen = []
+        response, first = self._get()
+        while True:
+            seen = self._ids(response) + seen
+            if response.data['previous'] is None:
+                break
+            response, queries = self._get(before=seen[0])
+            self.assertEqual(queries, first + 1)  # Plus the anchor lookup
+        self.assertEqual(seen, self.messages)
+
+        response, _ = self._get(before=self.messages[10])
+        self.assertEqual(self._ids(response), self.messages[:10])
+        self.assertIsNone(response.data['previous'])
+        self.assertIn(f'after={self.messages[9]}', response.data['next'])
+
+    def test_after_window_for_polling(self):
+        newest = self.messages[-1]
+        response, _ = self._get(after=newest)
+        self.assertEqual(response.data['results'], [])
+
+        new = Message.objects.create(conversation=self.conversation, sender=self.other, body='New').pk
+        response, _ = self._get(after=newest)
+        self.assertEqual(self._ids(response), [new])
+        self.assertIsNone(response.data['next'])
+
+        response, _ = self._get(after=self.messages[0])
+        self.assertEqual(self._ids(response), self.messages[1:11])
+        self.assertIn(f'after={self.messages[10]}', response.data['next'])
+
+    def test_invalid_windows(self):
+        url_params = {'conversation': self.conversation.pk}
+        response = self.client.get(self.url, {**url_params, 'before': self.messages[5], 'after': self.messages[1]})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        for anchor in ('abc', 999999):
+            response = self.client.get(self.url, {**url_params, 'before': anchor})
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        # A message from a conversation the user is not part of is not a valid anchor
+        stranger = User.objects.create_user(
+            username='stranger', email='stranger@example.com', password='password123',
+            country_origin='US', identity_number='stranger-id'
+        )
+        private = Conversation.objects.create(project=self.conversation.project, participant_1=self.other, participant_2=stranger)
+        hidden = Message.objects.create(conversation=private, sender=stranger, body='Private').pk
+        response = self.client.get(self.url, {'after': hidden})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -5,6 +5,8 @@ from rest_framework.permissions import IsAuthenticated
 from django.db.models import Q
 from .models import Message, Conversation
 from .serializers import MessageSerializer, ConversationSerializer
+from realtime.broker import publish
+from utils.pagination import MessageWindowPagination
 
 
 class ConversationViewSet(viewsets.ModelViewSet):
@@ -16,11 +18,16 @@ class ConversationViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        """Return conversations where user is a participant"""
+        """
+        Return conversations where user is a participant.
+
+        The last message and unread count are annotated (with_inbox_stats),
+        so listing the inbox never loads the messages themselves.
+        """
         user = self.request.user
         return Conversation.objects.filter(
             Q(participant_1=user) | Q(participant_2=user)
-        ).select_related('project', 'participant_1', 'participant_2').prefetch_related('messages')
+        ).select_related('project', 'participant_1', 'participant_2').with_inbox_stats(user)
     
     def create(self, request, *args, **kwargs):
         """
@@ -38,7 +45,7 @@ class ConversationViewSet(viewsets.ModelViewSet):
         user = request.user
         
         # Check if conversation already exists (in either direction)
-        existing_conversation = Conversation.objects.filter(
+        existing_conversation = Conversation.objects.with_inbox_stats(user).filter(
             Q(project_id=project_id, participant_1=user, participant_2_id=other_user_id) |
             Q(project_id=project_id, participant_1_id=other_user_id, participant_2=user)
         ).first()
@@ -68,9 +75,14 @@ class ConversationViewSet(viewsets.ModelViewSet):
 class MessageViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing messages within conversations.
+
+    Lists are windows of the history (utils.pagination.MessageWindowPagination):
+    the latest `limit` messages by default, `before=<id>` for older ones and
+    `after=<id>` for new ones, oldest first.
     """
     serializer_class = MessageSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = MessageWindowPagination
     
     def get_queryset(self):
         """Return messages from conversations where user is a participant"""
@@ -79,7 +91,7 @@ class MessageViewSet(viewsets.ModelViewSet):
         
         queryset = Message.objects.filter(
             Q(conversation__participant_1=user) | Q(conversation__participant_2=user)
-        ).select_related('sender', 'conversation')
+        ).select_related('sender', 'conversation', 'attachment')
         
         if conversation_id:
             queryset = queryset.filter(conversation_id=conversation_id)
@@ -87,8 +99,10 @@ class MessageViewSet(viewsets.ModelViewSet):
         return queryset
     
     def perform_create(self, serializer):
-        """Set sender to current user when creating message"""
+        """Set sender to current user when creating message, and push it to both participants' streams"""
         message = serializer.save(sender=self.request.user)
+        conversation = message.conversation
+        publish([conversation.participant_1_id, conversation.participant_2_id], 'message', serializer.data)
         
         # Send email notification
         from notifications.email_service import EmailService
@@ -5,8 +5,10 @@ Central service for creating and managing notifications.
 Handles creation of in-app notifications and integration with email service.
 """
 
+from realtime.broker import publish
 from .models import Notification
 from .email_service import EmailService
+from .serializers import NotificationSerializer
 
 
 class NotificationService:
@@ -46,6 +48,12 @@ class NotificationService:
             order=order,
             link_url=link_url
         )
+        # Pushed to the recipient's open event streams (realtime/), with the
+        # count they would otherwise poll unread_count for
+        publish([recipient.pk], 'notification', {
+            **NotificationSerializer(notification).data,
+            'unread_count': Notification.objects.filter(recipient=recipient, is_read=False).count(),
+        })
         return notification
     
     @classmethod
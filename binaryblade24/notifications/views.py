@@ -12,6 +12,7 @@ from django.utils import timezone
 
 from .models import Notification
 from .serializers import NotificationSerializer
+from utils.pagination import KeysetPagination
 
 
 class NotificationViewSet(viewsets.ModelViewSet):
@@ -19,7 +20,7 @@ class NotificationViewSet(viewsets.ModelViewSet):
     ViewSet for viewing and managing notifications.
     
     Provides endpoints for:
-    - list: Get user's notifications
+    - list: Get user's notifications (cursor-paginated, newest first)
     - retrieve: Get specific notification
     - unread_count: Get count of unread notifications
     - mark_read: Mark specific notification as read
@@ -28,6 +29,7 @@ class NotificationViewSet(viewsets.ModelViewSet):
     
     permission_classes = [IsAuthenticated]
     serializer_class = NotificationSerializer
+    pagination_class = KeysetPagination
     
     def get_queryset(self):
         """
@@ -0,0 +1,193 @@
+"""
+Pub/sub for real-time delivery.
+
+Sync code (views, services) calls publish() with the users an event is for;
+every open event stream (realtime/views.py) holds a Subscription to its
+user's channel, `user:<id>`, and receives the event as a JSON string:
+
+    {"event": "message", "data": {...}}
+
+Brokers:
+    InMemoryBroker  fans events out inside this process. Enough when one
+                    ASGI process serves every stream, and what tests use.
+    RedisBroker     publishes through Redis. Each ASGI process keeps one
+                    pattern subscription and fans out to its own streams,
+                    so sync web workers can publish to streams held by any
+                    number of ASGI processes.
+
+REALTIME_BROKER picks the class (dotted path); by default RedisBroker when
+REDIS_URL is set, otherwise InMemoryBroker. A process started with
+REALTIME_STANDALONE (the Procfile's `realtime`) serves streams for events
+published by other processes, and refuses to start with InMemoryBroker.
+"""
+import asyncio
+import json
+import logging
+import threading
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'user:{}'
+
+
+class Subscription:
+    """The queue of one open stream; created on (and read from) its event loop."""
+
+    def __init__(self, broker, channel, maxsize):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize)
+
+    def offer(self, payload):
+        """Queue `payload`, dropping the oldest one when the client has fallen behind."""
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(payload)
+
+    async def get(self, timeout):
+        """The next payload, or None when nothing arrived within `timeout` seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InMemoryBroker:
+    """Fan-out to the subscriptions of this process. publish() is safe from any thread."""
+    # Events never leave the process that published them
+    in_process = True
+
+    def __init__(self, queue_size=None):
+        self.queue_size = queue_size or getattr(settings, 'REALTIME_QUEUE_SIZE', 100)
+        self._subscriptions = {}
+        self._lock = threading.Lock()
+
+    def publish(self, channel, payload):
+        self._deliver(channel, payload)
+
+    def _deliver(self, channel, payload):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, payload)
+            except RuntimeError:
+                # The stream's event loop has shut down
+                self.unsubscribe(subscription)
+
+    async def subscribe(self, channel):
+        subscription = Subscription(self, channel, self.queue_size)
+        with self._lock:
+            self._subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.channel]
+
+    def subscription_count(self):
+        with self._lock:
+            return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+
+class RedisBroker(InMemoryBroker):
+    """
+    Publishes to Redis; streams receive through one listener task per process.
+
+    Requires the `redis` package (redis.asyncio for the listener).
+    """
+    prefix = 'realtime:'
+    in_process = False
+
+    def __init__(self, url=None, queue_size=None):
+        super().__init__(queue_size)
+        self.url = url or settings.REDIS_URL
+        self._client = None
+        self._listener = None
+
+    def publish(self, channel, payload):
+        import redis
+
+        if self._client is None:
+            self._client = redis.Redis.from_url(self.url)
+        self._client.publish(self.prefix + channel, payload)
+
+    async def subscribe(self, channel):
+        subscription = await super().subscribe(channel)
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+        return subscription
+
+    async def _listen(self):
+        import redis.asyncio as aioredis
+
+        while True:
+            try:
+                client = aioredis.from_url(self.url)
+                async with client.pubsub() as pubsub:
+                    await pubsub.psubscribe(self.prefix + '*')
+                    async for item in pubsub.listen():
+                        if item['type'] == 'pmessage':
+                            channel = item['channel'].decode()[len(self.prefix):]
+                            self._deliver(channel, item['data'].decode())
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception('Realtime Redis listener failed; reconnecting')
+                await asyncio.sleep(1)
+
+
+_broker = None
+
+
+def get_broker():
+    """The process-wide broker configured by REALTIME_BROKER."""
+    global _broker
+    if _broker is None:
+        path = getattr(settings, 'REALTIME_BROKER', '') or (
+            'realtime.broker.RedisBroker' if getattr(settings, 'REDIS_URL', '') else 'realtime.broker.InMemoryBroker'
+        )
+        broker = import_string(path)()
+        if broker.in_process and getattr(settings, 'REALTIME_STANDALONE', False):
+            raise ImproperlyConfigured(
+                f'{path} only delivers events published in this process, but REALTIME_STANDALONE '
+                'says they are published by separate web workers. Set REDIS_URL (or REALTIME_BROKER).'
+            )
+        _broker = broker
+    return _broker
+
+
+def publish(user_ids, event, data):
+    """
+    Send `event` with `data` to the open streams of `user_ids` once the transaction commits.
+
+    Delivery is best effort: a broker failure is logged and never fails the
+    request that published. Clients catch up through the REST endpoints
+    after reconnecting.
+    """
+    payload = json.dumps({'event': event, 'data': data}, cls=DjangoJSONEncoder)
+    channels = [CHANNEL.format(user_id) for user_id in set(user_ids) if user_id is not None]
+
+    def send():
+        try:
+            broker = get_broker()
+            for channel in channels:
+                broker.publish(channel, payload)
+        except Exception:
+            logger.exception('Could not publish realtime event %s', event)
+
+    transaction.on_commit(send)
@@ -0,0 +1,162 @@
+import asyncio
+import json
+import threading
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from message.models import Conversation
+from notifications.notification_service import NotificationService
+from Project.models import Category, Project
+from User.tokens import tokens_for_user
+from . import broker as broker_module
+from .broker import InMemoryBroker, RedisBroker, get_broker
+
+User = get_user_model()
+
+
+class InMemoryBrokerTests(TestCase):
+    """
+    The in-process broker fans out to the subscriptions of a channel, from any thread.
+    """
+
+    async def test_publish_from_another_thread(self):
+        broker = InMemoryBroker(queue_size=2)
+        mine = await broker.subscribe('user:1')
+        other = await broker.subscribe('user:2')
+
+        thread = threading.Thread(target=broker.publish, args=('user:1', 'hello'))
+        thread.start()
+        thread.join()
+        self.assertEqual(await mine.get(1), 'hello')
+        self.assertIsNone(await other.get(0.01))
+
+        # A slow client keeps the newest events
+        for payload in ('a', 'b', 'c'):
+            broker.publish('user:1', payload)
+        await asyncio.sleep(0)
+        self.assertEqual([await mine.get(1), await mine.get(1)], ['b', 'c'])
+
+        mine.close()
+        other.close()
+        self.assertEqual(broker.subscription_count(), 0)
+
+    def test_standalone_process_refuses_in_process_broker(self):
+        current = broker_module._broker
+        self.addCleanup(setattr, broker_module, '_broker', current)
+        broker_module._broker = None
+        with override_settings(REALTIME_STANDALONE=True, REDIS_URL='', REALTIME_BROKER=''):
+            with self.assertRaises(ImproperlyConfigured):
+                get_broker()
+        with override_settings(REALTIME_STANDALONE=True, REDIS_URL='redis://localhost:6379/0', REALTIME_BROKER=''):
+            self.assertIsInstance(get_broker(), RedisBroker)
+
+
+@override_settings(REALTIME_HEARTBEAT=0.05)
+class EventStreamTests(TestCase):
+    """
+    New messages and notifications reach the participants' open event streams.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='listener', email='listener@example.com', password='password123',
+            country_origin='US', identity_number='listener-id'
+        )
+        self.other = User.objects.create_user(
+            username='sender', email='sender@example.com', password='password123',
+            country_origin='US', identity_number='sender-id'
+        )
+        category = Category.objects.create(name='Design', slug='design')
+        project = Project.objects.create(
+            title='Job', description='Description', budget=100, price=100, category=category, client=self.other,
+        )
+        self.conversation = Conversation.objects.create(project=project, participant_1=self.other, participant_2=self.user)
+        self.url = reverse('realtime_api:events')
+        self.token = str(tokens_for_user(self.user).access_token)
+
+    def _send_message(self):
+        client = APIClient()
+        client.force_authenticate(user=self.other)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.post(
+                reverse('message_api:message-list'), {'conversation': self.conversation.pk, 'body': 'Hi there'},
+                format='json',
+            )
+        self.assertEqual(response.status_code, 201)
+
+    def _notify(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            NotificationService.create_notification(self.user, 'SYSTEM', 'Welcome', 'Hello')
+
+    async def _next_event(self, stream):
+        while True:
+            chunk = await asyncio.wait_for(anext(stream), 1)
+            chunk = chunk.decode() if isinstance(chunk, bytes) else chunk
+            if chunk.startswith('data: '):
+                return json.loads(chunk[len('data: '):])
+
+    async def test_stream_delivers_messages_and_notifications(self):
+        response = await self.async_client.get(self.url, {'token': self.token})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = response.streaming_content
+        self.assertTrue((await anext(stream)).startswith(b'retry:'))
+
+        await sync_to_async(self._send_message)()
+        event = await self._next_event(stream)
+        self.assertEqual(event['event'], 'message')
+        self.assertEqual(event['data']['body'], 'Hi there')
+        self.assertEqual(event['data']['sender'], self.other.pk)
+
+        await sync_to_async(self._notify)()
+        event = await self._next_event(stream)
+        self.assertEqual(event['event'], 'notification')
+        self.assertEqual((event['data']['title'], event['data']['unread_count']), ('Welcome', 1))
+
+        # Idle streams get keep-alive comments
+        self.assertEqual(await asyncio.wait_for(anext(stream), 1), b': ping\n\n')
+        response.close()
+        self.assertEqual(get_broker().subscription_count(), 0)
+
+    async def _drain(self, stream, timeout):
+        """Read `stream` until it ends; fails if it is still open after `timeout` seconds."""
+        async def read():
+            async for _ in stream:
+                pass
+        await asyncio.wait_for(read(), timeout)
+
+    async def test_stream_ends_when_the_token_expires(self):
+        token = tokens_for_user(self.user).access_token
+        token.set_exp(lifetime=timedelta(seconds=2))
+        response = await self.async_client.get(self.url, {'token': str(token)})
+        self.assertEqual(response.status_code, 200)
+        await self._drain(response.streaming_content, 3)
+        self.assertEqual(get_broker().subscription_count(), 0)
+
+    async def test_stream_ends_when_the_user_is_deactivated(self):
+        response = await self.async_client.get(self.url, {'token': self.token})
+        stream = response.streaming_content
+        await anext(stream)
+
+        self.user.is_active = False
+        await sync_to_async(self.user.save)()
+        await self._drain(stream, 1)
+        self.assertEqual(get_broker().subscription_count(), 0)
+
+    async def test_stream_requires_a_valid_token(self):
+        for params in ({}, {'token': 'not-a-token'}):
+            response = await self.async_client.get(self.url, params)
+            self.assertEqual(response.status_code, 401)
+        response = await self.async_client.get(self.url, headers={'Authorization': f'Bearer {self.token}'})
+        self.assertEqual(response.status_code, 200)
+        response.close()
+
+    def test_sync_workers_do_not_hold_streams(self):
+        response = self.client.get(self.url, {'token': self.token})
+        self.assertEqual(response.status_code, 503)
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from .views import event_stream
+
+app_name = 'realtime'
+
+urlpatterns = [
+    path('events/', event_stream, name='events'),
+]
@@ -0,0 +1,120 @@
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from User.auth_cache import get_cached_user
+from User.authentication import RoleClaimsJWTAuthentication
+from .broker import CHANNEL, get_broker
+
+
+def _authenticate(request):
+    """
+    The user and validated token of the request's JWT (Authorization header,
+    or ?token= for EventSource), or (None, None).
+    """
+    authentication = RoleClaimsJWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header is not None else request.GET.get('token')
+    if not raw_token:
+        return None, None
+    try:
+        token = authentication.get_validated_token(raw_token)
+        return authentication.get_user(token), token
+    except (InvalidToken, AuthenticationFailed):
+        return None, None
+
+
+def _is_active(user_id):
+    user = get_cached_user(user_id)
+    return user is not None and user.is_active
+
+
+class _EventStream:
+    """
+    The SSE lines of one connection.
+
+    Subscribes when streaming starts, so a response that is never sent leaves
+    nothing behind. Django calls close() when the request ends, including
+    when the client disconnects, which drops the subscription.
+
+    The stream ends when the access token expires (`expires_at`, epoch
+    seconds) and, checked once per heartbeat, when the user is deactivated;
+    the client reconnects with a fresh token.
+    """
+
+    def __init__(self, channel, heartbeat, user_id, expires_at):
+        self.channel = channel
+        self.heartbeat = heartbeat
+        self.user_id = user_id
+        self.expires_at = expires_at
+        self.subscription = None
+
+    async def __aiter__(self):
+        self.subscription = await get_broker().subscribe(self.channel)
+        try:
+            yield f"retry: {getattr(settings, 'REALTIME_RETRY_MS', 3000)}\n\n"
+            next_check = time.time() + self.heartbeat
+            while True:
+                now = time.time()
+                if now >= self.expires_at:
+                    break
+                if now >= next_check:
+                    if not await sync_to_async(_is_active)(self.user_id):
+                        break
+                    next_check = now + self.heartbeat
+
+                payload = await self.subscription.get(min(next_check, self.expires_at) - now)
+                if payload is not None:
+                    yield f"data: {payload}\n\n"
+                elif time.time() >= next_check:
+                    # Comment line: keeps proxies from closing an idle connection
+                    yield ": ping\n\n"
+        finally:
+            self.close()
+
+    def close(self):
+        if self.subscription is not None:
+            self.subscription.close()
+
+
+async def event_stream(request):
+    """
+    Server-Sent Events stream of the user's new messages and notifications.
+
+    GET /api/realtime/events/
+
+    Authenticated with the access token, in the Authorization header or as
+    ?token= (EventSource cannot set headers). Each event is one `data:` line:
+
+        data: {"event": "message", "data": {<MessageSerializer fields>}}
+        data: {"event": "notification", "data": {<NotificationSerializer fields>, "unread_count": 3}}
+
+    The stream closes when the token expires or the user is deactivated;
+    reconnect with a fresh token.
+
+    Idle connections cost a queue on the event loop, not a worker, so this
+    view is only served by the ASGI process (see the Procfile); the sync
+    WSGI workers answer 503. Events published while a client is
+    disconnected are not replayed: on reconnect it reloads through the
+    message windows (`after=<id>`) and the notification list.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {"detail": "The event stream is served by the ASGI (realtime) process."}, status=503
+        )
+
+    user, token = await sync_to_async(_authenticate)(request)
+    if user is None:
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+
+    response = StreamingHttpResponse(
+        _EventStream(CHANNEL.format(user.pk), getattr(settings, 'REALTIME_HEARTBEAT', 15), user.pk, token['exp']),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Let nginx pass events through unbuffered
+    return response
@@ -0,0 +1,198 @@
+"""
+Search-bar autocomplete.
+
+Suggestions come from AutocompleteEntry, a word-prefix index over:
+
+    - category names
+    - open project titles
+    - freelancer display names
+    - distinct skills listed on profiles
+
+Every suggestion is stored once per distinct lowercased word, so a query
+matches when its last word is a prefix of any word of the suggestion (and
+any earlier words appear in it). Each kind is one range scan on the
+(kind, token, text) index that stops at its LIMIT, and all kinds are
+fetched in a single UNION ALL statement, so the cost does not grow with
+the number of rows.
+
+Signals (search/signals.py) keep the entries current; skills are only ever
+added incrementally, so run `rebuild_autocomplete` now and then to drop
+skills nobody lists anymore.
+"""
+
+from django.apps import apps as global_apps
+from django.db import connection
+
+from User.skills import parse_skills
+
+from .backends import query_terms
+
+# Suggestions returned per kind, in response order
+SLOTS = (
+    ('category', 3),
+    ('project', 3),
+    ('user', 3),
+    ('skill', 2),
+)
+
+# Sorts after every character a \w token can contain
+_PREFIX_END = '\U0010ffff'
+
+
+def entry_tokens(text):
+    """Distinct lowercased words of `text`, capped to the token column size."""
+    return sorted({term[:64] for term in query_terms(text)})
+
+
+def user_text(user):
+    return f"{user.first_name} {user.last_name} ({user.username})".strip()
+
+
+def make_entries(Entry, kind, object_id, text):
+    return [Entry(kind=kind, object_id=object_id, text=text[:255], token=token) for token in entry_tokens(text)]
+
+
+def _replace(kind, object_id, text):
+    from .models import AutocompleteEntry
+    AutocompleteEntry.objects.filter(kind=kind, object_id=object_id).delete()
+    if text:
+        AutocompleteEntry.objects.bulk_create(make_entries(AutocompleteEntry, kind, object_id, text))
+
+
+def remove_entries(kind, object_id):
+    from .models import AutocompleteEntry
+    AutocompleteEntry.objects.filter(kind=kind, object_id=object_id).delete()
+
+
+def index_category(category):
+    _replace('category', category.pk, category.name)
+
+
+def index_project_title(project):
+    if project.status == 'OPEN':
+        _replace('project', project.pk, project.title)
+    else:
+        remove_entries('project', project.pk)
+
+
+def index_user_name(user):
+    if user.roles.filter(name='freelancer').exists():
+        _replace('user', user.pk, user_text(user))
+    else:
+        remove_entries('user', user.pk)
+
+
+def add_skills(skills):
+    """Add entries for skills in a Profile.skills string that are not indexed yet."""
+    from .models import AutocompleteEntry
+    skills = parse_skills(skills)
+    if not skills:
+        return
+    # Equal skills have the same words, so one lookup finds every spelling
+    first_words = [tokens[0] for tokens in map(entry_tokens, skills) if tokens]
+    known = {
+        text.casefold()
+        for text in AutocompleteEntry.objects.filter(kind='skill', token__in=first_words).values_list('text', flat=True)
+    }
+    new = [skill for skill in skills if skill.casefold() not in known]
+    AutocompleteEntry.objects.bulk_create([
+        entry for skill in new for entry in make_entries(AutocompleteEntry, 'skill', None, skill)
+    ])
+
+
+def suggest(query):
+    """
+    Autocomplete suggestions for `query`, in one database round trip.
+
+    Returns:
+        list[dict]: [{"type": "category", "text": "Web Development", "id": 3}, ...]
+                    (skills have no "id")
+    """
+    from .models import AutocompleteEntry
+
+    terms = query_terms(query)
+    if not terms:
+        return []
+    prefix = terms[-1][:64]
+    matches = AutocompleteEntry.objects.filter(token__gte=prefix, token__lt=prefix + _PREFIX_END)
+    for term in terms[:-1]:
+        matches = matches.filter(text__icontains=term)
+
+    # A suggestion can match on several of its words; over-fetch to fill the slots
+    per_kind = [
+        matches.filter(kind=kind).order_by('token', 'text').values_list('kind', 'object_id', 'text')[:slots * 2]
+        for kind, slots in SLOTS
+    ]
+    # Wrapped as subqueries: SQLite rejects LIMIT on the members of a compound query
+    parts = [queryset.query.sql_with_params() for queryset in per_kind]
+    sql = ' UNION ALL '.join(f'SELECT * FROM ({part_sql})' for part_sql, _ in parts)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [param for _, part_params in parts for param in part_params])
+        rows = cursor.fetchall()
+
+    found = {kind: [] for kind, _ in SLOTS}
+    for kind, object_id, text in rows:
+        found[kind].append((object_id, text))
+
+    suggestions = []
+    for kind, slots in SLOTS:
+        seen = set()
+        for object_id, text in found[kind]:
+            key = object_id if object_id is not None else text.casefold()
+            if key in seen or len(seen) == slots:
+                continue
+            seen.add(key)
+            suggestion = {'type': kind, 'text': text}
+            if object_id is not None:
+                suggestion['id'] = object_id
+            suggestions.append(suggestion)
+    return suggestions
+
+
+def rebuild_autocomplete(batch_size=1000, apps=None):
+    """
+    Recreate every autocomplete entry from the source tables.
+
+    Args:
+        batch_size (int): Entries inserted per batch
+        apps: Model registry (the migration passes its historical apps)
+
+    Returns:
+        dict: {kind: suggestions indexed}
+    """
+    apps = apps or global_apps
+    Entry = apps.get_model('search', 'AutocompleteEntry')
+    Category = apps.get_model('Project', 'Category')
+    Project = apps.get_model('Project', 'Project')
+    User = apps.get_model('User', 'User')
+    Profile = apps.get_model('User', 'Profile')
+
+    skills = {}
+    for value in Profile.objects.exclude(skills='').values_list('skills', flat=True).iterator(chunk_size=batch_size):
+        for skill in parse_skills(value):
+            skills.setdefault(skill.casefold(), skill)
+
+    sources = {
+        'category': Category.objects.values_list('pk', 'name'),
+        'project': Project.objects.filter(status='OPEN').values_list('pk', 'title'),
+        'user': (
+            (user.pk, user_text(user))
+            for user in User.objects.filter(roles__name='freelancer').distinct().only(
+                'username', 'first_name', 'last_name',
+            ).iterator(chunk_size=batch_size)
+        ),
+        'skill': ((None, skill) for skill in skills.values()),
+    }
+
+    Entry.objects.all().delete()
+    written = {}
+    for kind, rows in sources.items():
+        batch, written[kind] = [], 0
+        for object_id, text in rows:
+            batch.extend(make_entries(Entry, kind, object_id, text))
+            written[kind] += 1
+            if len(batch) >= batch_size:
+                Entry.objects.bulk_create(batch)
+                batch = []
+        Entry.objects.bulk_create(batch)
+    return written
@@ -0,0 +1,208 @@
+"""
+Full-text search backends.
+
+Every backend answers the same question - "which objects of this kind match
+the query, best first?" - against the SearchDocument index:
+
+    PostgresSearchBackend: tsvector @@ to_tsquery, ranked by ts_rank_cd (GIN index)
+    SQLiteSearchBackend: FTS5 MATCH, ranked by bm25
+    BasicSearchBackend: LIKE on the documents, for databases without either
+
+Every query term must match (AND), and the last term also matches as a
+prefix so results update while the user is typing. Title matches rank above
+keyword (category/skill) matches, which rank above body text.
+
+The backend follows the database vendor unless settings.SEARCH_BACKEND names
+one explicitly (dotted path).
+"""
+
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+VENDOR_BACKENDS = {
+    'postgresql': 'search.backends.PostgresSearchBackend',
+    'sqlite': 'search.backends.SQLiteSearchBackend',
+}
+
+
+def query_terms(query):
+    """Lowercased word tokens of a user query; punctuation is dropped."""
+    return TERM_RE.findall((query or '').lower())[:16]
+
+
+class BasicSearchBackend:
+    """Portable fallback: LIKE over the denormalized documents."""
+
+    def search(self, kind, query, limit=None, within=None):
+        """
+        Ids of `kind` objects matching `query`, most relevant first.
+
+        Args:
+            kind (str): SearchDocument.Kind value
+            query (str): Raw user input
+            limit (int|None): Max ids returned (default settings.SEARCH_MAX_RESULTS)
+            within (QuerySet|None): Only rank objects of this queryset (e.g. a view's filters)
+
+        Returns:
+            list[int]
+        """
+        terms = query_terms(query)
+        if not terms:
+            return []
+        within = within.order_by().values('pk') if within is not None else None
+        return self._search(kind, terms, limit or getattr(settings, 'SEARCH_MAX_RESULTS', 500), within)
+
+    def matches(self, kind, query):
+        """
+        Subquery of the ids of every `kind` object matching `query`, unranked and uncapped.
+
+        For filtering in the database: `queryset.filter(pk__in=backend.matches(...))`.
+        Returns None when the query has no terms.
+        """
+        terms = query_terms(query)
+        if not terms:
+            return None
+        return self._matches(kind, terms)
+
+    def _documents(self, kind, terms):
+        from .models import SearchDocument
+
+        documents = SearchDocument.objects.filter(kind=kind)
+        for term in terms:
+            documents = documents.filter(
+                Q(title__icontains=term) | Q(keywords__icontains=term) | Q(body__icontains=term)
+            )
+        return documents
+
+    def _matches(self, kind, terms):
+        return self._documents(kind, terms).values('object_id')
+
+    def _search(self, kind, terms, limit, within):
+        documents = self._documents(kind, terms)
+        if within is not None:
+            documents = documents.filter(object_id__in=within)
+        first = terms[0]
+        documents = documents.annotate(rank=Case(
+            When(title__icontains=first, then=Value(2)),
+            When(keywords__icontains=first, then=Value(1)),
+            default=Value(0),
+            output_field=IntegerField(),
+        ))
+        return list(documents.order_by('-rank', '-object_id').values_list('object_id', flat=True)[:limit])
+
+    def _fetch(self, sql, params, within, object_column):
+        """Run a ranking query (LIMIT last), restricted to the `within` subquery when one is given."""
+        if within is None:
+            sql = sql.format(within='')
+        else:
+            within_sql, within_params = within.query.sql_with_params()
+            sql = sql.format(within=f'AND {object_column} IN ({within_sql})')
+            params = params[:-1] + list(within_params) + params[-1:]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [row[0] for row in cursor.fetchall()]
+
+
+class SQLiteSearchBackend(BasicSearchBackend):
+    """FTS5 index (search_searchdocument_fts), bm25 ranking."""
+
+    # bm25 weights for (title, keywords, body)
+    weights = (10.0, 4.0, 1.0)
+
+    def _match(self, terms):
+        # Quoted terms cannot be read as FTS5 operators; the last one is a prefix
+        match = ' '.join(f'"{term}"' for term in terms[:-1])
+        return f'{match} "{terms[-1]}"*'.strip()
+
+    def _matches(self, kind, terms):
+        return RawSQL(
+            """
+            SELECT d.object_id
+            FROM search_searchdocument_fts
+            JOIN search_searchdocument d ON d.id = search_searchdocument_fts.rowid
+            WHERE search_searchdocument_fts MATCH %s AND d.kind = %s
+            """,
+            [self._match(terms), kind],
+        )
+
+    def _search(self, kind, terms, limit, within):
+        sql = f"""
+            SELECT d.object_id
+            FROM search_searchdocument_fts
+            JOIN search_searchdocument d ON d.id = search_searchdocument_fts.rowid
+            WHERE search_searchdocument_fts MATCH %s AND d.kind = %s {{within}}
+            ORDER BY bm25(search_searchdocument_fts, {', '.join(map(str, self.weights))}), d.object_id DESC
+            LIMIT %s
+        """
+        return self._fetch(sql, [self._match(terms), kind, limit], within, 'd.object_id')
+
+
+class PostgresSearchBackend(BasicSearchBackend):
+    """Generated tsvector column with a GIN index, ts_rank_cd ranking."""
+
+    config = 'english'
+
+    def _tsquery(self, terms):
+        # Terms are \w+ tokens, so they are safe inside to_tsquery syntax
+        return ' & '.join(terms[:-1] + [f'{terms[-1]}:*'])
+
+    def _matches(self, kind, terms):
+        return RawSQL(
+            """
+            SELECT object_id
+            FROM search_searchdocument
+            WHERE vector @@ to_tsquery(%s, %s) AND kind = %s
+            """,
+            [self.config, self._tsquery(terms), kind],
+        )
+
+    def _search(self, kind, terms, limit, within):
+        sql = """
+            SELECT object_id
+            FROM search_searchdocument, to_tsquery(%s, %s) query
+            WHERE vector @@ query AND kind = %s {within}
+            ORDER BY ts_rank_cd(vector, query) DESC, object_id DESC
+            LIMIT %s
+        """
+        return self._fetch(sql, [self.config, self._tsquery(terms), kind, limit], within, 'object_id')
+
+
+def get_search_backend():
+    """Return the configured backend (settings.SEARCH_BACKEND or the DB vendor's)."""
+    path = getattr(settings, 'SEARCH_BACKEND', None) or VENDOR_BACKENDS.get(
+        connection.vendor, 'search.backends.BasicSearchBackend'
+    )
+    return import_string(path)()
+
+
+def search_ids(kind, query, limit=None, within=None):
+    return get_search_backend().search(kind, query, limit=limit, within=within)
+
+
+def search_matches(kind, query):
+    return get_search_backend().matches(kind, query)
+
+
+def search_results(queryset, kind, query, limit=None):
+    """
+    The `limit` best matches for `query` among `queryset`, most relevant first.
+
+    The backend ranks only the objects `queryset` selects (as a subquery), so
+    the view's filters cannot push matches out of the top results. The
+    relevance order is restored in Python.
+
+    Returns:
+        list: Model instances from `queryset`
+    """
+    ids = search_ids(kind, query, limit=limit, within=queryset)
+    if not ids:
+        return []
+    objects = {obj.pk: obj for obj in queryset.filter(pk__in=ids)}
+    return [objects[pk] for pk in ids if pk in objects]
@@ -0,0 +1,127 @@
+"""
+Search document builders.
+
+Turn projects and users into SearchDocument rows. The field builders only
+read plain attributes, so the backfill migration can call them with
+historical models.
+"""
+
+import re
+
+from django.apps import apps as global_apps
+from django.core.exceptions import ObjectDoesNotExist
+
+
+def project_fields(project):
+    """SearchDocument fields for a project: title, category names, description."""
+    keywords = []
+    category = project.category
+    if category is not None:
+        keywords.append(category.name)
+        if category.parent_id:
+            keywords.append(category.parent.name)
+    return {
+        'title': (project.title or '')[:255],
+        'keywords': ' '.join(keywords),
+        'body': project.description or '',
+    }
+
+
+def profile_fields(user, profile=None):
+    """SearchDocument fields for a user: display name, skills, bio."""
+    names = [user.username, user.first_name, user.last_name]
+    skills = ''
+    bio = ''
+    if profile is not None:
+        # "Python,  Django/REST" -> "Python Django REST"
+        skills = ' '.join(re.split(r'[\s,;/|]+', profile.skills or '')).strip()
+        bio = profile.bio or ''
+    return {
+        'title': ' '.join(name for name in names if name)[:255],
+        'keywords': skills,
+        'body': bio,
+    }
+
+
+def _get_profile(user):
+    try:
+        return user.profile
+    except ObjectDoesNotExist:
+        # Profile not created yet (User post_save runs before Profile exists)
+        return None
+
+
+def index_project(project):
+    from .models import SearchDocument
+    SearchDocument.objects.update_or_create(
+        kind=SearchDocument.Kind.PROJECT, object_id=project.pk, defaults=project_fields(project),
+    )
+
+
+def index_user(user):
+    from .models import SearchDocument
+    SearchDocument.objects.update_or_create(
+        kind=SearchDocument.Kind.PROFILE, object_id=user.pk, defaults=profile_fields(user, _get_profile(user)),
+    )
+
+
+def remove_document(kind, object_id):
+    from .models import SearchDocument
+    SearchDocument.objects.filter(kind=kind, object_id=object_id).delete()
+
+
+def rebuild_index(kinds=('project', 'profile'), batch_size=1000, apps=None):
+    """
+    Recreate all documents of `kinds` from scratch.
+
+    Args:
+        kinds (tuple[str]): SearchDocument kinds to rebuild
+        batch_size (int): Objects read and documents inserted per batch
+        apps: Model registry (the migration passes its historical apps)
+
+    Returns:
+        dict: {kind: documents written}
+    """
+    apps = apps or global_apps
+    SearchDocument = apps.get_model('search', 'SearchDocument')
+    Project = apps.get_model('Project', 'Project')
+    User = apps.get_model('User', 'User')
+    Profile = apps.get_model('User', 'Profile')
+
+    sources = {
+        'project': lambda: (
+            (project.pk, project_fields(project))
+            for project in Project.objects.select_related('category__parent').iterator(chunk_size=batch_size)
+        ),
+        'profile': lambda: _profile_rows(User, Profile, batch_size),
+    }
+
+    written = {}
+    for kind in kinds:
+        SearchDocument.objects.filter(kind=kind).delete()
+        batch, written[kind] = [], 0
+        for object_id, fields in sources[kind]():
+            batch.append(SearchDocument(kind=kind, object_id=object_id, **fields))
+            if len(batch) >= batch_size:
+                SearchDocument.objects.bulk_create(batch)
+                written[kind] += len(batch)
+                batch = []
+        SearchDocument.objects.bulk_create(batch)
+        written[kind] += len(batch)
+    return written
+
+
+def _profile_rows(User, Profile, batch_size):
+    profiles = {}
+    for user in User.objects.order_by('pk').iterator(chunk_size=batch_size):
+        profiles[user.pk] = user
+        if len(profiles) >= batch_size:
+            yield from _with_profiles(Profile, profiles)
+            profiles = {}
+    yield from _with_profiles(Profile, profiles)
+
+
+def _with_profiles(Profile, users):
+    by_user = {profile.user_id: profile for profile in Profile.objects.filter(user_id__in=list(users))}
+    for user_id, user in users.items():
+        yield user_id, profile_fields(user, by_user.get(user_id))
@@ -0,0 +1,23 @@
+from rest_framework.filters import BaseFilterBackend
+
+from .backends import search_matches
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """
+    Drop-in replacement for DRF's SearchFilter backed by the search index.
+
+    Views set `search_kind` (a SearchDocument.Kind). Every match is applied
+    as a primary-key subquery, alongside the view's other filters, so the
+    view's own ordering and pagination still apply.
+    """
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        matches = search_matches(view.search_kind, query)
+        if matches is None:
+            return queryset.none()
+        return queryset.filter(pk__in=matches)
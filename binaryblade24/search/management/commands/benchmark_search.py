@@ -0,0 +1,146 @@
+"""
+Management command to benchmark project search latency.
+
+Creates N synthetic projects (and their search documents and autocomplete
+entries) inside a transaction that is rolled back, then times the old
+icontains search against the configured full-text backend, and the old
+suggestion queries against the autocomplete index.
+
+Usage: python manage.py benchmark_search --projects 100000
+"""
+
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+
+from Project.models import Category, Project
+from User.models import Profile, User
+from search.autocomplete import make_entries, suggest
+from search.backends import get_search_backend, search_results
+from search.documents import project_fields
+from search.models import AutocompleteEntry, SearchDocument
+
+WORDS = (
+    'react vue angular django flask rails laravel spring python java kotlin swift '
+    'logo brand identity poster flyer banner illustration animation video editing '
+    'website landing page dashboard admin portal store shop checkout payment api '
+    'mobile android ios app game unity backend frontend database migration cloud '
+    'aws azure devops docker kubernetes testing audit seo content writing translation '
+    'marketing analytics scraping automation chatbot machine learning data pipeline'
+).split()
+
+# Filler vocabulary so word frequencies follow a long tail like real text
+FILLER = [f'term{i}' for i in range(5000)]
+
+QUERIES = ['logo', 'react dashboard', 'mobile app', 'kuber', 'seo content writing', 'payment api', 'zzzz']
+
+# What the search bar sends while a user types
+SUGGEST_QUERIES = ['lo', 'logo', 'dash', 'react da', 'kub', 'zz']
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks icontains vs. full-text project search on synthetic data (rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=100000, help='Synthetic projects to create')
+        parser.add_argument('--runs', type=int, default=20, help='Timed runs per query')
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        self.stdout.write(f'Backend: {type(backend).__name__} ({connection.vendor})')
+        try:
+            with transaction.atomic():
+                self._populate(options['projects'])
+                self._compare(options['runs'])
+                self._compare_suggest(options['runs'])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _populate(self, count):
+        rng = random.Random(42)
+        vocabulary = WORDS + FILLER
+        rng.shuffle(vocabulary)
+        zipf_weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+        client = User.objects.create_user(
+            username='search-benchmark', email='search-benchmark@example.com', password=None,
+            country_origin='US', identity_number='search-benchmark',
+        )
+        category = Category.objects.create(name='Search Benchmark', slug='search-benchmark')
+
+        start = time.perf_counter()
+        for offset in range(0, count, 5000):
+            projects = Project.objects.bulk_create([
+                Project(
+                    # Titles are unique
+                    title=f"{' '.join(rng.choices(WORDS, k=3)).title()} #{offset + i}",
+                    description=' '.join(rng.choices(vocabulary, weights=zipf_weights, k=40)),
+                    budget=100, price=100, category=category, client=client,
+                )
+                for i in range(min(5000, count - offset))
+            ])
+            # bulk_create skips signals, so write the documents directly
+            SearchDocument.objects.bulk_create([
+                SearchDocument(kind=SearchDocument.Kind.PROJECT, object_id=project.pk, **project_fields(project))
+                for project in projects
+            ])
+            AutocompleteEntry.objects.bulk_create([
+                entry for project in projects
+                for entry in make_entries(AutocompleteEntry, AutocompleteEntry.Kind.PROJECT, project.pk, project.title)
+            ])
+        self.stdout.write(f'Indexed {count:,} projects in {time.perf_counter() - start:.1f}s')
+
+    def _compare(self, runs):
+        # Previous project-list search: SearchFilter icontains + newest-first page
+        def legacy(query):
+            matches = Project.objects.filter(status=Project.ProjectStatus.OPEN)
+            for term in query.split():
+                matches = matches.filter(
+                    Q(title__icontains=term) | Q(description__icontains=term) | Q(category__name__icontains=term)
+                )
+            return list(matches.distinct().order_by('-created_at', '-id').values_list('pk', flat=True)[:20])
+
+        def fulltext(query):
+            return search_results(
+                Project.objects.filter(status=Project.ProjectStatus.OPEN), SearchDocument.Kind.PROJECT, query, 20
+            )
+
+        self.stdout.write(f'{"query":<22}{"icontains p50/p95 ms":>24}{"full-text p50/p95 ms":>24}')
+        for query in QUERIES:
+            timings = [self._time(fn, query, runs) for fn in (legacy, fulltext)]
+            cells = ''.join(f'{f"{p50:.1f} / {p95:.1f}":>24}' for p50, p95 in timings)
+            self.stdout.write(f'{query:<22}{cells}')
+
+    def _compare_suggest(self, runs):
+        # Previous UserSuggestionView: four icontains queries + skill splitting
+        def legacy(query):
+            list(Category.objects.filter(name__icontains=query)[:3])
+            list(Project.objects.filter(title__icontains=query, status='OPEN')[:3])
+            list(User.objects.filter(roles__name='freelancer').filter(
+                Q(username__icontains=query) | Q(first_name__icontains=query) | Q(last_name__icontains=query)
+            )[:3])
+            for profile in Profile.objects.filter(skills__icontains=query)[:5]:
+                [skill.strip() for skill in profile.skills.split(',')]
+
+        self.stdout.write(f'{"suggest":<22}{"icontains p50/p99 ms":>24}{"index p50/p99 ms":>24}')
+        for query in SUGGEST_QUERIES:
+            timings = [self._time(fn, query, runs, percentile=0.99) for fn in (legacy, suggest)]
+            cells = ''.join(f'{f"{p50:.1f} / {tail:.1f}":>24}' for p50, tail in timings)
+            self.stdout.write(f'{query:<22}{cells}')
+
+    def _time(self, fn, query, runs, percentile=0.95):
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            fn(query)
+            samples.append((time.perf_counter() - start) * 1000)
+        samples.sort()
+        return statistics.median(samples), samples[max(0, int(len(samples) * percentile) - 1)]
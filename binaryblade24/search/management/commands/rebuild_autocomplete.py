@@ -0,0 +1,26 @@
+"""
+Management command to rebuild the search-bar autocomplete entries.
+
+Entries are maintained by signals; run this after bulk imports that bypass
+them, and periodically to drop skills no profile lists anymore.
+
+Usage: python manage.py rebuild_autocomplete
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from search.autocomplete import rebuild_autocomplete
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds AutocompleteEntry rows for categories, open projects, freelancers and skills'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            written = rebuild_autocomplete(batch_size=options['batch_size'])
+        for kind, count in written.items():
+            self.stdout.write(self.style.SUCCESS(f'{kind}: {count} suggestions indexed'))
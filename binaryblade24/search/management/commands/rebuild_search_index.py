@@ -0,0 +1,29 @@
+"""
+Management command to rebuild the full-text search documents.
+
+Documents are maintained by signals; run this after bulk imports that bypass
+them (bulk_create, QuerySet.update) or to repopulate the index from scratch.
+
+Usage: python manage.py rebuild_search_index [--kind project|profile]
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from search.documents import rebuild_index
+from search.models import SearchDocument
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds SearchDocument rows for projects and profiles'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kind', choices=SearchDocument.Kind.values, help='Only rebuild this kind')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        kinds = (options['kind'],) if options['kind'] else tuple(SearchDocument.Kind.values)
+        with transaction.atomic():
+            written = rebuild_index(kinds=kinds, batch_size=options['batch_size'])
+        for kind, count in written.items():
+            self.stdout.write(self.style.SUCCESS(f'{kind}: {count} documents indexed'))
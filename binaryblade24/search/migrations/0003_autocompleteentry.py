@@ -0,0 +1,32 @@
+# Generated by Django 5.0.4 on 2026-10-17 04:02
+
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    from search.autocomplete import rebuild_autocomplete
+    rebuild_autocomplete(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0002_fulltext_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AutocompleteEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('category', 'Category'), ('project', 'Project'), ('user', 'User'), ('skill', 'Skill')], max_length=20)),
+                ('object_id', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('text', models.CharField(max_length=255)),
+                ('token', models.CharField(max_length=64)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'token', 'text'], name='autocomplete_kind_token'), models.Index(fields=['kind', 'object_id'], name='autocomplete_kind_object')],
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,72 @@
+"""
+Search Models
+
+One denormalized search document per indexed object. The full-text index
+itself is database specific and created by migration 0002:
+
+- PostgreSQL: a generated, weighted `tsvector` column (`vector`) with a GIN index
+- SQLite: an FTS5 table (`search_searchdocument_fts`) kept in sync by triggers
+
+AutocompleteEntry backs the search-bar suggestions (search/autocomplete.py).
+"""
+
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """
+    Text a project or freelancer is found by.
+
+    Fields are weighted from most to least relevant:
+        title: project title / user's display name
+        keywords: category names / skills
+        body: project description / profile bio
+    """
+
+    class Kind(models.TextChoices):
+        PROJECT = 'project', 'Project'
+        PROFILE = 'profile', 'Profile'  # object_id is the user id
+
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=255, blank=True)
+    keywords = models.TextField(blank=True)
+    body = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='unique_search_document'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id}"
+
+
+class AutocompleteEntry(models.Model):
+    """
+    One word of a search-bar suggestion.
+
+    A suggestion ("React Dashboard") gets one row per distinct word, so a
+    prefix of any of its words is a range scan on the (kind, token, text) index.
+    """
+
+    class Kind(models.TextChoices):
+        CATEGORY = 'category', 'Category'
+        PROJECT = 'project', 'Project'  # open projects only
+        USER = 'user', 'User'  # freelancers only
+        SKILL = 'skill', 'Skill'  # object_id is empty; one entry per distinct skill
+
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    object_id = models.PositiveBigIntegerField(null=True, blank=True)
+    text = models.CharField(max_length=255)
+    token = models.CharField(max_length=64)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['kind', 'token', 'text'], name='autocomplete_kind_token'),
+            models.Index(fields=['kind', 'object_id'], name='autocomplete_kind_object'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.token}"
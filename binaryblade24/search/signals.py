@@ -0,0 +1,82 @@
+"""
+Keep SearchDocument and AutocompleteEntry rows current as projects,
+categories and profiles change.
+"""
+
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from Project.models import Category, Project
+from User.models import Profile, User
+from .autocomplete import add_skills, index_category, index_project_title, index_user_name, remove_entries
+from .documents import index_project, index_user, remove_document
+from .models import AutocompleteEntry, SearchDocument
+
+# User fields that appear in search documents and suggestions. Saves that
+# touch none of them (e.g. update_last_login on every login) are skipped.
+USER_SEARCH_FIELDS = {'username', 'first_name', 'last_name'}
+
+
+@receiver(post_save, sender=Project)
+def index_saved_project(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_project(instance)
+        index_project_title(instance)
+
+
+@receiver(post_delete, sender=Project)
+def remove_deleted_project(sender, instance, **kwargs):
+    remove_document(SearchDocument.Kind.PROJECT, instance.pk)
+    remove_entries(AutocompleteEntry.Kind.PROJECT, instance.pk)
+
+
+@receiver(post_save, sender=Category)
+def reindex_category_projects(sender, instance, created, raw=False, **kwargs):
+    """Category names are part of project documents; renames are rare."""
+    if raw:
+        return
+    index_category(instance)
+    if created:
+        return
+    projects = Project.objects.filter(
+        Q(category=instance) | Q(category__parent=instance)
+    ).select_related('category__parent')
+    for project in projects:
+        index_project(project)
+
+
+@receiver(post_delete, sender=Category)
+def remove_deleted_category(sender, instance, **kwargs):
+    remove_entries(AutocompleteEntry.Kind.CATEGORY, instance.pk)
+
+
+@receiver(post_save, sender=User)
+def index_saved_user(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not USER_SEARCH_FIELDS & set(update_fields)):
+        return
+    index_user(instance)
+    index_user_name(instance)
+
+
+@receiver(post_save, sender=Profile)
+def index_saved_profile(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_user(instance.user)
+        add_skills(instance.skills)
+
+
+@receiver(m2m_changed, sender=User.roles.through)
+def reindex_user_roles(sender, instance, action, reverse, **kwargs):
+    """Only freelancers are suggested; gaining or losing the role changes that."""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    users = [instance] if not reverse else User.objects.filter(pk__in=kwargs.get('pk_set') or ())
+    for user in users:
+        index_user_name(user)
+
+
+@receiver(post_delete, sender=User)
+def remove_deleted_profile(sender, instance, **kwargs):
+    remove_document(SearchDocument.Kind.PROFILE, instance.pk)
+    remove_entries(AutocompleteEntry.Kind.USER, instance.pk)
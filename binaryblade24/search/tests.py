@@ -0,0 +1,394 @@
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient, APITestCase
+
+from Project.models import Category, Project
+from Proposal.models import Proposal
+from Review.models import Review
+from User.models import ProfileSkill, Role, Skill
+from User.skills import parse_skills
+from User.views import GlobalSearchView
+from utils.sections import _get_executor, run_sections
+from .autocomplete import rebuild_autocomplete, suggest
+from .backends import BasicSearchBackend, SQLiteSearchBackend, search_ids
+from .documents import rebuild_index
+from .models import AutocompleteEntry, SearchDocument
+
+User = get_user_model()
+
+
+class SearchIndexTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username='owner', email='owner@example.com', password='password123',
+            country_origin='US', identity_number='owner-id'
+        )
+        self.parent = Category.objects.create(name='Development', slug='development')
+        self.category = Category.objects.create(name='Frontend', slug='frontend', parent=self.parent)
+
+    def _project(self, title, description='Description'):
+        return Project.objects.create(
+            title=title, description=description, budget=100, price=100,
+            category=self.category, client=self.owner,
+        )
+
+    def test_documents_follow_saves_and_deletes(self):
+        project = self._project('React dashboard')
+        self.assertEqual(search_ids('project', 'dashboard'), [project.id])
+
+        project.title = 'Vue storefront'
+        project.save()
+        self.assertEqual(search_ids('project', 'dashboard'), [])
+        self.assertEqual(search_ids('project', 'storefront'), [project.id])
+
+        project.delete()
+        self.assertEqual(search_ids('project', 'storefront'), [])
+
+    def test_category_names_are_searchable(self):
+        project = self._project('Landing page')
+        self.assertEqual(search_ids('project', 'development'), [project.id])
+
+        self.parent.name = 'Engineering'
+        self.parent.save()
+        self.assertEqual(search_ids('project', 'engineering'), [project.id])
+
+    def test_relevance_prefix_and_all_terms(self):
+        in_body = self._project('Website', description='Needs a logo refresh')
+        in_title = self._project('Logo design')
+        for backend in (SQLiteSearchBackend(), BasicSearchBackend()):
+            self.assertEqual(backend.search('project', 'logo'), [in_title.id, in_body.id])
+            self.assertEqual(backend.search('project', 'desi'), [in_title.id])
+            self.assertEqual(backend.search('project', 'logo website'), [in_body.id])
+            self.assertEqual(backend.search('project', '"*) OR'), [])
+            within = Project.objects.filter(title='Website')
+            self.assertEqual(backend.search('project', 'logo', within=within), [in_body.id])
+            self.assertEqual(
+                set(Project.objects.filter(pk__in=backend.matches('project', 'logo')).values_list('pk', flat=True)),
+                {in_title.id, in_body.id},
+            )
+            self.assertIsNone(backend.matches('project', '!!'))
+
+    def test_profiles_index_names_and_skills(self):
+        self.owner.profile.skills = 'Python,Django'
+        self.owner.profile.save()
+        self.assertEqual(search_ids('profile', 'django'), [self.owner.id])
+
+        self.owner.first_name = 'Ada'
+        self.owner.save()
+        self.assertEqual(search_ids('profile', 'ada'), [self.owner.id])
+
+    def test_rebuild_index(self):
+        project = self._project('Mobile app')
+        SearchDocument.objects.all().delete()
+        written = rebuild_index()
+        self.assertEqual(written, {'project': 1, 'profile': 1})
+        self.assertEqual(search_ids('project', 'mobile'), [project.id])
+
+    @override_settings(SEARCH_BACKEND='search.backends.BasicSearchBackend')
+    def test_backend_setting(self):
+        project = self._project('Mobile app')
+        self.assertEqual(search_ids('project', 'mob'), [project.id])
+
+
+class SearchEndpointTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        role, _ = Role.objects.get_or_create(name='freelancer')
+        self.owner = User.objects.create_user(
+            username='owner', email='owner@example.com', password='password123',
+            country_origin='US', identity_number='owner-id'
+        )
+        self.owner.roles.add(role)
+        self.owner.profile.skills = 'Illustration'
+        self.owner.profile.save()
+        category = Category.objects.create(name='Design', slug='design')
+        self.body_match = Project.objects.create(
+            title='Website', description='Includes a logo', budget=100, price=100,
+            category=category, client=self.owner,
+        )
+        self.title_match = Project.objects.create(
+            title='Logo for a bakery', description='Description', budget=100, price=100,
+            category=category, client=self.owner,
+        )
+
+    def test_project_list_search(self):
+        response = self.client.get(reverse('project_api:project-list'), {'search': 'bakery'})
+        self.assertEqual([p['id'] for p in response.data['results']], [self.title_match.id])
+
+    @override_settings(SEARCH_MAX_RESULTS=1)
+    def test_filters_apply_before_the_result_cap(self):
+        print_category = Category.objects.create(name='Print', slug='print')
+        Project.objects.filter(pk=self.body_match.pk).update(category=print_category)
+
+        url = reverse('project_api:project-list')
+        response = self.client.get(url, {'search': 'logo'})
+        self.assertEqual(len(response.data['results']), 2)
+        response = self.client.get(url, {'search': 'logo', 'category': print_category.id})
+        self.assertEqual([p['id'] for p in response.data['results']], [self.body_match.id])
+
+        # Ranking covers only the filtered projects, so the cap cannot hide them
+        response = self.client.get(reverse('user_api:global-search'), {'q': 'logo', 'category': print_category.id})
+        self.assertEqual([p['id'] for p in response.data['projects']], [self.body_match.id])
+
+    def test_global_search_is_ranked(self):
+        response = self.client.get(reverse('user_api:global-search'), {'q': 'logo'})
+        self.assertEqual([p['id'] for p in response.data['projects']], [self.title_match.id, self.body_match.id])
+
+        response = self.client.get(reverse('user_api:global-search'), {'q': 'illustr', 'type': 'freelancers'})
+        self.assertEqual([u['id'] for u in response.data['freelancers']], [self.owner.id])
+
+
+class AutocompleteTests(APITestCase):
+    def setUp(self):
+        self.role, _ = Role.objects.get_or_create(name='freelancer')
+        self.freelancer = User.objects.create_user(
+            username='adal', email='ada@example.com', password='password123',
+            country_origin='US', identity_number='ada-id', first_name='Ada', last_name='Lovelace',
+        )
+        self.freelancer.roles.add(self.role)
+        self.freelancer.profile.skills = 'Data Science, django ,DATA science'
+        self.freelancer.profile.save()
+        self.category = Category.objects.create(name='Data Entry', slug='data-entry')
+        self.project = Project.objects.create(
+            title='Dashboard for sales data', description='Description', budget=100, price=100,
+            category=self.category, client=self.freelancer,
+        )
+
+    def test_suggestions_match_word_prefixes(self):
+        self.assertEqual(suggest('dat'), [
+            {'type': 'category', 'text': 'Data Entry', 'id': self.category.id},
+            {'type': 'project', 'text': 'Dashboard for sales data', 'id': self.project.id},
+            {'type': 'skill', 'text': 'Data Science'},
+        ])
+        self.assertEqual(suggest('love'), [
+            {'type': 'user', 'text': 'Ada Lovelace (adal)', 'id': self.freelancer.id},
+        ])
+        self.assertEqual(suggest('sales da'), [
+            {'type': 'project', 'text': 'Dashboard for sales data', 'id': self.project.id},
+        ])
+
+    def test_entries_follow_changes(self):
+        self.project.status = Project.ProjectStatus.IN_PROGRESS
+        self.project.save()
+        self.assertEqual(suggest('dashboard'), [])
+
+        self.freelancer.roles.remove(self.role)
+        self.assertEqual(suggest('lovelace'), [])
+
+        self.category.name = 'Typing'
+        self.category.save()
+        self.assertEqual(suggest('typ'), [{'type': 'category', 'text': 'Typing', 'id': self.category.id}])
+
+    def test_last_login_does_not_reindex(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.freelancer.save(update_fields=['last_login'])
+        self.assertEqual(len(queries), 1)
+
+    def test_rebuild_autocomplete(self):
+        AutocompleteEntry.objects.all().delete()
+        self.assertEqual(rebuild_autocomplete(), {'category': 1, 'project': 1, 'user': 1, 'skill': 2})
+        self.assertEqual(len(suggest('dat')), 3)
+
+    def test_suggest_endpoint_is_one_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('user_api:user-search-suggest'), {'q': 'da'})
+        self.assertEqual(len(queries), 1)
+        self.assertEqual([s['type'] for s in response.data], ['category', 'project', 'skill'])
+
+
+class SkillTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.role, _ = Role.objects.get_or_create(name='freelancer')
+        self.users = []
+        for name, skills in [('ada', 'React Native, python'), ('bob', 'react  native;Go'), ('cy', '')]:
+            user = User.objects.create_user(
+                username=name, email=f'{name}@example.com', password='password123',
+                country_origin='US', identity_number=f'{name}-id',
+            )
+            user.roles.add(self.role)
+            user.profile.skills = skills
+            user.profile.save()
+            self.users.append(user)
+
+    def test_parse_skills(self):
+        self.assertEqual(parse_skills(' python, Django ,PYTHON;;  machine   learning '), ['python', 'Django', 'machine learning'])
+
+    def test_spellings_share_one_skill(self):
+        ada, bob, _ = self.users
+        self.assertEqual(Skill.objects.filter(key='react native').count(), 1)
+        bob.profile.refresh_from_db()
+        self.assertEqual(bob.profile.skills, 'React Native,Go')
+        self.assertEqual(ProfileSkill.objects.filter(skill__key='react native').count(), 2)
+
+        ada.profile.skills = 'Python'
+        ada.profile.save()
+        self.assertEqual(list(ada.profile.skill_set.values_list('key', flat=True)), ['python'])
+
+    def test_skill_filter_and_facets(self):
+        ada, bob, _ = self.users
+        response = self.client.get(
+            reverse('user_api:global-search'), {'type': 'freelancers', 'skills': 'REACT NATIVE'}
+        )
+        self.assertEqual(sorted(u['id'] for u in response.data['freelancers']), [ada.id, bob.id])
+
+        response = self.client.get(reverse('user_api:search-options'))
+        self.assertEqual(response.data['skills'][0], {'name': 'React Native', 'count': 2})
+
+        ada.profile.skills = 'python'
+        ada.profile.save()
+        response = self.client.get(reverse('user_api:search-options'))
+        self.assertEqual(response.data['skills'], [
+            {'name': 'Go', 'count': 1}, {'name': 'React Native', 'count': 1}, {'name': 'python', 'count': 1},
+        ])
+
+
+class FreelancerCardTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.role, _ = Role.objects.get_or_create(name='freelancer')
+        self.client_user = User.objects.create_user(
+            username='client', email='client@example.com', password='password123',
+            country_origin='US', identity_number='client-id'
+        )
+        self.category = Category.objects.create(name='Design', slug='design')
+
+    def _freelancer(self, i):
+        user = User.objects.create_user(
+            username=f'designer{i}', email=f'designer{i}@example.com', password='password123',
+            country_origin='US', identity_number=f'designer-{i}',
+        )
+        user.roles.add(self.role)
+        project = Project.objects.create(
+            title=f'Logo {i}', description='Description', budget=100, price=100,
+            category=self.category, client=self.client_user, status=Project.ProjectStatus.COMPLETED,
+        )
+        Proposal.objects.create(project=project, freelancer=user, bid_amount=100, status='ACCEPTED')
+        Review.objects.create(project=project, reviewer=self.client_user, reviewee=user, rating=4, comment='Good')
+        return user
+
+    def _search(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('user_api:global-search'), {'type': 'freelancers'})
+        return response, len(queries)
+
+    def test_card_fields(self):
+        user = self._freelancer(1)
+        response, _ = self._search()
+        card = response.data['freelancers'][0]
+        self.assertEqual(card['id'], user.id)
+        self.assertNotIn('email', card)
+        self.assertNotIn('identity_number', card)
+        self.assertEqual(card['roles'], ['freelancer'])
+        self.assertEqual(card['profile']['avg_rating'], 4.0)
+        self.assertEqual(card['profile']['review_count'], 1)
+        self.assertEqual(card['profile']['completed_count'], 1)
+
+    def test_query_count_does_not_grow_with_results(self):
+        self._freelancer(1)
+        self._search()  # Warm the category tree
+        _, one = self._search()
+        for i in range(2, 7):
+            self._freelancer(i)
+        response, six = self._search()
+        self.assertEqual(len(response.data['freelancers']), 6)
+        self.assertEqual(one, six)
+
+
+class GlobalSearchSectionTests(TransactionTestCase):
+    """Sections only run on the thread pool outside a transaction, hence TransactionTestCase."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        owner = User.objects.create_user(
+            username='owner', email='owner@example.com', password='password123',
+            country_origin='US', identity_number='owner-id'
+        )
+        category = Category.objects.create(name='Design', slug='design')
+        self.project = Project.objects.create(
+            title='Logo for a bakery', description='Description', budget=100, price=100,
+            category=category, client=owner,
+        )
+
+    @override_settings(DEBUG=True)
+    def test_sections_run_on_worker_threads(self):
+        threads = set()
+        search_projects = GlobalSearchView.search_projects
+
+        def record_thread(view, *args):
+            threads.add(threading.current_thread().name)
+            return search_projects(view, *args)
+
+        GlobalSearchView.search_projects = record_thread
+        try:
+            response = self.client.get(reverse('user_api:global-search'), {'q': 'logo'})
+        finally:
+            GlobalSearchView.search_projects = search_projects
+
+        self.assertEqual([p['id'] for p in response.data['projects']], [self.project.id])
+        self.assertNotIn('timed_out', response.data)
+        self.assertTrue(all(name.startswith('response-section') for name in threads))
+        self.assertRegex(response['Server-Timing'], r'^freelancers;dur=[\d.]+, projects;dur=[\d.]+, categories;dur=[\d.]+$')
+
+    @override_settings(SEARCH_SECTION_TIMEOUT=0.1)
+    def test_slow_section_times_out(self):
+        search_projects = GlobalSearchView.search_projects
+        GlobalSearchView.search_projects = lambda view, *args: time.sleep(0.5) or ['late']
+        try:
+            start = time.perf_counter()
+            response = self.client.get(reverse('user_api:global-search'), {'q': 'logo'})
+            elapsed = time.perf_counter() - start
+        finally:
+            GlobalSearchView.search_projects = search_projects
+
+        self.assertLess(elapsed, 0.4)
+        self.assertEqual(response.data['projects'], [])
+        self.assertEqual(response.data['timed_out'], ['projects'])
+        self.assertEqual(response.data['categories'], [])
+        self.assertNotIn('Server-Timing', response)
+
+    def test_sections_run_inline_when_every_worker_is_busy(self):
+        _, idle = _get_executor()
+        held = 0
+        while idle.acquire(blocking=False):
+            held += 1
+        try:
+            threads = run_sections({
+                'first': lambda: threading.current_thread().name,
+                'second': lambda: threading.current_thread().name,
+            }, timeout=1)
+        finally:
+            for _ in range(held):
+                idle.release()
+        self.assertEqual(set(threads.values.values()), {threading.current_thread().name})
+        self.assertEqual(threads.timed_out, [])
+
+    def test_slow_query_is_cancelled_at_the_deadline(self):
+        finished = threading.Event()
+
+        def slow_query():
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        'WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 1000000000) '
+                        'SELECT count(*) FROM c'
+                    )
+                    return cursor.fetchone()
+            finally:
+                finished.set()
+
+        start = time.perf_counter()
+        results = run_sections({'slow': slow_query, 'fast': lambda: 'done'}, timeout=0.1, fallback=[])
+        self.assertEqual(results.values, {'slow': [], 'fast': 'done'})
+        self.assertEqual(results.timed_out, ['slow'])
+        # The query was interrupted, freeing its worker instead of running on
+        self.assertTrue(finished.wait(1))
+        self.assertLess(time.perf_counter() - start, 1)
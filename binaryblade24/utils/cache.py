@@ -0,0 +1,199 @@
+"""
+Cache-aside layer for public (anonymous) API reads.
+
+Responses are stored under keys built from:
+
+    - the request host and path
+    - the query string, normalized (sorted keys and values, blanks dropped)
+      so `?a=1&b=2` and `?b=2&a=1` share an entry
+    - the current version of every namespace the view depends on
+
+Model signals bump a namespace's version (Project/signals.py) instead of
+deleting keys, so every entry built from older data simply stops being
+addressed and expires on its own. Each namespace is one integer in the
+cache; the versions for a request are read with a single get_many().
+
+Usage:
+    class ProjectViewSet(viewsets.ModelViewSet):
+        @cache_response('project_list', depends_on=('projects', 'reviews', 'categories'))
+        def list(self, request, *args, **kwargs):
+            return super().list(request, *args, **kwargs)
+
+Only anonymous GET requests that return 200 are cached; authenticated
+responses can contain per-user fields. The backend is whatever CACHES
+configures (locmem by default, Redis when REDIS_URL is set).
+"""
+import hashlib
+import threading
+import time
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+VERSION_KEY = 'api_cache:version:{}'
+STATS_KEY = 'api_cache:stats:{}:{}'
+
+# Labels of every view wrapped with cache_response(), for cache_stats()
+CACHED_VIEWS = set()
+
+class BufferedCounters:
+    """
+    Counter deltas kept in this process and added to the shared counters
+    (_incr) at most once per `interval` seconds, so hot paths do not pay a
+    cache round trip per count. Deltas not yet flushed when the process
+    exits are lost.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._flushed_at = time.monotonic()
+
+    def add(self, key, delta=1):
+        with self._lock:
+            self._pending[key] = self._pending.get(key, 0) + delta
+            due = time.monotonic() - self._flushed_at >= self.interval
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._flushed_at = time.monotonic()
+        for key, delta in pending.items():
+            _incr(key, delta)
+
+    def discard(self):
+        """Drop the pending deltas and restart the interval."""
+        with self._lock:
+            self._pending = {}
+            self._flushed_at = time.monotonic()
+
+
+# Backends whose entries only the current process can see
+PROCESS_LOCAL_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def is_shared_cache(alias='default'):
+    """Whether cache `alias` is seen by every process (e.g. Redis), not just this one."""
+    return settings.CACHES[alias]['BACKEND'] not in PROCESS_LOCAL_BACKENDS
+
+
+def _incr(key, delta=1):
+    """Atomic increment that creates the key on first use."""
+    cache.add(key, 0, timeout=None)
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        # Evicted between add() and incr()
+        cache.set(key, delta, timeout=None)
+        return delta
+
+
+def bump_namespace(*namespaces):
+    """Invalidate every cached response that depends on `namespaces`."""
+    for namespace in namespaces:
+        _incr(VERSION_KEY.format(namespace))
+
+
+def namespace_versions(namespaces):
+    keys = [VERSION_KEY.format(namespace) for namespace in namespaces]
+    found = cache.get_many(keys)
+    return [found.get(key, 0) for key in keys]
+
+
+def normalize_query(query_params):
+    """Canonical query string: sorted keys and values, empty values dropped."""
+    pairs = sorted(
+        (key, value)
+        for key in query_params
+        for value in query_params.getlist(key)
+        if value != ''
+    )
+    return urlencode(pairs)
+
+
+def response_cache_key(namespaces, request):
+    versions = namespace_versions(namespaces)
+    raw = '|'.join([
+        request.get_host(),
+        request.path,
+        normalize_query(request.query_params),
+        ','.join(f'{ns}.{version}' for ns, version in zip(namespaces, versions)),
+    ])
+    return f'api_cache:response:{hashlib.sha1(raw.encode("utf-8")).hexdigest()}'
+
+
+def record(label, outcome):
+    """Count a 'hit' or 'miss' for a cached view."""
+    _incr(STATS_KEY.format(label, outcome))
+
+
+def cache_stats():
+    """
+    Hit/miss counters per cached view.
+
+    Returns:
+        dict: {"project_list": {"hits": 10, "misses": 2, "hit_rate": 0.8333}, ...}
+    """
+    labels = sorted(CACHED_VIEWS)
+    found = cache.get_many([STATS_KEY.format(label, outcome) for label in labels for outcome in ('hit', 'miss')])
+    stats = {}
+    for label in labels:
+        hits = found.get(STATS_KEY.format(label, 'hit'), 0)
+        misses = found.get(STATS_KEY.format(label, 'miss'), 0)
+        total = hits + misses
+        stats[label] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / total, 4) if total else None,
+        }
+    return stats
+
+
+def reset_cache_stats():
+    cache.delete_many([STATS_KEY.format(label, outcome) for label in CACHED_VIEWS for outcome in ('hit', 'miss')])
+
+
+def cache_response(label, depends_on, timeout=None):
+    """
+    Decorator for APIView/ViewSet handler methods.
+
+    Args:
+        label (str): Name the hit/miss counters are reported under
+        depends_on (tuple[str]): Namespaces whose changes invalidate the response
+        timeout (int|None): Seconds to keep entries (default: API_CACHE_TIMEOUT)
+    """
+    namespaces = tuple(depends_on)
+    CACHED_VIEWS.add(label)
+
+    def decorator(method):
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            if request.method != 'GET' or request.user.is_authenticated:
+                return method(view, request, *args, **kwargs)
+
+            key = response_cache_key(namespaces, request)
+            data = cache.get(key)
+            if data is not None:
+                record(label, 'hit')
+                response = Response(data)
+                response['X-Cache'] = 'HIT'
+                return response
+
+            record(label, 'miss')
+            response = method(view, request, *args, **kwargs)
+            if response.status_code == 200:
+                ttl = timeout if timeout is not None else getattr(settings, 'API_CACHE_TIMEOUT', 300)
+                cache.set(key, response.data, ttl)
+            response['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,77 @@
+"""
+Conditional GET (ETag / Last-Modified) for API handlers.
+
+Validators are computed from cheap sources - modification timestamps, the
+category tree version, cache namespace versions - before the handler runs,
+so a request whose If-None-Match / If-Modified-Since still matches gets a
+304 without the payload ever being queried or serialized.
+
+Usage:
+    def project_validators(view, request, pk=None, **kwargs):
+        updated_at = ...
+        return make_etag('project', pk, updated_at), updated_at
+
+    class ProjectViewSet(viewsets.ModelViewSet):
+        @conditional_response(project_validators)
+        def retrieve(self, request, *args, **kwargs):
+            ...
+
+A validators function returns (etag, last_modified); either may be None,
+and returning None altogether (e.g. the object does not exist) skips the
+conditional check so the handler produces its usual response.
+"""
+import hashlib
+from functools import wraps
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(*parts):
+    """Opaque ETag value derived from `parts` (anything with a stable repr)."""
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+
+def request_variant(request):
+    """
+    Parts of the request that change the representation of the same data:
+    the viewer (per-user fields), the query string and the negotiated format.
+    """
+    user = getattr(request, 'user', None)
+    return (
+        user.pk if user is not None and user.is_authenticated else None,
+        request.META.get('QUERY_STRING', ''),
+        getattr(request, 'accepted_media_type', None),
+    )
+
+
+def conditional_response(validators):
+    """
+    Decorator for APIView/ViewSet GET handlers.
+
+    Args:
+        validators (callable): (view, request, *args, **kwargs) -> (etag, last_modified) or None
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return method(view, request, *args, **kwargs)
+
+            etag, last_modified = validators(view, request, *args, **kwargs) or (None, None)
+            etag = quote_etag(etag) if etag else None
+            timestamp = int(last_modified.timestamp()) if last_modified else None
+
+            not_modified = get_conditional_response(request, etag=etag, last_modified=timestamp)
+            if not_modified is not None:
+                return not_modified
+
+            response = method(view, request, *args, **kwargs)
+            if response.status_code == 200:
+                if etag and not response.has_header('ETag'):
+                    response['ETag'] = etag
+                if timestamp and not response.has_header('Last-Modified'):
+                    response['Last-Modified'] = http_date(timestamp)
+            return response
+        return wrapper
+    return decorator
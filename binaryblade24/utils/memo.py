@@ -0,0 +1,130 @@
+"""
+Request-scoped memo for nested serializers.
+
+The same user appears many times in one response (the owner of every gig on
+a listing, the freelancer on every order item). Serializers that use
+MemoizedSerializerMixin render each distinct instance once per request and
+reuse that representation for every later occurrence:
+
+    class FreelancerDetailSerializer(MemoizedSerializerMixin, serializers.ModelSerializer):
+        memo_label = 'freelancer_detail'
+
+Entries are keyed by (serializer class, primary key). Only use the mixin on
+serializers whose output depends on the instance alone, not on the context
+or the requesting user.
+
+SerializerMemoMiddleware opens a memo for every GET/HEAD request (nothing is
+written during those, so a representation cannot go stale) and adds the
+request's hit/miss counts to in-process totals, which reach the shared
+counters read by memo_stats() every STATS_FLUSH_INTERVAL seconds. Outside a
+request, on write methods and in worker threads (utils/sections.py) the
+serializers render normally.
+"""
+from contextvars import ContextVar
+
+from django.core.cache import cache
+
+from .cache import BufferedCounters
+
+STATS_KEY = 'serializer_memo:stats:{}:{}'
+STATS_FLUSH_INTERVAL = 60
+MEMO_METHODS = ('GET', 'HEAD')
+
+# memo_label of every serializer using MemoizedSerializerMixin, for memo_stats()
+MEMOIZED_SERIALIZERS = set()
+
+_current = ContextVar('serializer_memo', default=None)
+_stats = BufferedCounters(STATS_FLUSH_INTERVAL)
+
+
+class RequestMemo:
+    def __init__(self):
+        self.entries = {}
+        self.hits = {}
+        self.misses = {}
+
+    def get(self, label, key):
+        """The stored representation for `key`, or None (counted as hit/miss)."""
+        if key in self.entries:
+            self.hits[label] = self.hits.get(label, 0) + 1
+            return self.entries[key]
+        self.misses[label] = self.misses.get(label, 0) + 1
+        return None
+
+    def flush_stats(self):
+        """Add this request's counts to the process's pending stats."""
+        for outcome, counts in (('hit', self.hits), ('miss', self.misses)):
+            for label, count in counts.items():
+                _stats.add(STATS_KEY.format(label, outcome), count)
+
+
+class SerializerMemoMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.method not in MEMO_METHODS:
+            return self.get_response(request)
+
+        memo = RequestMemo()
+        token = _current.set(memo)
+        try:
+            return self.get_response(request)
+        finally:
+            _current.reset(token)
+            memo.flush_stats()
+
+
+class MemoizedSerializerMixin:
+    memo_label = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.memo_label:
+            MEMOIZED_SERIALIZERS.add(cls.memo_label)
+
+    def to_representation(self, instance):
+        memo = _current.get()
+        pk = getattr(instance, 'pk', None)
+        if memo is None or pk is None:
+            return super().to_representation(instance)
+
+        label = self.memo_label or type(self).__name__
+        key = (type(self), pk)
+        data = memo.get(label, key)
+        if data is None:
+            data = memo.entries[key] = super().to_representation(instance)
+        return data
+
+
+def memo_stats():
+    """
+    Hit/miss counters per memoized serializer.
+
+    Includes this process's pending counts; other processes' arrive within
+    STATS_FLUSH_INTERVAL seconds.
+
+    Returns:
+        dict: {"freelancer_detail": {"hits": 40, "misses": 10, "hit_rate": 0.8}, ...}
+    """
+    _stats.flush()
+    labels = sorted(MEMOIZED_SERIALIZERS)
+    found = cache.get_many([STATS_KEY.format(label, outcome) for label in labels for outcome in ('hit', 'miss')])
+    stats = {}
+    for label in labels:
+        hits = found.get(STATS_KEY.format(label, 'hit'), 0)
+        misses = found.get(STATS_KEY.format(label, 'miss'), 0)
+        total = hits + misses
+        stats[label] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / total, 4) if total else None,
+        }
+    return stats
+
+
+def reset_memo_stats():
+    _stats.discard()
+    cache.delete_many([
+        STATS_KEY.format(label, outcome) for label in MEMOIZED_SERIALIZERS for outcome in ('hit', 'miss')
+    ])
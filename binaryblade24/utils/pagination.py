@@ -0,0 +1,264 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+Pages are addressed by the position of the last row already seen instead of
+an OFFSET, so fetching page 500 costs the same as fetching page 1:
+
+    WHERE (created_at, id) < (:created_at, :id) ORDER BY created_at DESC, id DESC LIMIT :n
+
+Cursors are opaque base64 tokens that encode that position. The `id`
+tie-breaker keeps ordering stable when several rows share a timestamp.
+
+Usage:
+    class NotificationViewSet(viewsets.ModelViewSet):
+        pagination_class = KeysetPagination
+        keyset_ordering = ('-created_at', '-id')  # optional, this is the default
+
+MessageWindowPagination uses the same key for `before`/`after` windows
+around a known message in a chat history.
+"""
+import base64
+import json
+from urllib import parse
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over a (timestamp, id) key.
+
+    Settings:
+        API_PAGE_SIZE: Default number of rows per page
+        API_MAX_PAGE_SIZE: Upper bound for the `page_size` query parameter
+
+    Response Format:
+        {
+            "next": "https://.../api/projects/?cursor=eyJ2Ijo...",
+            "previous": null,
+            "results": [...]
+        }
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    ordering = ('-created_at', '-id')
+    invalid_cursor_message = 'Invalid cursor'
+
+    @property
+    def page_size(self):
+        return getattr(settings, 'API_PAGE_SIZE', 20)
+
+    @property
+    def max_page_size(self):
+        return getattr(settings, 'API_MAX_PAGE_SIZE', 100)
+
+    def get_page_size(self, request):
+        """Return the requested page size, clamped to [1, max_page_size]."""
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError, TypeError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_ordering(self, view):
+        """Views may override the key with `keyset_ordering`; both fields must share a direction."""
+        return tuple(getattr(view, 'keyset_ordering', self.ordering))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(view)
+        self.size = self.get_page_size(request)
+
+        self.field, self.tiebreak = (name.lstrip('-') for name in self.ordering)
+        self.descending = self.ordering[0].startswith('-')
+        self.model = queryset.model
+
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor['reverse'])
+
+        # Walk backwards (for "previous" links) by flipping the ordering and the comparison
+        if reverse:
+            order_by = [name.lstrip('-') if name.startswith('-') else f'-{name}' for name in self.ordering]
+        else:
+            order_by = list(self.ordering)
+        queryset = queryset.order_by(*order_by)
+
+        if cursor:
+            queryset = queryset.filter(self._after(cursor['value'], cursor['id'], reverse))
+
+        # Fetch one extra row to learn whether another page exists
+        rows = list(queryset[:self.size + 1])
+        has_more = len(rows) > self.size
+        rows = rows[:self.size]
+
+        if reverse:
+            rows.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        self.page = rows
+        return rows
+
+    def _after(self, value, pk, reverse):
+        """Build the `(field, id)` row comparison for rows strictly past the cursor."""
+        moving_down = self.descending != reverse
+        op = 'lt' if moving_down else 'gt'
+        return Q(**{f'{self.field}__{op}': value}) | Q(**{self.field: value, f'{self.tiebreak}__{op}': pk})
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, obj, reverse):
+        """Return an absolute URL carrying an opaque cursor positioned at `obj`."""
+        value = getattr(obj, self.field)
+        payload = {
+            'v': value.isoformat() if hasattr(value, 'isoformat') else value,
+            'i': getattr(obj, self.tiebreak),
+        }
+        if reverse:
+            payload['r'] = 1
+        token = base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        """Parse the cursor query param. Returns None when absent; raises NotFound when malformed."""
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(parse.unquote(token).encode('ascii')).decode('ascii'))
+            field = self.model._meta.get_field(self.field)
+            value = field.to_python(payload['v'])
+            pk = self.model._meta.get_field(self.tiebreak).to_python(payload['i'])
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+        return {'value': value, 'id': pk, 'reverse': bool(payload.get('r'))}
+
+
+class MessageWindowPagination(KeysetPagination):
+    """
+    Windows of a chronological history around a known row, for chat threads.
+
+        ?limit=N               the latest N rows (default)
+        ?before=<id>&limit=N   the N rows just older than row <id> (scrolling back)
+        ?after=<id>&limit=N    the N rows just newer than row <id> (sync polling)
+
+    Rows are keyed by (timestamp, id), served by the message
+    (conversation, timestamp, id) index, and always returned oldest first.
+    The anchor row is looked up in the view's queryset, so ids outside it
+    are rejected like a bad cursor.
+
+    Response Format:
+        {
+            "next": null,
+            "previous": "https://.../api/messages/messages/?conversation=3&before=120&limit=50",
+            "results": [...]
+        }
+
+    `previous` is null at the start of the history and `next` is null at the
+    newest row; pollers keep asking for rows after the newest id they hold.
+    """
+    page_size_query_param = 'limit'
+    ordering = ('timestamp', 'id')
+    before_query_param = 'before'
+    after_query_param = 'after'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(view)
+        self.size = self.get_page_size(request)
+
+        self.field, self.tiebreak = (name.lstrip('-') for name in self.ordering)
+        self.descending = False
+        self.model = queryset.model
+
+        before = request.query_params.get(self.before_query_param)
+        after = request.query_params.get(self.after_query_param)
+        if before and after:
+            raise ValidationError({'detail': f'Use either {self.before_query_param} or {self.after_query_param}, not both.'})
+
+        # The latest page and `before` windows walk back from the newest row
+        backwards = not after
+        order_by = [f'-{name}' for name in self.ordering] if backwards else list(self.ordering)
+        anchor = before or after
+        if anchor:
+            value, pk = self._anchor(queryset, anchor)
+            queryset = queryset.filter(self._after(value, pk, backwards))
+
+        # Fetch one extra row to learn whether the window can be extended
+        rows = list(queryset.order_by(*order_by)[:self.size + 1])
+        has_more = len(rows) > self.size
+        rows = rows[:self.size]
+
+        if backwards:
+            rows.reverse()
+            self.has_previous = has_more
+            self.has_next = bool(before)
+        else:
+            self.has_previous = True
+            self.has_next = has_more
+
+        self.page = rows
+        return rows
+
+    def _anchor(self, queryset, anchor):
+        """The (timestamp, id) key of row `anchor`; NotFound when it is not in `queryset`."""
+        try:
+            row = queryset.filter(pk=int(anchor)).values_list(self.field, self.tiebreak).first()
+        except (TypeError, ValueError):
+            row = None
+        if row is None:
+            raise NotFound(self.invalid_cursor_message)
+        return row
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self._window_link(self.after_query_param, self.page[-1])
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self._window_link(self.before_query_param, self.page[0])
+
+    def _window_link(self, param, obj):
+        url = remove_query_param(self.base_url, self.before_query_param)
+        url = remove_query_param(url, self.after_query_param)
+        return replace_query_param(url, param, getattr(obj, self.tiebreak))
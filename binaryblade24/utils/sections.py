@@ -0,0 +1,199 @@
+"""
+Concurrent, time-boxed sections of one API response.
+
+A view that assembles independent sections (e.g. global search: freelancers,
+projects, categories) can run them side by side instead of one after another:
+
+    results = run_sections({
+        'freelancers': lambda: search_freelancers(params),
+        'projects': lambda: search_projects(params),
+    }, timeout=settings.SEARCH_SECTION_TIMEOUT)
+
+    results.values       {'freelancers': [...], 'projects': [...]}
+    results.timed_out    ['projects'] when that section overran its budget
+    results.timings      {'freelancers': 12.1, 'projects': 1500.0} (ms)
+
+Sections run on one bounded, process-wide thread pool. Each worker thread has
+its own database connection (Django connections are per thread); it is
+recycled with close_old_connections() around every section, exactly like the
+request cycle does, so CONN_MAX_AGE still applies. A section is only handed
+to the pool when a worker is idle; otherwise it runs inline in the request
+thread, so requests never queue behind another request's slow sections.
+
+Each section's budget starts when the section starts running, and its
+queries run under a matching database statement timeout, so a slow query is
+cancelled instead of holding its worker. A section still running when its
+budget is spent is reported as timed out and its value replaced by
+`fallback`.
+
+Sections run sequentially, without a budget, when the caller is inside a
+transaction: other connections cannot see its uncommitted rows.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, connection
+
+_executor = None
+_idle = None
+_executor_lock = threading.Lock()
+
+# Value of a section whose query the database cancelled at the deadline
+_TIMED_OUT = object()
+
+
+def _get_executor():
+    """The shared pool and a semaphore counting its idle workers."""
+    global _executor, _idle
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = getattr(settings, 'SEARCH_SECTION_WORKERS', 4)
+                _idle = threading.BoundedSemaphore(workers)
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='response-section')
+    return _executor, _idle
+
+
+@contextmanager
+def statement_timeout(seconds):
+    """
+    Have the database cancel this thread's queries that run past `seconds`.
+
+    PostgreSQL and MySQL use the session's statement timeout (reset on exit);
+    SQLite interrupts the query from a progress handler. A cancelled query
+    raises a DatabaseError. No-op for a None budget or other databases.
+    """
+    if not seconds:
+        yield
+        return
+    connection.ensure_connection()
+    vendor = connection.vendor
+    if vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SET statement_timeout = %s', [max(int(seconds * 1000), 1)])
+        try:
+            yield
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute('RESET statement_timeout')
+    elif vendor == 'mysql':
+        with connection.cursor() as cursor:
+            cursor.execute('SET SESSION max_execution_time = %s', [max(int(seconds * 1000), 1)])
+        try:
+            yield
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute('SET SESSION max_execution_time = DEFAULT')
+    elif vendor == 'sqlite':
+        deadline = time.monotonic() + seconds
+        connection.connection.set_progress_handler(lambda: time.monotonic() > deadline, 1000)
+        try:
+            yield
+        finally:
+            connection.connection.set_progress_handler(None, 0)
+    else:
+        yield
+
+
+class SectionResults:
+    def __init__(self):
+        self.values = {}
+        self.timings = {}
+        self.timed_out = []
+
+    def server_timing(self):
+        """Server-Timing header value: "freelancers;dur=12.1, projects;dur=40.3"."""
+        return ', '.join(f'{name};dur={duration:.1f}' for name, duration in self.timings.items())
+
+
+def _timed(func):
+    start = time.perf_counter()
+    return func(), (time.perf_counter() - start) * 1000
+
+
+class _Section:
+    """One section's callable and its budget, which starts when it starts running."""
+
+    def __init__(self, func, timeout):
+        self.func = func
+        self.timeout = timeout
+        self.started = None
+        self.future = None
+
+    def elapsed(self):
+        return time.perf_counter() - self.started if self.started is not None else 0
+
+    def remaining(self):
+        return None if self.timeout is None else max(self.timeout - self.elapsed(), 0)
+
+    def run(self):
+        """(value, ms); the value is _TIMED_OUT when the database cancelled a query at the deadline."""
+        self.started = time.perf_counter()
+        try:
+            with statement_timeout(self.timeout):
+                value = self.func()
+        except DatabaseError:
+            if self.timeout is None or self.elapsed() < self.timeout:
+                raise
+            value = _TIMED_OUT
+        return value, self.elapsed() * 1000
+
+    def run_in_worker(self, idle):
+        close_old_connections()
+        try:
+            return self.run()
+        finally:
+            close_old_connections()
+            idle.release()
+
+
+def run_sections(sections, timeout=None, fallback=None):
+    """
+    Run independent callables concurrently, each within `timeout` seconds.
+
+    Args:
+        sections (dict[str, callable]): Section name -> zero-argument callable
+        timeout (float|None): Budget per section in seconds (None: wait for all)
+        fallback: Value reported for a section that timed out
+
+    Returns:
+        SectionResults: values / timings (ms) / timed_out, in `sections` order
+    """
+    results = SectionResults()
+    if len(sections) < 2 or connection.in_atomic_block:
+        for name, func in sections.items():
+            results.values[name], results.timings[name] = _timed(func)
+        return results
+
+    executor, idle = _get_executor()
+    running = {name: _Section(func, timeout) for name, func in sections.items()}
+    inline = []
+    for name, section in running.items():
+        if idle.acquire(blocking=False):
+            section.future = executor.submit(section.run_in_worker, idle)
+        else:
+            # Every worker is busy: queueing would spend this section's budget waiting
+            inline.append(name)
+
+    outcomes = {name: running[name].run() for name in inline}
+    for name, section in running.items():
+        if section.future is None:
+            continue
+        try:
+            outcomes[name] = section.future.result(timeout=section.remaining())
+        except FutureTimeout:
+            if section.future.cancel():
+                idle.release()  # Never started, so its worker slot was never used
+            outcomes[name] = _TIMED_OUT, section.elapsed() * 1000
+
+    for name in sections:
+        value, results.timings[name] = outcomes[name]
+        if value is _TIMED_OUT:
+            results.values[name] = fallback
+            results.timed_out.append(name)
+        else:
+            results.values[name] = value
+    return results
@@ -0,0 +1,78 @@
+"""
+Sparse fieldsets and expansion control for API serializers.
+
+GET requests may narrow a response to the fields the caller needs:
+
+    ?fields=id,title,price          only these fields
+    ?expand=client_details          every plain field, but only the listed
+                                    expandable (nested/computed) fields
+    ?fields=id,title&expand=client_details
+                                    both: the listed fields plus the expansions
+    ?expand=                        no expandable fields at all
+
+Without either parameter the serializer returns its full payload, so existing
+clients are unaffected. Unknown names are ignored.
+
+Fields that are dropped are removed in get_fields(), before serialization,
+so their SerializerMethodFields are never called and their nested
+serializers never touch the database. Views can call
+`Serializer.requested_fields(request)` to skip the matching annotations or
+joins as well.
+
+Usage:
+    class ProjectSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+        class Meta:
+            model = Project
+            fields = [...]
+            expandable_fields = ['client_details', 'category_details']
+
+Only the top-level serializer of a response is narrowed; nested serializers
+always render their own full field set.
+"""
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.serializers import ListSerializer
+
+
+def _split(value):
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+class SparseFieldsetMixin:
+    fields_query_param = 'fields'
+    expand_query_param = 'expand'
+
+    @classmethod
+    def requested_fields(cls, request):
+        """
+        Names of the fields a GET `request` asks for.
+
+        Returns:
+            set[str] | None: None when the full payload is requested
+        """
+        if request is None or request.method not in SAFE_METHODS:
+            return None
+        params = request.query_params
+        if cls.fields_query_param not in params and cls.expand_query_param not in params:
+            return None
+
+        expandable = set(getattr(cls.Meta, 'expandable_fields', ()))
+        if cls.fields_query_param in params:
+            wanted = _split(params[cls.fields_query_param])
+        else:
+            wanted = set(cls.Meta.fields) - expandable
+        if cls.expand_query_param in params:
+            wanted |= _split(params[cls.expand_query_param]) & expandable
+        return wanted
+
+    def _is_response_root(self):
+        root = self.root
+        return root is self or (isinstance(root, ListSerializer) and root.child is self)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self._is_response_root():
+            return fields
+        wanted = self.requested_fields(self.context.get('request'))
+        if wanted is None:
+            return fields
+        return {name: field for name, field in fields.items() if name in wanted}